@@ -78,8 +78,35 @@ except Exception as e:
     import traceback
     traceback.print_exc()
 
-# 3. Verificar Excel
-print(f"\n3️⃣ Verificando archivo Excel...")
+# 3. Perfil de almacenamiento
+print(f"\n3️⃣ Verificando perfil de almacenamiento...")
+
+try:
+    from src.database.connection import describir_perfil_almacenamiento
+    
+    perfil = config.db_perfil
+    print(f"   ⚙️  Perfil configurado (DB_PROFILE): {perfil.nombre}")
+    print(f"   📋 Esperado: journal_mode={perfil.journal_mode or 'sin cambios'}, "
+          f"synchronous={perfil.synchronous}, mmap_size={perfil.mmap_size}, "
+          f"cache_size={perfil.cache_size}, temp_store={perfil.temp_store}, "
+          f"busy_timeout={perfil.busy_timeout}")
+    
+    estado = describir_perfil_almacenamiento()
+    print(f"   📋 Efectivo:")
+    for pragma, valor in estado.items():
+        if pragma != 'perfil':
+            print(f"      - {pragma}: {valor}")
+    
+    if perfil.journal_mode and str(estado['journal_mode']).upper() != perfil.journal_mode.upper():
+        print(f"   ⚠️  journal_mode activo ({estado['journal_mode']}) distinto del perfil")
+    else:
+        print(f"   ✅ Perfil aplicado")
+        
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# 4. Verificar Excel
+print(f"\n4️⃣ Verificando archivo Excel...")
 print(f"   Ruta configurada: {config.excel_path}")
 
 excel_path = Path(config.excel_path)
@@ -102,8 +129,8 @@ if excel_path.exists():
 else:
     print(f"   ❌ Archivo NO existe")
 
-# 4. Comparar BD vs Excel
-print(f"\n4️⃣ Comparación BD vs Excel...")
+# 5. Comparar BD vs Excel
+print(f"\n5️⃣ Comparación BD vs Excel...")
 
 if excel_path.exists() and db_path.exists():
     try:
@@ -141,8 +168,8 @@ if excel_path.exists() and db_path.exists():
     except Exception as e:
         print(f"   ❌ Error: {e}")
 
-# 5. Verificar archivos múltiples
-print(f"\n5️⃣ Buscando archivos .db en el proyecto...")
+# 6. Verificar archivos múltiples
+print(f"\n6️⃣ Buscando archivos .db en el proyecto...")
 
 base_dir = Path.cwd()
 db_files = list(base_dir.rglob("*.db"))
@@ -0,0 +1,34 @@
+"""
+Script para mover a la base de archivo los logs_sistema anteriores a la
+ventana de retención (LOG_RETENCION_DIAS)
+Ejecutar: python scripts/archivar_logs.py [dias]
+"""
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path para poder importar src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.config import config
+from src.database.archivo_logs import ruta_archivo
+from src.database.models import LogModel
+
+
+def main():
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else config.log_retencion_dias
+
+    print("="*60)
+    print("ARCHIVO DE LOGS DEL SISTEMA")
+    print("="*60)
+    print(f"\nSe conservan los últimos {dias} días; el resto pasa a {ruta_archivo()}")
+
+    archivados = LogModel.archivar_antiguos(dias)
+    if archivados < 0:
+        print("\n❌ Error archivando logs (ver log)")
+        sys.exit(1)
+
+    print(f"\n✅ {archivados} eventos archivados")
+
+
+if __name__ == "__main__":
+    main()
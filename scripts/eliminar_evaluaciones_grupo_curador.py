@@ -11,7 +11,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
 from src.database.connection import get_db_connection
-from src.database.models import UsuarioModel, LogModel
+from src.database.models import UsuarioModel, LogModel, EvaluacionModel
 
 # Configurar logging
 logging.basicConfig(
@@ -66,15 +66,16 @@ def eliminar_evaluaciones_grupo_curador():
             confirmacion = input("¿Está seguro que desea ELIMINAR estas evaluaciones? (s/N): ").strip().lower()
 
             if confirmacion == 's':
-                cursor.execute("""
-                    DELETE FROM evaluaciones
-                    WHERE usuario_id = ? AND codigo_grupo = ?
-                """, (usuario_id, codigo_grupo))
-                evaluaciones_eliminadas = cursor.rowcount
+                evaluaciones_eliminadas = EvaluacionModel.eliminar_con_cursor(
+                    cursor,
+                    "usuario_id = ? AND codigo_grupo = ?",
+                    (usuario_id, codigo_grupo)
+                )
 
                 if evaluaciones_eliminadas > 0:
                     logger.info(f"✅ Se eliminaron {evaluaciones_eliminadas} evaluaciones del grupo '{codigo_grupo}' del curador '{username_curador}'.")
-                    LogModel.registrar_log(
+                    LogModel.registrar_log_con_cursor(
+                        cursor,
                         usuario="ScriptAdmin",
                         accion="ELIMINACION_EVAL_INDIVIDUAL",
                         detalle=f"Eliminadas {evaluaciones_eliminadas} evaluaciones de grupo {codigo_grupo} por curador {username_curador}"
@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import config
 from src.utils.validators import validar_codigo_grupo
+from src.database.models import EvaluacionModel
 
 print("="*60)
 print("LIMPIEZA Y SINCRONIZACIÓN DE BASE DE DATOS")
@@ -125,11 +126,9 @@ try:
     # Eliminar evaluaciones de grupos que no están en Excel
     if solo_bd:
         placeholders = ','.join('?' * len(solo_bd))
-        cursor.execute(f"""
-            DELETE FROM evaluaciones 
-            WHERE codigo_grupo IN ({placeholders})
-        """, tuple(solo_bd))
-        eval_eliminadas = cursor.rowcount
+        eval_eliminadas = EvaluacionModel.eliminar_con_cursor(
+            cursor, f"codigo_grupo IN ({placeholders})", tuple(solo_bd)
+        )
         print(f"   🗑️  Evaluaciones eliminadas: {eval_eliminadas}")
     
     # Eliminar todos los grupos
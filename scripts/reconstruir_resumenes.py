@@ -0,0 +1,46 @@
+"""
+Script para recalcular las tablas resumen de puntuaciones y el estado de cada
+evaluación (estado_evaluacion) desde las evaluaciones
+Ejecutar: python scripts/reconstruir_resumenes.py
+"""
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path para poder importar src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.database.init_db import (
+    reconstruir_resumenes, resumenes_consistentes, reconstruir_estado_evaluaciones
+)
+from src.database.models import LogModel
+
+
+def main():
+    print("="*60)
+    print("RECONSTRUCCIÓN DE TABLAS RESUMEN")
+    print("="*60)
+
+    if resumenes_consistentes():
+        print("\nℹ️  Los totales de las tablas resumen cuadran con las evaluaciones.")
+        print("   Se reconstruyen igualmente (p.ej. tras cambios de catálogo).")
+    else:
+        print("\n⚠️  Tablas resumen desincronizadas: se reconstruirán.")
+
+    if not reconstruir_resumenes():
+        print("\n❌ Error reconstruyendo las tablas resumen (ver log)")
+        sys.exit(1)
+
+    if not reconstruir_estado_evaluaciones():
+        print("\n❌ Error reconstruyendo el estado de las evaluaciones (ver log)")
+        sys.exit(1)
+
+    LogModel.registrar_log(
+        usuario="SISTEMA",
+        accion="RECONSTRUIR_RESUMENES",
+        detalle="Tablas resumen y estado de evaluaciones recalculados mediante script"
+    )
+    print("\n✅ Tablas resumen y estado de evaluaciones reconstruidos correctamente")
+
+
+if __name__ == "__main__":
+    main()
@@ -48,6 +48,12 @@ UMBRAL_MEJORA=1.6
 # Configuración de Validaciones
 MIN_CARACTERES_OBSERVACION=20
 MAX_GRUPOS_POR_CURADOR=50
+
+# Asignación de grupos
+CURADORES_POR_GRUPO=3
+
+# Guardado automático del borrador del curador (segundos)
+INTERVALO_BORRADOR=5
 """
 
 # Definir ruta raíz (un nivel arriba de scripts/)
@@ -0,0 +1,67 @@
+"""
+Script para comparar la memoria del DataFrame de evaluaciones antes y después
+de aplicar el esquema de tipos (TIPOS_EVALUACIONES)
+Ejecutar: python scripts/reporte_memoria_evaluaciones.py
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Agregar el directorio raíz al path para poder importar src
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.database.connection import get_db_connection
+from src.database.cache_evaluaciones import CONSULTA_EVALUACIONES_DATAFRAME, aplicar_tipos
+
+
+def reporte_memoria(df_original: pd.DataFrame, df_tipado: pd.DataFrame) -> pd.DataFrame:
+    """
+    Memoria por columna (en KB) de ambos DataFrames.
+
+    Args:
+        df_original: DataFrame tal como lo devuelve read_sql_query
+        df_tipado: El mismo DataFrame tras aplicar_tipos
+
+    Returns:
+        DataFrame con tipo y KB antes/después por columna, más una fila TOTAL
+    """
+    antes = df_original.memory_usage(deep=True, index=False)
+    despues = df_tipado.memory_usage(deep=True, index=False)
+    reporte = pd.DataFrame({
+        'tipo_antes': df_original.dtypes.astype(str),
+        'tipo_despues': df_tipado.dtypes.astype(str),
+        'kb_antes': antes / 1024,
+        'kb_despues': despues / 1024,
+    })
+    reporte.loc['TOTAL'] = ['', '', antes.sum() / 1024, despues.sum() / 1024]
+    reporte['reduccion_%'] = (1 - reporte['kb_despues'] / reporte['kb_antes']) * 100
+    return reporte
+
+
+def main():
+    print("="*60)
+    print("MEMORIA DEL DATAFRAME DE EVALUACIONES")
+    print("="*60)
+
+    with get_db_connection() as conn:
+        df_original = pd.read_sql_query(CONSULTA_EVALUACIONES_DATAFRAME, conn, params=(0,))
+
+    if df_original.empty:
+        print("\nℹ️  No hay evaluaciones registradas")
+        return
+
+    df_tipado = aplicar_tipos(df_original.copy())
+    reporte = reporte_memoria(df_original, df_tipado)
+
+    print(f"\n📊 {len(df_original)} filas\n")
+    with pd.option_context('display.float_format', '{:,.1f}'.format, 'display.width', 120):
+        print(reporte)
+
+    total = reporte.loc['TOTAL']
+    print(f"\n✅ {total['kb_antes']:,.1f} KB → {total['kb_despues']:,.1f} KB "
+          f"({total['reduccion_%']:.1f}% menos)")
+
+
+if __name__ == "__main__":
+    main()
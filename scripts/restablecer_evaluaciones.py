@@ -32,7 +32,8 @@ def restablecer_evaluaciones():
             cursor.execute("DELETE FROM evaluaciones")
             
             # También borrar logs relacionados si se desea, o al menos registrar el reset
-            LogModel.registrar_log(
+            LogModel.registrar_log_con_cursor(
+                cursor,
                 usuario="SISTEMA",
                 accion="RESET_EVALUACIONES",
                 detalle=f"Se eliminaron {total} evaluaciones manualmente mediante script"
@@ -0,0 +1,7 @@
+# Motor de analíticas del comité
+# Cubo de puntuaciones y agregados estándar calculados una vez por versión de datos
+# y compartidos por todas las vistas
+from src.analytics.cubo import CuboPuntuaciones, obtener_cubo
+from src.analytics.agregados import Agregados, obtener_agregados
+
+__all__ = ['CuboPuntuaciones', 'obtener_cubo', 'Agregados', 'obtener_agregados']
@@ -0,0 +1,190 @@
+"""
+Agregados estándar de evaluaciones para las vistas del comité
+La tabla base de conteos por celda (grupo, curador, ficha, dimensión,
+aspecto) se obtiene del cubo de puntuaciones; todos los demás agregados se
+obtienen sumando conteos, sin volver a recorrer las evaluaciones.
+"""
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from src.analytics.cubo import CuboPuntuaciones, obtener_cubo
+from src.database.cache_evaluaciones import cache_evaluaciones
+
+
+# Claves de la tabla base (grano más fino de los agregados)
+CLAVES_BASE = ['codigo_grupo', 'nombre_propuesta', 'ficha', 'dimension', 'aspecto', 'curador']
+
+# Columnas estadísticas de cada agregado, en el orden en que se devuelven
+COLUMNAS_ESTADISTICAS = [
+    'promedio', 'mediana', 'desviacion', 'evaluaciones',
+    'fortalezas', 'oportunidades', 'riesgos'
+]
+
+
+def _estadisticas_desde_conteos(n0: np.ndarray, n1: np.ndarray, n2: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calcula media, mediana y desviación estándar a partir de los conteos de
+    resultados 0, 1 y 2 (equivalentes a las de pandas sobre las filas).
+
+    Args:
+        n0: Conteo de riesgos (resultado 0) por fila
+        n1: Conteo de oportunidades (resultado 1) por fila
+        n2: Conteo de fortalezas (resultado 2) por fila
+
+    Returns:
+        Dict con los arrays de cada columna estadística
+    """
+    n = n0 + n1 + n2
+    suma = n1 + 2 * n2
+    suma_cuadrados = n1 + 4 * n2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        promedio = np.where(n > 0, suma / n, np.nan)
+        # Varianza muestral (ddof=1), igual que Series.std()
+        varianza = np.where(n > 1, (suma_cuadrados - n * promedio ** 2) / (n - 1), np.nan)
+    desviacion = np.sqrt(np.clip(varianza, 0, None))
+
+    # Mediana: promedio de los valores en las posiciones centrales de la
+    # secuencia ordenada 0...0 1...1 2...2
+    def valor_en(posicion):
+        return np.where(posicion < n0, 0, np.where(posicion < n0 + n1, 1, 2))
+
+    mediana = np.where(n > 0, (valor_en((n - 1) // 2) + valor_en(n // 2)) / 2, np.nan)
+
+    return {
+        'promedio': promedio,
+        'mediana': mediana,
+        'desviacion': desviacion,
+        'evaluaciones': n,
+        'fortalezas': n2,
+        'oportunidades': n1,
+        'riesgos': n0,
+    }
+
+
+class Agregados:
+    """
+    Agregados de una versión concreta del cubo de puntuaciones.
+
+    Los DataFrames devueltos se comparten entre sesiones: para añadir
+    columnas o reordenar hay que trabajar sobre una copia.
+    """
+
+    def __init__(self, cubo: CuboPuntuaciones):
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple, pd.DataFrame] = {}
+        self.base = self._construir_base(cubo)
+
+    @staticmethod
+    def _construir_base(cubo: CuboPuntuaciones) -> pd.DataFrame:
+        """Conteos de 0/1/2 por celda evaluada del cubo."""
+        celdas = cubo.celdas()
+        if celdas.empty:
+            return pd.DataFrame(columns=CLAVES_BASE + ['n0', 'n1', 'n2'])
+
+        resultado = celdas.pop('resultado').to_numpy()
+        for valor in (0, 1, 2):
+            celdas[f'n{valor}'] = (resultado == valor).astype(np.int64)
+        return celdas[CLAVES_BASE + ['n0', 'n1', 'n2']]
+
+    def resumir(self, claves: List[str], distintos: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Agrega los conteos por las claves indicadas (memorizado).
+
+        Como en DataFrame.groupby, se descartan las filas con claves nulas.
+
+        Args:
+            claves: Columnas de agrupación (subconjunto de CLAVES_BASE)
+            distintos: Columnas extra con conteo de valores distintos,
+                {nombre_salida: columna_base}, p.ej. {'grupos': 'codigo_grupo'}
+
+        Returns:
+            DataFrame con las claves, COLUMNAS_ESTADISTICAS y los distintos
+        """
+        distintos = distintos or {}
+        clave_memo = (tuple(claves), tuple(sorted(distintos.items())))
+
+        with self._lock:
+            if clave_memo not in self._memo:
+                self._memo[clave_memo] = self._resumir(claves, distintos)
+            return self._memo[clave_memo]
+
+    def _resumir(self, claves: List[str], distintos: Dict[str, str]) -> pd.DataFrame:
+        columnas_salida = claves + COLUMNAS_ESTADISTICAS + list(distintos)
+        if self.base.empty:
+            return pd.DataFrame(columns=columnas_salida)
+
+        agrupado = self.base.groupby(claves, observed=True)
+        conteos = agrupado[['n0', 'n1', 'n2']].sum()
+        resultado = pd.DataFrame(
+            _estadisticas_desde_conteos(
+                conteos['n0'].to_numpy(), conteos['n1'].to_numpy(), conteos['n2'].to_numpy()
+            ),
+            index=conteos.index
+        )
+        for nombre, columna in distintos.items():
+            resultado[nombre] = agrupado[columna].nunique()
+
+        return resultado.reset_index()[columnas_salida]
+
+    def resumen_global(self) -> Dict:
+        """Estadísticas sobre todas las evaluaciones (sin agrupar)."""
+        with self._lock:
+            if ('global',) not in self._memo:
+                n0, n1, n2 = (np.array([self.base[c].sum()]) for c in ('n0', 'n1', 'n2'))
+                fila = {k: v[0].item() for k, v in _estadisticas_desde_conteos(n0, n1, n2).items()}
+                for nombre, columna in (('grupos', 'codigo_grupo'), ('curadores', 'curador'),
+                                        ('aspectos', 'aspecto'), ('fichas', 'ficha')):
+                    fila[nombre] = int(self.base[columna].nunique())
+                self._memo[('global',)] = fila
+            return self._memo[('global',)]
+
+    # ------------------------------------------------------------------
+    # Agregados estándar
+    # ------------------------------------------------------------------
+
+    @property
+    def por_grupo(self) -> pd.DataFrame:
+        """Por grupo (código, nombre y ficha del grupo evaluado)."""
+        return self.resumir(['codigo_grupo', 'nombre_propuesta', 'ficha'],
+                            {'curadores': 'curador'})
+
+    @property
+    def por_grupo_dimension(self) -> pd.DataFrame:
+        """Por grupo y dimensión."""
+        return self.resumir(['codigo_grupo', 'nombre_propuesta', 'ficha', 'dimension'],
+                            {'curadores': 'curador'})
+
+    @property
+    def por_dimension(self) -> pd.DataFrame:
+        """Por dimensión."""
+        return self.resumir(['dimension'], {'grupos': 'codigo_grupo'})
+
+    @property
+    def por_aspecto(self) -> pd.DataFrame:
+        """Por aspecto (con su dimensión)."""
+        return self.resumir(['dimension', 'aspecto'], {'grupos': 'codigo_grupo'})
+
+    @property
+    def por_curador(self) -> pd.DataFrame:
+        """Por curador."""
+        return self.resumir(['curador'], {'grupos': 'codigo_grupo', 'fichas': 'ficha'})
+
+    @property
+    def por_ficha(self) -> pd.DataFrame:
+        """Por ficha aplicada en la evaluación."""
+        return self.resumir(['ficha'], {'grupos': 'codigo_grupo', 'curadores': 'curador'})
+
+
+def obtener_agregados() -> Agregados:
+    """
+    Devuelve los agregados de la versión actual de las evaluaciones.
+
+    Se calculan una vez por versión de datos y se comparten entre todas las
+    sesiones mediante la caché de evaluaciones.
+
+    Returns:
+        Instancia de Agregados
+    """
+    return cache_evaluaciones.obtener_derivado('agregados', lambda df: Agregados(obtener_cubo()))
@@ -0,0 +1,209 @@
+"""
+Cubo denso de puntuaciones (grupo × curador × aspecto)
+Las puntuaciones 0-2 se guardan en un array int8 con SIN_PUNTUACION para las
+celdas sin evaluar; las dimensiones se resuelven con una máscara de
+pertenencia y las fichas con la ficha guardada en cada celda, de modo que
+cualquier reducción es una operación vectorizada de NumPy en lugar de un
+groupby sobre columnas de texto.
+"""
+import logging
+import math
+import numpy as np
+import pandas as pd
+from typing import Tuple
+from src.database.cache_evaluaciones import cache_evaluaciones
+
+logger = logging.getLogger(__name__)
+
+
+# Valor de las celdas sin evaluación
+SIN_PUNTUACION = -1
+
+# Ejes que se pueden conservar en una reducción. 'ficha' agrupa las celdas
+# según la ficha con que se evaluaron; 'dimension' agrupa aspectos.
+EJES = ('grupo', 'curador', 'aspecto', 'ficha', 'dimension')
+
+# Letra de cada eje en las expresiones de np.einsum
+_LETRAS = {'grupo': 'g', 'curador': 'c', 'aspecto': 'a', 'dimension': 'd'}
+
+
+def _factorizar(valores) -> Tuple[np.ndarray, pd.Index]:
+    """Códigos y etiquetas ordenadas; los nulos son una etiqueta más."""
+    if len(valores) == 0:
+        # pd.factorize no admite un MultiIndex vacío
+        return np.empty(0, dtype=np.intp), valores[:0] if isinstance(valores, pd.Index) else pd.Index(valores[:0])
+    codigos, etiquetas = pd.factorize(valores, sort=True, use_na_sentinel=False)
+    if isinstance(etiquetas, pd.CategoricalIndex):
+        etiquetas = pd.Index(etiquetas.astype(object))
+    return codigos, etiquetas
+
+
+class CuboPuntuaciones:
+    """
+    Puntuaciones de una versión concreta del DataFrame de evaluaciones.
+
+    Attributes:
+        puntuaciones: int8 (grupos, curadores, aspectos); SIN_PUNTUACION si no hay dato
+        grupos, curadores, fichas, dimensiones: Índices de etiquetas de cada eje
+        aspectos: MultiIndex (dimension, aspecto) del eje de aspectos
+        nombres_grupo: Nombre de la propuesta de cada grupo
+        dimension_de_aspecto: Índice de dimensión de cada aspecto
+        ficha_evaluada: int16 (grupos, curadores, aspectos) con la ficha de cada
+            evaluación, -1 si no hay dato
+        mascara_dimension: bool (dimensiones, aspectos)
+
+    Si un curador evaluó el mismo aspecto de un grupo con dos fichas distintas
+    sólo se conserva la evaluación más reciente.
+    """
+
+    def __init__(self, df_eval: pd.DataFrame):
+        columnas = ['codigo_grupo', 'nombre_propuesta', 'curador', 'ficha', 'dimension', 'aspecto', 'resultado']
+        if df_eval.empty:
+            df_eval = pd.DataFrame(columns=columnas)
+
+        g, self.grupos = _factorizar(df_eval['codigo_grupo'])
+        c, self.curadores = _factorizar(df_eval['curador'])
+        f, self.fichas = _factorizar(df_eval['ficha'])
+        a, aspectos = _factorizar(pd.MultiIndex.from_arrays([df_eval['dimension'], df_eval['aspecto']]))
+        self.aspectos = aspectos.set_names(['dimension', 'aspecto'])
+        self.dimension_de_aspecto, self.dimensiones = _factorizar(
+            self.aspectos.get_level_values('dimension')
+        )
+
+        # Nombre de cada grupo (primera aparición de su código)
+        _, primera = np.unique(g, return_index=True)
+        self.nombres_grupo = df_eval['nombre_propuesta'].to_numpy()[primera]
+
+        forma = (len(self.grupos), len(self.curadores), len(self.aspectos))
+        self.puntuaciones = np.full(forma, SIN_PUNTUACION, dtype=np.int8)
+        self.ficha_evaluada = np.full(forma, -1, dtype=np.int16)
+
+        if len(g):
+            # El DataFrame llega ordenado por fecha descendente: np.unique se
+            # queda con la primera aparición de cada celda (la más reciente)
+            celda = np.ravel_multi_index((g, c, a), forma)
+            _, unicos = np.unique(celda, return_index=True)
+            if len(unicos) < len(celda):
+                logger.warning(
+                    f"Cubo de puntuaciones: {len(celda) - len(unicos)} evaluaciones repetidas "
+                    f"(mismo grupo, curador y aspecto) descartadas"
+                )
+            resultado = df_eval['resultado'].to_numpy()
+            self.puntuaciones[g[unicos], c[unicos], a[unicos]] = resultado[unicos]
+            self.ficha_evaluada[g[unicos], c[unicos], a[unicos]] = f[unicos]
+
+        self.mascara_dimension = (
+            self.dimension_de_aspecto[np.newaxis, :] == np.arange(len(self.dimensiones))[:, np.newaxis]
+        )
+
+    # ------------------------------------------------------------------
+    # Reducciones
+    # ------------------------------------------------------------------
+
+    def _reducir(self, indicador: np.ndarray, conservar: Tuple[str, ...]) -> np.ndarray:
+        """
+        Suma un array (grupos, curadores, aspectos) sobre los ejes no
+        conservados, agrupando por ficha o dimensión si se piden.
+        """
+        for eje in conservar:
+            if eje not in EJES:
+                raise ValueError(f"Eje desconocido: {eje}. Ejes válidos: {', '.join(EJES)}")
+        if len(set(conservar)) != len(conservar):
+            raise ValueError("Ejes repetidos en la reducción")
+
+        if 'ficha' in conservar:
+            # Cada celda evaluada suma en la casilla de su propia ficha: un
+            # curador puede haber evaluado el mismo grupo con más de una ficha
+            g, c, a = np.nonzero(self.ficha_evaluada >= 0)
+            indices = {
+                'grupo': g, 'curador': c, 'aspecto': a,
+                'ficha': self.ficha_evaluada[g, c, a],
+                'dimension': self.dimension_de_aspecto[a],
+            }
+            forma = tuple(len(self.etiquetas(eje)) for eje in conservar)
+            destino = np.ravel_multi_index(tuple(indices[eje] for eje in conservar), forma)
+            suma = np.bincount(destino, weights=indicador[g, c, a], minlength=math.prod(forma))
+            return suma.reshape(forma).astype(indicador.dtype)
+
+        operandos = [indicador]
+        entradas = ['gca']
+        if 'dimension' in conservar:
+            operandos.append(self.mascara_dimension.astype(np.int32))
+            entradas.append('da')
+
+        salida = ''.join(_LETRAS[eje] for eje in conservar)
+        return np.einsum(f"{','.join(entradas)}->{salida}", *operandos, optimize=True)
+
+    def distribucion(self, *conservar: str) -> np.ndarray:
+        """
+        Cuenta los resultados 0, 1 y 2 conservando los ejes indicados.
+
+        Args:
+            conservar: Ejes de la salida, en orden (ver EJES)
+
+        Returns:
+            Array con un eje por cada eje conservado más uno final de tamaño 3
+            (riesgos, oportunidades, fortalezas)
+        """
+        return np.stack(
+            [self._reducir((self.puntuaciones == valor).astype(np.int32), conservar) for valor in (0, 1, 2)],
+            axis=-1
+        )
+
+    def conteos(self, *conservar: str) -> np.ndarray:
+        """Número de evaluaciones conservando los ejes indicados."""
+        return self._reducir((self.puntuaciones != SIN_PUNTUACION).astype(np.int32), conservar)
+
+    def medias(self, *conservar: str) -> np.ndarray:
+        """Promedio de resultados conservando los ejes indicados (NaN sin datos)."""
+        validas = self.puntuaciones != SIN_PUNTUACION
+        suma = self._reducir(np.where(validas, self.puntuaciones, 0).astype(np.int32), conservar)
+        conteo = self._reducir(validas.astype(np.int32), conservar)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(conteo > 0, suma / conteo, np.nan)
+
+    # ------------------------------------------------------------------
+    # Etiquetas
+    # ------------------------------------------------------------------
+
+    def etiquetas(self, eje: str) -> pd.Index:
+        """Etiquetas de un eje, alineadas con las posiciones del array."""
+        return {
+            'grupo': self.grupos,
+            'curador': self.curadores,
+            'aspecto': self.aspectos,
+            'ficha': self.fichas,
+            'dimension': self.dimensiones,
+        }[eje]
+
+    def celdas(self) -> pd.DataFrame:
+        """
+        Una fila por celda evaluada, con sus etiquetas y resultado.
+
+        Returns:
+            DataFrame con codigo_grupo, nombre_propuesta, ficha, dimension,
+            aspecto, curador y resultado
+        """
+        g, c, a = np.nonzero(self.puntuaciones != SIN_PUNTUACION)
+        return pd.DataFrame({
+            'codigo_grupo': self.grupos[g],
+            'nombre_propuesta': self.nombres_grupo[g],
+            'ficha': self.fichas.take(self.ficha_evaluada[g, c, a]) if len(g) else self.fichas[:0],
+            'dimension': self.aspectos.get_level_values('dimension')[a],
+            'aspecto': self.aspectos.get_level_values('aspecto')[a],
+            'curador': self.curadores[c],
+            'resultado': self.puntuaciones[g, c, a],
+        })
+
+
+def obtener_cubo() -> CuboPuntuaciones:
+    """
+    Devuelve el cubo de puntuaciones de la versión actual de las evaluaciones.
+
+    Se construye una vez por versión de datos y se comparte entre sesiones
+    mediante la caché de evaluaciones.
+
+    Returns:
+        Instancia de CuboPuntuaciones
+    """
+    return cache_evaluaciones.obtener_derivado('cubo', CuboPuntuaciones)
@@ -3,8 +3,9 @@ Configuración centralizada de la aplicación
 """
 import datetime
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -41,6 +42,71 @@ class UmbralesPatrimoniales:
         self.mejora_max = float(os.getenv("UMBRAL_MEJORA", str(self.mejora_max)))
 
 
+@dataclass(frozen=True)
+class PerfilAlmacenamiento:
+    """Parámetros de SQLite que se aplican a cada conexión nueva"""
+    nombre: str
+    journal_mode: Optional[str]   # None = no modificar el modo del archivo
+    synchronous: str
+    mmap_size: int                # bytes
+    cache_size: int               # negativo = KiB, positivo = páginas
+    temp_store: str
+    busy_timeout: int             # milisegundos
+    solo_lectura: bool = False
+
+
+# Perfiles disponibles (seleccionables con DB_PROFILE)
+PERFILES_ALMACENAMIENTO = {
+    # Lectores y escritor concurrentes: WAL + fsync sólo en checkpoints
+    "wal": PerfilAlmacenamiento(
+        nombre="wal",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-32000,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+    # Valores conservadores de SQLite: rollback journal y fsync en cada commit
+    "safe": PerfilAlmacenamiento(
+        nombre="safe",
+        journal_mode="DELETE",
+        synchronous="FULL",
+        mmap_size=0,
+        cache_size=-2000,
+        temp_store="DEFAULT",
+        busy_timeout=5000,
+    ),
+    # Réplicas o tableros de sólo consulta
+    "readonly": PerfilAlmacenamiento(
+        nombre="readonly",
+        journal_mode=None,
+        synchronous="NORMAL",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-32000,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+        solo_lectura=True,
+    ),
+}
+
+
+def _cargar_perfil_almacenamiento() -> PerfilAlmacenamiento:
+    """Obtiene el perfil indicado en DB_PROFILE, con ajustes opcionales por variable de entorno"""
+    nombre = os.getenv("DB_PROFILE", "wal").strip().lower()
+    perfil = PERFILES_ALMACENAMIENTO.get(nombre)
+    if perfil is None:
+        raise ValueError(
+            f"DB_PROFILE inválido: '{nombre}'. Opciones: {', '.join(PERFILES_ALMACENAMIENTO)}"
+        )
+    return replace(
+        perfil,
+        mmap_size=int(os.getenv("DB_MMAP_SIZE", str(perfil.mmap_size))),
+        cache_size=int(os.getenv("DB_CACHE_SIZE", str(perfil.cache_size))),
+        busy_timeout=int(os.getenv("DB_BUSY_TIMEOUT", str(perfil.busy_timeout))),
+    )
+
+
 @dataclass
 class ConfiguracionApp:
     """Configuración general de la aplicación"""
@@ -54,10 +120,38 @@ class ConfiguracionApp:
     excel_path: str = field(default_factory=lambda: os.getenv("EXCEL_PATH", str(DATA_DIR / "propuestas_artisticas.xlsx")))
     logo_path: str = field(default_factory=lambda: os.getenv("LOGO_PATH", str(ASSETS_DIR / "CDB_EMPRESA_ASSETS.svg")))
     
+    # Pool de conexiones a la base de datos
+    db_pool_size: int = field(default_factory=lambda: int(os.getenv("DB_POOL_SIZE", "8")))
+    
+    # Escritor único: ventana de agrupación (ms), escrituras por transacción y capacidad de la cola
+    db_escritor_ventana_ms: float = field(default_factory=lambda: float(os.getenv("DB_ESCRITOR_VENTANA_MS", "5")))
+    db_escritor_max_lote: int = field(default_factory=lambda: int(os.getenv("DB_ESCRITOR_MAX_LOTE", "200")))
+    db_escritor_max_cola: int = field(default_factory=lambda: int(os.getenv("DB_ESCRITOR_MAX_COLA", "1000")))
+    
+    # Perfil de almacenamiento SQLite (wal | safe | readonly)
+    db_perfil: PerfilAlmacenamiento = field(default_factory=_cargar_perfil_almacenamiento)
+    
     # Parámetros de validación
     min_caracteres_observacion: int = field(default_factory=lambda: int(os.getenv("MIN_CARACTERES_OBSERVACION", "5")))
     max_grupos_por_curador: int = field(default_factory=lambda: int(os.getenv("MAX_GRUPOS_POR_CURADOR", "500")))
     
+    # Asignación de grupos: curadores que deben evaluar cada grupo
+    curadores_por_grupo: int = field(default_factory=lambda: int(os.getenv("CURADORES_POR_GRUPO", "3")))
+    
+    # Segundos entre guardados automáticos del borrador del formulario del curador
+    intervalo_borrador: int = field(default_factory=lambda: int(os.getenv("INTERVALO_BORRADOR", "5")))
+    
+    # Auditoría en segundo plano: volcado cada log_intervalo_ms o al juntar log_lote
+    # eventos; con log_buffer_max eventos pendientes los nuevos se descartan
+    log_intervalo_ms: float = field(default_factory=lambda: float(os.getenv("LOG_INTERVALO_MS", "500")))
+    log_lote: int = field(default_factory=lambda: int(os.getenv("LOG_LOTE", "100")))
+    log_buffer_max: int = field(default_factory=lambda: int(os.getenv("LOG_BUFFER_MAX", "10000")))
+    
+    # Retención de logs_sistema: días que se conservan antes de pasar a la base de
+    # archivo (LOG_ARCHIVO_PATH; vacío = <base principal>_logs_archivo.db)
+    log_retencion_dias: int = field(default_factory=lambda: int(os.getenv("LOG_RETENCION_DIAS", "90")))
+    log_archivo_path: str = field(default_factory=lambda: os.getenv("LOG_ARCHIVO_PATH", ""))
+    
     # Umbrales patrimoniales
     umbrales: UmbralesPatrimoniales = field(default_factory=UmbralesPatrimoniales)
     
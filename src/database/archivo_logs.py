@@ -0,0 +1,126 @@
+"""
+Retención y archivo de logs_sistema
+Los eventos con más de config.log_retencion_dias días se mueven por lotes a
+una base de datos de archivo aparte (misma tabla logs_sistema, mismos id), de
+modo que la tabla de la base principal sólo guarda los recientes. Las
+consultas de LogModel pueden abarcar ambas adjuntando el archivo con ATTACH.
+
+Mover un lote son dos transacciones (copiar al archivo y borrar de la
+principal). Si el proceso se interrumpe entre ambas, las filas quedan en las
+dos bases: la siguiente pasada las copia con INSERT OR IGNORE y las borra, y
+mientras tanto las consultas descartan del archivo los id que siguen en la
+tabla principal.
+"""
+import logging
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Generator, Optional
+from src.config import config
+from src.database.connection import get_db_connection
+from src.database.escritor import escritor
+
+logger = logging.getLogger(__name__)
+
+# Eventos movidos por transacción
+LOTE_ARCHIVO = 5000
+
+# Nombre del esquema con el que se adjunta el archivo
+ESQUEMA_ARCHIVO = "archivo"
+
+ARCHIVO_LOGS_SQL = """
+CREATE TABLE IF NOT EXISTS logs_sistema (
+    id INTEGER PRIMARY KEY,
+    usuario TEXT,
+    accion TEXT NOT NULL,
+    detalle TEXT,
+    fecha TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_logs_fecha ON logs_sistema(fecha);
+CREATE INDEX IF NOT EXISTS idx_logs_usuario ON logs_sistema(usuario);
+"""
+
+
+def ruta_archivo() -> str:
+    """
+    Ruta de la base de datos de archivo: LOG_ARCHIVO_PATH o, si no se indicó,
+    <base principal>_logs_archivo.db junto a la base principal.
+    """
+    if config.log_archivo_path:
+        return config.log_archivo_path
+    principal = Path(config.db_path)
+    return str(principal.with_name(f"{principal.stem}_logs_archivo.db"))
+
+
+def _abrir_archivo() -> sqlite3.Connection:
+    """Abre la base de archivo creando su esquema si no existe."""
+    conn = sqlite3.connect(ruta_archivo())
+    conn.executescript(ARCHIVO_LOGS_SQL)
+    return conn
+
+
+def archivar_logs(dias: Optional[int] = None, lote: int = LOTE_ARCHIVO) -> int:
+    """
+    Mueve al archivo los eventos anteriores a la ventana de retención.
+
+    Args:
+        dias: Días que se conservan en logs_sistema (None = config.log_retencion_dias)
+        lote: Eventos movidos por transacción
+
+    Returns:
+        Número de eventos archivados (-1 si hubo un error)
+    """
+    dias = config.log_retencion_dias if dias is None else dias
+    # fecha se guarda en UTC con el formato de CURRENT_TIMESTAMP
+    corte = (datetime.now(timezone.utc) - timedelta(days=dias)).strftime('%Y-%m-%d %H:%M:%S')
+    total = 0
+    try:
+        with closing(_abrir_archivo()) as archivo:
+            while True:
+                with get_db_connection() as conn:
+                    filas = [tuple(fila) for fila in conn.execute("""
+                        SELECT id, usuario, accion, detalle, fecha FROM logs_sistema
+                        WHERE fecha < ?
+                        ORDER BY fecha
+                        LIMIT ?
+                    """, (corte, lote))]
+                if not filas:
+                    break
+
+                with archivo:
+                    archivo.executemany("INSERT OR IGNORE INTO logs_sistema VALUES (?, ?, ?, ?, ?)", filas)
+                ids = [(fila[0],) for fila in filas]
+                escritor.ejecutar(lambda cursor: cursor.executemany("DELETE FROM logs_sistema WHERE id = ?", ids))
+
+                total += len(filas)
+                if len(filas) < lote:
+                    break
+    except Exception as e:
+        logger.error(f"Error archivando logs anteriores a {corte}: {e}")
+        return -1
+
+    if total:
+        logger.info(f"Logs archivados: {total} eventos anteriores a {corte} en {ruta_archivo()}")
+    return total
+
+
+@contextmanager
+def con_archivo(conn: sqlite3.Connection) -> Generator[bool, None, None]:
+    """
+    Adjunta la base de archivo a una conexión mientras dura el bloque.
+
+    Yields:
+        True si el archivo quedó adjunto como ESQUEMA_ARCHIVO; False si aún no
+        existe (no se ha archivado nada)
+    """
+    ruta = ruta_archivo()
+    if not Path(ruta).exists():
+        yield False
+        return
+    conn.execute(f"ATTACH DATABASE ? AS {ESQUEMA_ARCHIVO}", (ruta,))
+    try:
+        yield True
+    finally:
+        conn.execute(f"DETACH DATABASE {ESQUEMA_ARCHIVO}")
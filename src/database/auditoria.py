@@ -0,0 +1,131 @@
+"""
+Auditoría en segundo plano
+LogModel.registrar_log deja cada evento en un buffer en memoria y vuelve de
+inmediato; un hilo lo vuelca a logs_sistema con un único executemany cuando
+se juntan log_lote eventos o cada log_intervalo_ms, a través del escritor
+único. Al terminar el proceso se vuelca lo pendiente. Si el buffer se llena
+(la base de datos no da abasto) los eventos nuevos se descartan y se cuentan.
+"""
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from src.config import config
+from src.database.escritor import escritor
+
+logger = logging.getLogger(__name__)
+
+Evento = Tuple[str, str, Optional[str], str]
+
+
+def _ahora() -> str:
+    """Instante actual en el formato de CURRENT_TIMESTAMP (UTC)."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class BufferAuditoria:
+    """
+    Buffer acotado de eventos de auditoría con su hilo de volcado, arrancado
+    con el primer evento.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Serializa los volcados (hilo de fondo, vaciar() y detener())
+        self._lock_volcado = threading.Lock()
+        self._eventos: List[Evento] = []
+        self._hay_eventos = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._parar: Optional[threading.Event] = None
+        self._descartados = 0
+        self._descartados_reportados = 0
+        self._escritos = 0
+
+    def registrar(self, usuario: str, accion: str, detalle: Optional[str] = None) -> bool:
+        """
+        Encola un evento sin tocar la base de datos.
+
+        Returns:
+            True si se encoló, False si el buffer estaba lleno y se descartó
+        """
+        with self._lock:
+            if len(self._eventos) >= config.log_buffer_max:
+                self._descartados += 1
+                return False
+            self._eventos.append((usuario, accion, detalle, _ahora()))
+            lleno = len(self._eventos) >= config.log_lote
+            if self._hilo is None:
+                self._parar = threading.Event()
+                self._hilo = threading.Thread(target=self._bucle, args=(self._parar,), name="auditoria", daemon=True)
+                self._hilo.start()
+        if lleno:
+            self._hay_eventos.set()
+        return True
+
+    def vaciar(self) -> int:
+        """
+        Vuelca ya los eventos pendientes (espera a que se confirmen).
+
+        Returns:
+            Número de eventos escritos
+        """
+        with self._lock_volcado:
+            with self._lock:
+                eventos, self._eventos = self._eventos, []
+                descartados = self._descartados - self._descartados_reportados
+                self._descartados_reportados = self._descartados
+            if descartados:
+                logger.warning(f"Buffer de auditoría lleno: se descartaron {descartados} eventos")
+            if not eventos:
+                return 0
+            try:
+                escritor.ejecutar(lambda cursor: cursor.executemany("""
+                    INSERT INTO logs_sistema (usuario, accion, detalle, fecha)
+                    VALUES (?, ?, ?, ?)
+                """, eventos))
+            except Exception as e:
+                logger.error(f"Error volcando {len(eventos)} eventos de auditoría: {e}")
+                with self._lock:
+                    self._descartados += len(eventos)
+                return 0
+            with self._lock:
+                self._escritos += len(eventos)
+            return len(eventos)
+
+    def estadisticas(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict con 'pendientes' (en el buffer), 'escritos' y 'descartados'
+            (por buffer lleno o por error al volcar) desde el inicio del proceso
+        """
+        with self._lock:
+            return {
+                'pendientes': len(self._eventos),
+                'escritos': self._escritos,
+                'descartados': self._descartados,
+            }
+
+    def detener(self) -> None:
+        """Vuelca lo pendiente y detiene el hilo (se vuelve a arrancar con el próximo evento)."""
+        with self._lock:
+            hilo, parar = self._hilo, self._parar
+            self._hilo = self._parar = None
+        if hilo is not None:
+            parar.set()
+            self._hay_eventos.set()
+            hilo.join()
+        self.vaciar()
+
+    def _bucle(self, parar: threading.Event) -> None:
+        while not parar.is_set():
+            self._hay_eventos.wait(timeout=config.log_intervalo_ms / 1000)
+            self._hay_eventos.clear()
+            self.vaciar()
+
+
+# Instancia única compartida por todas las sesiones del proceso
+auditoria = BufferAuditoria()
+
+# Registrada después de la del escritor: atexit la ejecuta antes
+atexit.register(auditoria.detener)
@@ -0,0 +1,313 @@
+"""
+Caché incremental del DataFrame de evaluaciones del comité
+Tras la primera carga sólo se leen los aspectos nuevos (id > último visto)
+y las bajas registradas en evaluaciones_eliminadas. El DataFrame y sus
+agregados derivados se comparten entre todas las sesiones del proceso y
+sólo se revisan cuando PRAGMA data_version indica que hubo escrituras.
+"""
+import logging
+import pandas as pd
+from typing import Any, Callable, Dict, Optional
+from src.database.cache_versionada import CacheVersionada
+from src.database.connection import get_db_connection
+from src.database.lector_columnar import leer_columnar
+
+logger = logging.getLogger(__name__)
+
+
+# Consulta base del DataFrame de evaluaciones. El filtro por id permite
+# reutilizarla tanto para la carga completa (id > 0) como para el delta.
+CONSULTA_EVALUACIONES_DATAFRAME = """
+    SELECT
+        e.id,
+        u.username as curador,
+        e.codigo_grupo,
+        g.nombre_propuesta,
+        g.modalidad,
+        g.tipo,
+        g.naturaleza,
+        f.nombre as ficha,
+        -- Ficha asociada al grupo (ficha del grupo)
+        fg.nombre as ficha_grupo,
+        d.nombre as dimension,
+        a.nombre as aspecto,
+        e.resultado,
+        e.observacion,
+        e.fecha_registro
+    FROM evaluaciones e
+    LEFT JOIN usuarios u ON e.usuario_id = u.id
+    LEFT JOIN grupos g ON e.codigo_grupo = g.codigo
+    LEFT JOIN fichas f ON e.ficha_id = f.id
+    LEFT JOIN fichas fg ON g.ficha_id = fg.id
+    JOIN aspectos a ON e.aspecto_id = a.id
+    JOIN dimensiones d ON a.dimension_id = d.id
+    WHERE e.id > ?
+    ORDER BY e.fecha_registro DESC
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ESQUEMA DE TIPOS DEL DATAFRAME
+# ═══════════════════════════════════════════════════════════════════
+
+# Columnas de texto con muchos valores repetidos: se guardan como Categorical
+# (un código entero por fila más una sola copia de cada texto). La observación
+# se repite en todos los aspectos de una misma evaluación.
+COLUMNAS_CATEGORICAS = (
+    'curador', 'codigo_grupo', 'nombre_propuesta', 'modalidad', 'tipo',
+    'naturaleza', 'ficha', 'ficha_grupo', 'dimension', 'aspecto', 'observacion'
+)
+
+# Tipo de cada columna del DataFrame de evaluaciones
+TIPOS_EVALUACIONES = {
+    'id': 'int64',
+    'resultado': 'int8',
+    'fecha_registro': 'datetime64[ns]',
+    **{columna: 'category' for columna in COLUMNAS_CATEGORICAS},
+}
+
+
+def aplicar_tipos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte las columnas leídas de SQLite a los tipos de TIPOS_EVALUACIONES.
+
+    Las categorías quedan ordenadas alfabéticamente, de modo que ordenar o
+    factorizar por código equivale a hacerlo por texto.
+
+    Args:
+        df: DataFrame recién leído (sólo se convierten las columnas presentes)
+
+    Returns:
+        DataFrame con los tipos del esquema
+    """
+    for columna, tipo in TIPOS_EVALUACIONES.items():
+        if columna not in df.columns:
+            continue
+        if tipo == 'datetime64[ns]':
+            df[columna] = pd.to_datetime(df[columna], format='ISO8601', errors='coerce')
+        elif tipo == 'category':
+            df[columna] = pd.Categorical(df[columna])
+        else:
+            df[columna] = df[columna].astype(tipo)
+    return df
+
+
+def concatenar_tipado(nuevos: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concatena dos DataFrames tipados conservando las columnas categóricas.
+
+    pd.concat convierte a object las categóricas con categorías distintas,
+    así que antes se unifican (en orden alfabético) en ambos lados.
+
+    Args:
+        nuevos: Filas que van al inicio
+        df: Filas existentes
+
+    Returns:
+        DataFrame concatenado con índice nuevo
+    """
+    nuevos = nuevos.copy(deep=False)
+    df = df.copy(deep=False)
+    for columna in COLUMNAS_CATEGORICAS:
+        if columna not in df.columns or columna not in nuevos.columns:
+            continue
+        categorias_df = df[columna].cat.categories
+        categorias_nuevas = nuevos[columna].cat.categories
+        if not categorias_nuevas.difference(categorias_df).empty:
+            # Recodificar sólo enteros: el texto de cada categoría no se copia
+            categorias_df = categorias_df.union(categorias_nuevas).sort_values()
+            df[columna] = df[columna].cat.set_categories(categorias_df)
+        nuevos[columna] = nuevos[columna].cat.set_categories(categorias_df)
+    return pd.concat([nuevos, df], ignore_index=True)
+
+
+def leer_evaluaciones(conn, desde_id: int = 0) -> pd.DataFrame:
+    """
+    Ejecuta CONSULTA_EVALUACIONES_DATAFRAME con el lector columnar, que
+    produce directamente los tipos del esquema.
+
+    Args:
+        conn: Conexión abierta
+        desde_id: Sólo aspectos con id mayor a este
+
+    Returns:
+        DataFrame tipado, ordenado por fecha_registro descendente
+    """
+    return leer_columnar(conn, CONSULTA_EVALUACIONES_DATAFRAME, (desde_id,), TIPOS_EVALUACIONES)
+
+
+class CacheEvaluaciones(CacheVersionada):
+    """
+    DataFrame de evaluaciones compartido por todo el proceso.
+
+    Si PRAGMA data_version no cambió (ver CacheVersionada) se devuelve el
+    DataFrame sin más consultas. Si cambió, se leen las lápidas nuevas y los aspectos con
+    id mayor al último visto; sólo si cambiaron los catálogos (nombres de
+    grupos, fichas, aspectos...) se recarga todo.
+
+    Los agregados derivados del DataFrame se memorizan por versión con
+    obtener_derivado(), de modo que todas las sesiones reutilizan el mismo
+    cálculo hasta la siguiente escritura.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._df: Optional[pd.DataFrame] = None
+        self._ultimo_id = 0
+        self._ultima_lapida = 0
+        self._version_catalogo: Optional[int] = None
+        self._version = 0
+        self._derivados: Dict[str, Any] = {}
+        self._calculando = 0
+
+    @property
+    def version(self) -> int:
+        """Número que cambia cada vez que cambia el DataFrame en caché."""
+        with self._lock:
+            return self._version
+
+    def obtener(self) -> pd.DataFrame:
+        """
+        Devuelve el DataFrame de evaluaciones actualizado.
+
+        Returns:
+            Copia superficial del DataFrame en caché: se pueden añadir columnas
+            sin afectar a otras sesiones, pero no se deben modificar valores
+        """
+        with self._lock:
+            try:
+                self._refrescar()
+            except Exception as e:
+                logger.error(f"Error actualizando caché de evaluaciones: {e}")
+                self._descartar()
+                return pd.DataFrame()
+            return self._df.copy(deep=False)
+
+    def obtener_derivado(self, clave: str, calcular: Callable[[pd.DataFrame], Any]) -> Any:
+        """
+        Devuelve un valor derivado del DataFrame, calculado una vez por versión.
+
+        Un derivado puede usar otros derivados: mientras se calcula no se
+        vuelve a consultar la sonda, así todos parten de la misma versión.
+
+        Args:
+            clave: Identificador único del valor derivado
+            calcular: Función que recibe el DataFrame y devuelve el valor
+
+        Returns:
+            Valor memorizado (compartido entre sesiones: no modificarlo)
+        """
+        with self._lock:
+            if self._calculando and self._df is not None:
+                df = self._df.copy(deep=False)
+            else:
+                df = self.obtener()
+            if clave not in self._derivados:
+                self._calculando += 1
+                try:
+                    self._derivados[clave] = calcular(df)
+                finally:
+                    self._calculando -= 1
+            return self._derivados[clave]
+
+    def invalidar(self, solo_derivados: bool = False) -> None:
+        """
+        Descarta la caché; la próxima lectura la reconstruye.
+
+        Args:
+            solo_derivados: Si es True conserva el DataFrame y sólo descarta
+                los agregados memorizados
+        """
+        with self._lock:
+            if solo_derivados:
+                self._derivados = {}
+                self._version += 1
+            else:
+                self._descartar()
+
+    def _descartar(self) -> None:
+        self._df = None
+        self._data_version = None
+        self._derivados = {}
+        self._version += 1
+
+    def _cargada(self) -> bool:
+        return self._df is not None
+
+    def _descartar_datos(self) -> None:
+        self._df = None
+
+    def _refrescar(self) -> None:
+        """Comprueba la sonda y actualiza el DataFrame sólo si hubo escrituras."""
+        df_anterior = self._df
+        super()._refrescar()
+        if self._df is not df_anterior:
+            self._derivados = {}
+            self._version += 1
+
+    def _actualizar(self) -> None:
+        """Aplica el delta pendiente o recarga todo si es necesario."""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    (SELECT version_catalogo FROM control_cambios WHERE id = 1) as version_catalogo,
+                    (SELECT COALESCE(MAX(secuencia), 0) FROM evaluaciones_eliminadas) as ultima_lapida
+            """)
+            estado = cursor.fetchone()
+
+            recargar = (
+                self._df is None
+                or self._version_catalogo != estado['version_catalogo']
+                or estado['ultima_lapida'] < self._ultima_lapida
+            )
+
+            if recargar:
+                df = leer_evaluaciones(conn)
+                self._df = df.reset_index(drop=True)
+                self._version_catalogo = estado['version_catalogo']
+                self._ultima_lapida = estado['ultima_lapida']
+                # Se toma del propio DataFrame: un MAX(id) aparte podría
+                # saltarse filas insertadas entre ambas lecturas
+                self._ultimo_id = int(df['id'].max()) if not df.empty else 0
+                logger.info(f"Caché de evaluaciones cargada: {len(df)} filas")
+                return
+
+            df = self._df
+
+            # Bajas desde la última lectura
+            if estado['ultima_lapida'] > self._ultima_lapida:
+                cursor.execute(
+                    "SELECT evaluacion_id FROM evaluaciones_eliminadas WHERE secuencia > ?",
+                    (self._ultima_lapida,)
+                )
+                eliminados = [row[0] for row in cursor.fetchall()]
+                df = df[~df['id'].isin(eliminados)]
+                self._ultima_lapida = estado['ultima_lapida']
+
+            # Altas desde la última lectura. Los ids de evaluacion_detalle son
+            # AUTOINCREMENT y las escrituras en SQLite están serializadas, por lo
+            # que nunca aparece un id menor al último visto.
+            nuevos = leer_evaluaciones(conn, self._ultimo_id)
+            if not nuevos.empty:
+                # Las filas nuevas son las más recientes: van al inicio,
+                # respetando el orden por fecha_registro descendente
+                df = concatenar_tipado(nuevos, df)
+                self._ultimo_id = max(self._ultimo_id, int(nuevos['id'].max()))
+
+            if df is not self._df:
+                self._df = df.reset_index(drop=True)
+
+
+# Instancia única compartida por todas las sesiones del proceso
+cache_evaluaciones = CacheEvaluaciones()
+
+
+def invalidar_cache_evaluaciones(solo_derivados: bool = False) -> None:
+    """
+    Invalida la caché compartida de evaluaciones.
+
+    Args:
+        solo_derivados: Si es True sólo se recalculan los agregados
+    """
+    cache_evaluaciones.invalidar(solo_derivados=solo_derivados)
@@ -0,0 +1,60 @@
+"""
+Base de las cachés de proceso revisadas con PRAGMA data_version
+Una conexión propia de sonda (siempre la misma) lee PRAGMA data_version, que
+cambia cuando otra conexión confirma escrituras. Mientras no cambie, la caché
+se sirve sin más consultas; si cambió, la subclase decide qué releer.
+"""
+import sqlite3
+import threading
+from typing import Optional
+from src.config import config
+
+
+class CacheVersionada:
+    """
+    Sonda de escrituras compartida por catalogo_fichas, catalogo_grupos y
+    cache_evaluaciones.
+
+    Las subclases implementan _cargada(), _actualizar() y _descartar_datos()
+    y llaman a _refrescar() con self._lock tomado. Si cambia config.db_path
+    se abre una sonda nueva y se descartan los datos antes de actualizar.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._db_path: Optional[str] = None
+        self._sonda: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+
+    def _cargada(self) -> bool:
+        """Indica si hay datos en memoria."""
+        raise NotImplementedError
+
+    def _actualizar(self) -> None:
+        """Relee de la base de datos lo que haya cambiado."""
+        raise NotImplementedError
+
+    def _descartar_datos(self) -> None:
+        """Olvida los datos en memoria (la base de datos es otra)."""
+        raise NotImplementedError
+
+    def _leer_data_version(self) -> int:
+        """Lee PRAGMA data_version en la conexión de sonda (siempre la misma)."""
+        if self._sonda is None or self._db_path != config.db_path:
+            if self._sonda is not None:
+                self._sonda.close()
+            self._sonda = sqlite3.connect(config.db_path, check_same_thread=False)
+            self._db_path = config.db_path
+            self._descartar_datos()
+        return self._sonda.execute("PRAGMA data_version").fetchone()[0]
+
+    def _refrescar(self) -> None:
+        """Comprueba la sonda y actualiza sólo si hubo escrituras."""
+        # Se lee antes de actualizar: una escritura concurrente a la
+        # actualización volverá a cambiarlo y se aplicará en la próxima lectura
+        data_version = self._leer_data_version()
+        if self._cargada() and data_version == self._data_version:
+            return
+
+        self._actualizar()
+        self._data_version = data_version
@@ -0,0 +1,204 @@
+"""
+Catálogo de fichas, dimensiones y aspectos en memoria
+Árbol inmutable fichas -> dimensiones -> aspectos con mapas por id y por
+código, compartido entre todas las sesiones del proceso. Sólo se reconstruye
+cuando cambia control_fichas.version, que los triggers de fichas, dimensiones,
+ficha_dimensiones y aspectos incrementan en cada alta, modificación o baja.
+"""
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+from src.database.cache_versionada import CacheVersionada
+from src.database.connection import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# NODOS DEL ÁRBOL
+# ═══════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class Aspecto:
+    """Fila de aspectos"""
+    id: int
+    dimension_id: int
+    nombre: str
+    descripcion: Optional[str]
+    orden: int
+
+    def fila(self) -> Dict:
+        """Columnas de la tabla como dict nuevo (SELECT *)."""
+        return {'id': self.id, 'dimension_id': self.dimension_id, 'nombre': self.nombre,
+                'descripcion': self.descripcion, 'orden': self.orden}
+
+
+@dataclass(frozen=True)
+class Dimension:
+    """Fila de dimensiones con sus aspectos ordenados"""
+    id: int
+    codigo: str
+    nombre: str
+    descripcion: Optional[str]
+    orden: int
+    aspectos: Tuple[Aspecto, ...] = ()
+
+    def fila(self) -> Dict:
+        """Columnas de la tabla como dict nuevo (SELECT *)."""
+        return {'id': self.id, 'codigo': self.codigo, 'nombre': self.nombre,
+                'descripcion': self.descripcion, 'orden': self.orden}
+
+
+@dataclass(frozen=True)
+class DimensionDeFicha:
+    """Fila de ficha_dimensiones con la dimensión que asigna"""
+    id: int
+    ficha_id: int
+    orden: int      # orden de la dimensión dentro de la ficha
+    dimension: Dimension
+
+    def fila(self) -> Dict:
+        """Columnas de la tabla como dict nuevo (SELECT *)."""
+        return {'id': self.id, 'ficha_id': self.ficha_id,
+                'dimension_id': self.dimension.id, 'orden': self.orden}
+
+
+@dataclass(frozen=True)
+class Ficha:
+    """Fila de fichas con sus dimensiones en el orden de la ficha"""
+    id: int
+    codigo: str
+    nombre: str
+    descripcion: Optional[str]
+    dimensiones: Tuple[DimensionDeFicha, ...] = ()
+
+    def fila(self) -> Dict:
+        """Columnas de la tabla como dict nuevo (SELECT *)."""
+        return {'id': self.id, 'codigo': self.codigo, 'nombre': self.nombre,
+                'descripcion': self.descripcion}
+
+
+def _mapa(pares) -> Mapping:
+    return MappingProxyType(dict(pares))
+
+
+@dataclass(frozen=True)
+class ArbolFichas:
+    """
+    Instantánea del catálogo. Nada de lo que contiene se puede modificar, así
+    que se entrega tal cual a todas las sesiones.
+    """
+    version: Optional[int] = None
+    fichas: Tuple[Ficha, ...] = ()                # por nombre
+    dimensiones: Tuple[Dimension, ...] = ()       # por orden
+    fichas_por_id: Mapping[int, Ficha] = field(default_factory=lambda: _mapa({}))
+    fichas_por_codigo: Mapping[str, Ficha] = field(default_factory=lambda: _mapa({}))
+    dimensiones_por_id: Mapping[int, Dimension] = field(default_factory=lambda: _mapa({}))
+    dimensiones_por_codigo: Mapping[str, Dimension] = field(default_factory=lambda: _mapa({}))
+    aspectos_por_id: Mapping[int, Aspecto] = field(default_factory=lambda: _mapa({}))
+
+
+def _construir_arbol(conn: sqlite3.Connection, version: int) -> ArbolFichas:
+    """Lee las cuatro tablas del catálogo (una consulta cada una) y arma el árbol."""
+    cursor = conn.cursor()
+
+    aspectos_de: Dict[int, list] = {}
+    cursor.execute("SELECT * FROM aspectos ORDER BY orden, id")
+    for row in cursor.fetchall():
+        aspectos_de.setdefault(row['dimension_id'], []).append(Aspecto(**dict(row)))
+
+    cursor.execute("SELECT * FROM dimensiones ORDER BY orden, id")
+    dimensiones = tuple(
+        Dimension(**dict(row), aspectos=tuple(aspectos_de.get(row['id'], ())))
+        for row in cursor.fetchall()
+    )
+    dimensiones_por_id = {d.id: d for d in dimensiones}
+
+    # Las asignaciones a dimensiones inexistentes se descartan, como en el JOIN
+    dimensiones_de: Dict[int, list] = {}
+    cursor.execute("SELECT * FROM ficha_dimensiones ORDER BY orden, id")
+    for row in cursor.fetchall():
+        dimension = dimensiones_por_id.get(row['dimension_id'])
+        if dimension is not None:
+            dimensiones_de.setdefault(row['ficha_id'], []).append(
+                DimensionDeFicha(id=row['id'], ficha_id=row['ficha_id'], orden=row['orden'], dimension=dimension)
+            )
+
+    cursor.execute("SELECT * FROM fichas ORDER BY nombre, id")
+    fichas = tuple(
+        Ficha(**dict(row), dimensiones=tuple(dimensiones_de.get(row['id'], ())))
+        for row in cursor.fetchall()
+    )
+
+    return ArbolFichas(
+        version=version,
+        fichas=fichas,
+        dimensiones=dimensiones,
+        fichas_por_id=_mapa((f.id, f) for f in fichas),
+        fichas_por_codigo=_mapa((f.codigo, f) for f in fichas),
+        dimensiones_por_id=_mapa(dimensiones_por_id),
+        dimensiones_por_codigo=_mapa((d.codigo, d) for d in dimensiones),
+        aspectos_por_id=_mapa((a.id, a) for d in dimensiones for a in d.aspectos),
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════
+# CACHÉ VERSIONADA
+# ═══════════════════════════════════════════════════════════════════
+
+class CatalogoFichas(CacheVersionada):
+    """
+    Caché de proceso del árbol de fichas. Las lecturas no tocan la base de
+    datos salvo la sonda PRAGMA data_version y, si hubo escrituras, la lectura
+    del contador de versión.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._arbol: Optional[ArbolFichas] = None
+
+    def arbol(self) -> ArbolFichas:
+        """
+        Returns:
+            Instantánea vigente del catálogo (vacía si no se pudo leer)
+        """
+        with self._lock:
+            try:
+                self._refrescar()
+            except Exception as e:
+                logger.error(f"Error actualizando catálogo de fichas: {e}")
+                self.invalidar()
+                return ArbolFichas()
+            return self._arbol
+
+    def invalidar(self) -> None:
+        """Descarta el árbol; la próxima lectura lo reconstruye."""
+        with self._lock:
+            self._arbol = None
+            self._data_version = None
+
+    def _cargada(self) -> bool:
+        return self._arbol is not None
+
+    def _descartar_datos(self) -> None:
+        self._arbol = None
+
+    def _actualizar(self) -> None:
+        """Reconstruye el árbol sólo si cambió el catálogo."""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM control_fichas WHERE id = 1")
+            version = cursor.fetchone()['version']
+
+            if self._arbol is None or version != self._arbol.version:
+                self._arbol = _construir_arbol(conn, version)
+                logger.info(
+                    f"Catálogo de fichas cargado: {len(self._arbol.fichas)} fichas, "
+                    f"{len(self._arbol.dimensiones)} dimensiones, {len(self._arbol.aspectos_por_id)} aspectos"
+                )
+
+
+# Instancia única compartida por todas las sesiones del proceso
+catalogo_fichas = CatalogoFichas()
@@ -0,0 +1,281 @@
+"""
+Catálogo de grupos en memoria para la vista del curador
+Índice hash por código normalizado construido desde la tabla grupos (no desde
+el Excel). Se comparte entre todas las sesiones del proceso y sólo se
+reconstruye cuando cambia control_grupos.version, que los triggers de grupos
+y fichas incrementan en cada alta, modificación o baja.
+
+Junto al índice hash se precalcula IndiceSugerencias para autocompletar
+códigos y nombres escritos de forma parcial o con una errata.
+"""
+import bisect
+import logging
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.database.cache_versionada import CacheVersionada
+from src.database.connection import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+
+def normalizar_codigo(codigo) -> str:
+    """Clave del índice: el código como texto, sin espacios y en mayúsculas."""
+    return str(codigo).strip().upper()
+
+
+def normalizar_texto(texto) -> str:
+    """Texto en mayúsculas, sin tildes y con los espacios colapsados."""
+    descompuesto = unicodedata.normalize('NFKD', str(texto or ''))
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_tildes.upper().split())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# AUTOCOMPLETADO
+# ═══════════════════════════════════════════════════════════════════
+
+# Tipos de coincidencia, de más a menos relevante
+COINCIDENCIAS = (
+    'codigo_exacto', 'codigo_prefijo', 'codigo_contiene', 'codigo_errata',
+    'nombre_prefijo', 'nombre_contiene',
+)
+
+# Longitud máxima de los fragmentos del índice de subcadenas
+N_GRAMA = 3
+
+
+def _ngramas(texto: str, n: int = N_GRAMA) -> Set[str]:
+    return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+
+def _fragmentos(texto: str) -> Set[str]:
+    """Todas las subcadenas de 1 a N_GRAMA caracteres."""
+    return set().union(*(_ngramas(texto, n) for n in range(1, N_GRAMA + 1)))
+
+
+def _borrados(texto: str) -> Set[str]:
+    """El texto sin uno de sus caracteres, en cada posición."""
+    return {texto[:i] + texto[i + 1:] for i in range(len(texto))}
+
+
+def _distancia_maxima_uno(a: str, b: str) -> bool:
+    """True si a y b difieren en a lo sumo una inserción, borrado, sustitución o trasposición."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return (a[i + 1:] == b[i + 1:]
+                or (i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]))
+    corto, largo = (a, b) if len(a) < len(b) else (b, a)
+    return corto[i:] == largo[i + 1:]
+
+
+class IndiceSugerencias:
+    """
+    Estructuras precalculadas sobre códigos y nombres de propuesta.
+
+    - Prefijos: lista ordenada de códigos y de palabras de los nombres,
+      recorrida con bisect.
+    - Subcadenas: postings de fragmentos de 1 a 3 caracteres (fragmento ->
+      códigos). Un texto corto se resuelve con su propia lista; uno largo
+      intersecta las de sus trigramas y se confirma con 'in'.
+    - Erratas: índice de borrados simétricos (código sin un carácter ->
+      códigos); dos textos a distancia 1 comparten algún borrado.
+    """
+
+    def __init__(self, nombres: Dict[str, str]):
+        """
+        Args:
+            nombres: Código normalizado -> nombre de la propuesta
+        """
+        self._nombres = {codigo: normalizar_texto(nombre) for codigo, nombre in nombres.items()}
+        self._codigos = sorted(self._nombres)
+        self._textos_codigo = {codigo: codigo for codigo in self._codigos}
+        # Palabras de los nombres ordenadas, con el código de cada una en paralelo
+        pares = sorted(
+            (palabra, codigo) for codigo, nombre in self._nombres.items() for palabra in set(nombre.split())
+        )
+        self._palabras = [palabra for palabra, _ in pares]
+        self._codigo_de_palabra = [codigo for _, codigo in pares]
+        self._ngramas_codigo: Dict[str, Set[str]] = defaultdict(set)
+        self._ngramas_nombre: Dict[str, Set[str]] = defaultdict(set)
+        self._borrados: Dict[str, Set[str]] = defaultdict(set)
+        for codigo, nombre in self._nombres.items():
+            for fragmento in _fragmentos(codigo):
+                self._ngramas_codigo[fragmento].add(codigo)
+            for fragmento in _fragmentos(nombre):
+                self._ngramas_nombre[fragmento].add(codigo)
+            for variante in _borrados(codigo) | {codigo}:
+                self._borrados[variante].add(codigo)
+
+    @staticmethod
+    def _con_prefijo(ordenados: List[str], prefijo: str) -> range:
+        """Posiciones de una lista ordenada cuyos elementos empiezan por el prefijo."""
+        inicio = bisect.bisect_left(ordenados, prefijo)
+        # Cualquier texto con el prefijo es menor que prefijo + el mayor carácter
+        fin = bisect.bisect_left(ordenados, prefijo + '\U0010ffff', lo=inicio)
+        return range(inicio, fin)
+
+    @staticmethod
+    def _contienen(texto: str, textos: Dict[str, str], postings: Dict[str, Set[str]]) -> Iterable[str]:
+        """Códigos cuyo texto asociado contiene el texto buscado, ordenados."""
+        if len(texto) <= N_GRAMA:
+            return sorted(postings.get(texto, ()))
+        listas = sorted((postings.get(ngrama, set()) for ngrama in _ngramas(texto)), key=len)
+        return sorted(codigo for codigo in set.intersection(*listas) if texto in textos[codigo])
+
+    def sugerir(self, texto: str, limite: int = 10) -> List[Tuple[str, str]]:
+        """
+        Códigos que coinciden con el texto, ordenados por relevancia.
+
+        Args:
+            texto: Código o nombre escrito por el usuario (completo o parcial)
+            limite: Máximo de sugerencias
+
+        Returns:
+            Lista de (código, tipo de coincidencia) según COINCIDENCIAS; a
+            igual tipo, en orden de código
+        """
+        codigo = normalizar_codigo(texto)
+        consulta = normalizar_texto(texto)
+        if not codigo:
+            return []
+
+        # Cada tipo de coincidencia, de más a menos relevante. Todas las
+        # fuentes salen en orden de código y se evalúan sólo si hacen falta
+        # para completar el límite
+        busquedas = [
+            ('codigo_exacto', lambda: [codigo] if codigo in self._textos_codigo else []),
+            ('codigo_prefijo', lambda: (self._codigos[i] for i in self._con_prefijo(self._codigos, codigo))),
+            ('codigo_contiene', lambda: self._contienen(codigo, self._textos_codigo, self._ngramas_codigo)),
+            ('codigo_errata', lambda: sorted({
+                c for variante in _borrados(codigo) | {codigo}
+                for c in self._borrados.get(variante, ()) if _distancia_maxima_uno(codigo, c)
+            })),
+        ]
+        if consulta:
+            busquedas += [
+                ('nombre_prefijo', lambda: sorted({
+                    self._codigo_de_palabra[i] for i in self._con_prefijo(self._palabras, consulta)
+                })),
+                ('nombre_contiene', lambda: self._contienen(consulta, self._nombres, self._ngramas_nombre)),
+            ]
+
+        sugerencias: Dict[str, str] = {}
+        for tipo, buscar in busquedas:
+            for c in buscar():
+                if len(sugerencias) >= limite:
+                    return list(sugerencias.items())
+                sugerencias.setdefault(c, tipo)
+        return list(sugerencias.items())
+
+
+class CatalogoGrupos(CacheVersionada):
+    """
+    Índice en memoria código normalizado -> grupo.
+
+    Cada grupo es un dict con las columnas de grupos más ficha_codigo y
+    ficha_nombre, igual que GrupoModel.obtener_por_codigo. Las consultas no
+    tocan la base de datos salvo la sonda PRAGMA data_version y, si hubo
+    escrituras, la lectura del contador de versión.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._grupos: Optional[Dict[str, Dict]] = None
+        self._sugerencias: Optional[IndiceSugerencias] = None
+        self._version: Optional[int] = None
+
+    def obtener(self, codigo) -> Optional[Dict]:
+        """
+        Busca un grupo por código exacto (sin distinguir mayúsculas ni espacios).
+
+        Args:
+            codigo: Código del grupo
+
+        Returns:
+            Dict con los datos del grupo y su ficha, o None si no existe
+            (compartido entre sesiones: no modificarlo)
+        """
+        return self._indice().get(normalizar_codigo(codigo))
+
+    def todos(self) -> List[Dict]:
+        """Todos los grupos, ordenados por código."""
+        return list(self._indice().values())
+
+    def sugerir(self, texto: str, limite: int = 10) -> List[Tuple[Dict, str]]:
+        """
+        Grupos cuyo código o nombre coincide con un texto parcial o con errata.
+
+        Args:
+            texto: Lo escrito por el curador
+            limite: Máximo de sugerencias
+
+        Returns:
+            Lista de (grupo, tipo de coincidencia) ordenada por relevancia
+            (ver COINCIDENCIAS)
+        """
+        with self._lock:
+            grupos = self._indice()
+            sugerencias = self._sugerencias
+        if not grupos:
+            return []
+        return [(grupos[codigo], tipo) for codigo, tipo in sugerencias.sugerir(texto, limite)]
+
+    def __len__(self) -> int:
+        return len(self._indice())
+
+    def invalidar(self) -> None:
+        """Descarta el índice; la próxima consulta lo reconstruye."""
+        with self._lock:
+            self._grupos = None
+            self._data_version = None
+
+    def _indice(self) -> Dict[str, Dict]:
+        with self._lock:
+            try:
+                self._refrescar()
+            except Exception as e:
+                logger.error(f"Error actualizando catálogo de grupos: {e}")
+                self.invalidar()
+                return {}
+            return self._grupos
+
+    def _cargada(self) -> bool:
+        return self._grupos is not None
+
+    def _descartar_datos(self) -> None:
+        self._grupos = None
+
+    def _actualizar(self) -> None:
+        """Reconstruye el índice sólo si cambió el catálogo de grupos."""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM control_grupos WHERE id = 1")
+            version = cursor.fetchone()['version']
+
+            if self._grupos is None or version != self._version:
+                cursor.execute("""
+                    SELECT
+                        g.*,
+                        f.codigo as ficha_codigo,
+                        f.nombre as ficha_nombre
+                    FROM grupos g
+                    LEFT JOIN fichas f ON g.ficha_id = f.id
+                    ORDER BY g.codigo
+                """)
+                self._grupos = {normalizar_codigo(row['codigo']): dict(row) for row in cursor.fetchall()}
+                self._sugerencias = IndiceSugerencias(
+                    {codigo: grupo['nombre_propuesta'] for codigo, grupo in self._grupos.items()}
+                )
+                self._version = version
+                logger.info(f"Catálogo de grupos cargado: {len(self._grupos)} grupos")
+
+
+# Instancia única compartida por todas las sesiones del proceso
+catalogo_grupos = CatalogoGrupos()
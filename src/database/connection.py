@@ -1,21 +1,258 @@
 """
 Gestión de conexiones a la base de datos
 """
+import atexit
 import sqlite3
 import logging
+import threading
+import time
 from contextlib import contextmanager
-from typing import Generator
-from src.config import config
+from pathlib import Path
+from typing import Dict, Generator, List, Optional
+from src.config import config, PerfilAlmacenamiento
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
 
+class PoolConexiones:
+    """
+    Pool de conexiones SQLite reutilizables.
+    
+    Cada conexión se entrega en exclusiva al hilo que la solicita (los hilos de
+    script de Streamlit) y vuelve al pool al salir del context manager. Al
+    liberarla se recuerda el hilo que la usó para devolvérsela preferentemente
+    en su siguiente solicitud. El número de conexiones abiertas en reposo está
+    acotado por ``max_conexiones``; si todas están ocupadas (por ejemplo, en
+    solicitudes anidadas) se abre una conexión temporal que se cierra al
+    liberarla, de modo que el pool nunca bloquea.
+    
+    El perfil de almacenamiento (PRAGMA de journal, caché, mmap, etc.) se aplica
+    una única vez al abrir cada conexión.
+    """
+    
+    # Segundos de inactividad tras los cuales se verifica la conexión antes de entregarla
+    VERIFICAR_TRAS_SEGUNDOS = 30.0
+    
+    def __init__(self, db_path: str, max_conexiones: int, perfil: PerfilAlmacenamiento):
+        self.db_path = db_path
+        self.perfil = perfil
+        self.max_conexiones = max(1, max_conexiones)
+        self._lock = threading.Lock()
+        self._libres: List[dict] = []
+        self._en_uso: Dict[int, bool] = {}  # id(conn) -> es temporal
+        self._total = 0
+    
+    def _crear_conexion(self) -> sqlite3.Connection:
+        """Abre una conexión nueva y aplica la configuración inicial una sola vez."""
+        if self.perfil.solo_lectura:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Permite acceder a columnas por nombre
+        aplicar_perfil(conn, self.perfil)
+        logger.debug(f"Conexión establecida: {self.db_path} (perfil {self.perfil.nombre})")
+        return conn
+    
+    @staticmethod
+    def _conexion_sana(conn: sqlite3.Connection) -> bool:
+        """Verifica que una conexión en reposo siga utilizable."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _cerrar(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+            logger.debug("Conexión cerrada")
+        except sqlite3.Error as e:
+            logger.warning(f"Error cerrando conexión: {e}")
+    
+    def adquirir(self) -> sqlite3.Connection:
+        """
+        Obtiene una conexión del pool para uso exclusivo del hilo actual.
+        
+        Returns:
+            Conexión SQLite lista para usar
+        """
+        hilo = threading.get_ident()
+        entrada = None
+        
+        with self._lock:
+            if self._libres:
+                # Preferir la última conexión usada por este mismo hilo
+                indice = len(self._libres) - 1
+                for i in range(len(self._libres) - 1, -1, -1):
+                    if self._libres[i]['hilo'] == hilo:
+                        indice = i
+                        break
+                entrada = self._libres.pop(indice)
+            elif self._total < self.max_conexiones:
+                self._total += 1
+                entrada = {'conn': None, 'hilo': hilo, 'liberada': 0.0, 'temporal': False}
+            else:
+                entrada = {'conn': None, 'hilo': hilo, 'liberada': 0.0, 'temporal': True}
+        
+        conn = entrada['conn']
+        
+        if conn is not None and time.monotonic() - entrada['liberada'] > self.VERIFICAR_TRAS_SEGUNDOS:
+            if not self._conexion_sana(conn):
+                logger.warning("Conexión inválida descartada del pool")
+                self._cerrar(conn)
+                conn = None
+        
+        if conn is None:
+            try:
+                conn = self._crear_conexion()
+            except sqlite3.Error:
+                if not entrada['temporal']:
+                    with self._lock:
+                        self._total -= 1
+                raise
+            if entrada['temporal']:
+                logger.warning(f"Pool agotado ({self.max_conexiones} conexiones), usando conexión temporal")
+        
+        with self._lock:
+            self._en_uso[id(conn)] = entrada['temporal']
+        return conn
+    
+    def liberar(self, conn: sqlite3.Connection) -> None:
+        """
+        Devuelve una conexión al pool (o la cierra si era temporal).
+        
+        Args:
+            conn: Conexión obtenida con adquirir()
+        """
+        with self._lock:
+            temporal = self._en_uso.pop(id(conn), True)
+        
+        if temporal:
+            self._cerrar(conn)
+            return
+        
+        # Nunca devolver al pool una conexión con una transacción abierta
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error as e:
+            logger.warning(f"Conexión descartada al liberarla: {e}")
+            self._cerrar(conn)
+            with self._lock:
+                self._total -= 1
+            return
+        
+        with self._lock:
+            self._libres.append({
+                'conn': conn,
+                'hilo': threading.get_ident(),
+                'liberada': time.monotonic(),
+                'temporal': False
+            })
+    
+    def cerrar_todas(self) -> None:
+        """Cierra todas las conexiones en reposo del pool."""
+        with self._lock:
+            libres, self._libres = self._libres, []
+            self._total -= len(libres)
+        
+        for entrada in libres:
+            self._cerrar(entrada['conn'])
+
+
+def aplicar_perfil(conn: sqlite3.Connection, perfil: PerfilAlmacenamiento) -> None:
+    """
+    Aplica los PRAGMA del perfil de almacenamiento a una conexión.
+    
+    Args:
+        conn: Conexión recién abierta
+        perfil: Perfil a aplicar
+    """
+    # busy_timeout primero: el cambio de journal_mode puede tener que esperar locks
+    conn.execute(f"PRAGMA busy_timeout = {int(perfil.busy_timeout)}")
+    
+    if perfil.journal_mode and not perfil.solo_lectura:
+        try:
+            modo = conn.execute(f"PRAGMA journal_mode = {perfil.journal_mode}").fetchone()[0]
+            if str(modo).upper() != perfil.journal_mode.upper():
+                logger.warning(f"journal_mode solicitado {perfil.journal_mode}, activo {modo}")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"No se pudo cambiar journal_mode a {perfil.journal_mode}: {e}")
+    
+    conn.execute(f"PRAGMA synchronous = {perfil.synchronous}")
+    conn.execute(f"PRAGMA mmap_size = {int(perfil.mmap_size)}")
+    conn.execute(f"PRAGMA cache_size = {int(perfil.cache_size)}")
+    conn.execute(f"PRAGMA temp_store = {perfil.temp_store}")
+    
+    if perfil.solo_lectura:
+        conn.execute("PRAGMA query_only = ON")
+
+
+def describir_perfil_almacenamiento() -> Dict[str, object]:
+    """
+    Reporta el perfil configurado y los valores efectivos de los PRAGMA
+    en una conexión del pool.
+    
+    Returns:
+        Diccionario con el nombre del perfil y cada PRAGMA aplicado
+    """
+    pragmas = ['journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'busy_timeout', 'query_only']
+    
+    with get_db_connection() as conn:
+        estado = {'perfil': obtener_pool().perfil.nombre}
+        for pragma in pragmas:
+            estado[pragma] = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+        return estado
+
+
+_pool: Optional[PoolConexiones] = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool() -> PoolConexiones:
+    """
+    Retorna el pool de conexiones del proceso, creándolo si no existe.
+    Si cambia la ruta o el perfil configurado de la base de datos, se recrea el pool.
+    
+    Returns:
+        Pool de conexiones compartido
+    """
+    global _pool
+    
+    pool = _pool
+    if pool is not None and pool.db_path == config.db_path and pool.perfil == config.db_perfil:
+        return pool
+    
+    with _pool_lock:
+        if _pool is None or _pool.db_path != config.db_path or _pool.perfil != config.db_perfil:
+            if _pool is not None:
+                _pool.cerrar_todas()
+            _pool = PoolConexiones(config.db_path, config.db_pool_size, config.db_perfil)
+            logger.info(
+                f"Pool de conexiones creado: {config.db_path} "
+                f"(máx. {config.db_pool_size}, perfil {config.db_perfil.nombre})"
+            )
+        return _pool
+
+
+def cerrar_conexiones() -> None:
+    """Cierra las conexiones en reposo del pool (por ejemplo, al terminar el proceso)."""
+    if _pool is not None:
+        _pool.cerrar_todas()
+
+
+atexit.register(cerrar_conexiones)
+
+
 @contextmanager
 def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
     """
     Context manager para gestionar conexiones a la base de datos.
-    Garantiza que la conexión se cierre correctamente incluso si hay errores.
+    Toma una conexión del pool y la devuelve al terminar, con commit si no hubo
+    errores o rollback en caso contrario.
     
     Yields:
         Conexión a la base de datos SQLite
@@ -25,11 +262,10 @@ def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
         ...     cursor = conn.cursor()
         ...     cursor.execute("SELECT * FROM usuarios")
     """
+    pool = obtener_pool()
     conn = None
     try:
-        conn = sqlite3.connect(config.db_path)
-        conn.row_factory = sqlite3.Row  # Permite acceder a columnas por nombre
-        logger.debug(f"Conexión establecida: {config.db_path}")
+        conn = pool.adquirir()
         yield conn
         conn.commit()
         logger.debug("Transacción confirmada")
@@ -45,8 +281,7 @@ def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
         raise
     finally:
         if conn:
-            conn.close()
-            logger.debug("Conexión cerrada")
+            pool.liberar(conn)
 
 
 def ejecutar_query(query: str, params: tuple = None) -> list:
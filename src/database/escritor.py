@@ -0,0 +1,171 @@
+"""
+Escritor único de la base de datos
+Un hilo dedicado recibe las escrituras de todas las sesiones por una cola
+acotada y las confirma en grupo: espera unos milisegundos a que se acumulen
+operaciones y ejecuta todas las pendientes en una sola transacción. SQLite
+admite un único escritor a la vez, así que en lugar de que cada sesión compita
+por el lock (y espere o falle con "database is locked"), las escrituras se
+serializan aquí y el coste del commit se reparte entre todas las del lote.
+
+Cada operación es una función que recibe un cursor; quien la envía obtiene un
+Future con su resultado o con la excepción que lanzó.
+"""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+from src.config import config
+from src.database.connection import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Segundos que espera quien envía si la cola está llena
+ESPERA_COLA_LLENA = 5.0
+
+# Marca de fin para el hilo escritor
+_FIN = object()
+
+
+class EscritorSerializado:
+    """
+    Hilo escritor del proceso, arrancado con la primera operación.
+
+    Cada operación se ejecuta dentro de un SAVEPOINT propio: si falla, se
+    deshacen sólo sus cambios y su Future recibe la excepción, sin afectar al
+    resto del lote. Los Future se resuelven después del COMMIT, de modo que un
+    resultado entregado siempre está confirmado en disco.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cola: Optional[queue.Queue] = None
+        self._hilo: Optional[threading.Thread] = None
+
+    def enviar(self, operacion: Callable[[sqlite3.Cursor], T]) -> 'Future[T]':
+        """
+        Encola una escritura.
+
+        Args:
+            operacion: Función que recibe un cursor (transacción abierta, sin
+                hacer commit) y devuelve el resultado de la operación
+
+        Returns:
+            Future con lo que devuelva la operación una vez confirmada
+
+        Raises:
+            RuntimeError: Si se llama desde el propio hilo escritor
+            queue.Full: Si la cola sigue llena tras ESPERA_COLA_LLENA segundos
+        """
+        if threading.current_thread() is self._hilo:
+            raise RuntimeError("Una operación del escritor no puede encolar otra: use su cursor")
+        futuro: Future = Future()
+        self._iniciar().put((operacion, futuro), timeout=ESPERA_COLA_LLENA)
+        return futuro
+
+    def ejecutar(self, operacion: Callable[[sqlite3.Cursor], T]) -> T:
+        """Encola una escritura y espera su resultado (relanza su excepción)."""
+        return self.enviar(operacion).result()
+
+    def detener(self) -> None:
+        """Confirma lo pendiente y detiene el hilo (se vuelve a arrancar si llegan más escrituras)."""
+        with self._lock:
+            cola, hilo = self._cola, self._hilo
+            self._cola = self._hilo = None
+        if hilo is not None:
+            cola.put(_FIN)
+            hilo.join()
+
+    def _iniciar(self) -> queue.Queue:
+        with self._lock:
+            if self._hilo is None:
+                self._cola = queue.Queue(maxsize=max(1, config.db_escritor_max_cola))
+                self._hilo = threading.Thread(
+                    target=self._bucle, args=(self._cola,), name="escritor-db", daemon=True
+                )
+                self._hilo.start()
+            return self._cola
+
+    def _bucle(self, cola: queue.Queue) -> None:
+        fin = False
+        while not fin:
+            lote, fin = self._recoger_lote(cola)
+            if lote:
+                self._confirmar_lote(lote)
+
+    @staticmethod
+    def _recoger_lote(cola: queue.Queue) -> Tuple[List[Tuple[Callable, Future]], bool]:
+        """
+        Espera la primera operación y agrega las que lleguen durante la ventana
+        de agrupación, hasta db_escritor_max_lote.
+
+        Returns:
+            (operaciones del lote, True si se recibió la marca de fin)
+        """
+        primera = cola.get()
+        if primera is _FIN:
+            return [], True
+        lote = [primera]
+        limite = time.monotonic() + config.db_escritor_ventana_ms / 1000
+        while len(lote) < config.db_escritor_max_lote:
+            restante = limite - time.monotonic()
+            try:
+                siguiente = cola.get(timeout=restante) if restante > 0 else cola.get_nowait()
+            except queue.Empty:
+                break
+            if siguiente is _FIN:
+                return lote, True
+            lote.append(siguiente)
+        return lote, False
+
+    @staticmethod
+    def _confirmar_lote(lote: List[Tuple[Callable, Future]]) -> None:
+        """
+        Ejecuta el lote en una transacción y resuelve los Future tras el COMMIT,
+        también los de las operaciones que fallaron: quien recibe un error puede
+        consultar la base y ver ya confirmadas las demás operaciones del lote.
+        """
+        pendientes = [(operacion, futuro) for operacion, futuro in lote if futuro.set_running_or_notify_cancel()]
+        resultados = []
+        errores = []
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                # Tomar el lock de escritura una sola vez para todo el lote
+                cursor.execute("BEGIN IMMEDIATE")
+                for operacion, futuro in pendientes:
+                    cursor.execute("SAVEPOINT operacion")
+                    try:
+                        resultado = operacion(cursor)
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO operacion")
+                        cursor.execute("RELEASE operacion")
+                        errores.append((futuro, e))
+                        continue
+                    cursor.execute("RELEASE operacion")
+                    resultados.append((futuro, resultado))
+        except Exception as e:
+            logger.error(f"Error confirmando lote de {len(pendientes)} escrituras: {e}")
+            for futuro, error in errores:
+                futuro.set_exception(error)
+            for _, futuro in pendientes:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+
+        for futuro, resultado in resultados:
+            futuro.set_result(resultado)
+        for futuro, error in errores:
+            futuro.set_exception(error)
+        logger.debug(f"Lote confirmado: {len(pendientes)} escrituras ({len(errores)} con error)")
+
+
+# Instancia única compartida por todas las sesiones del proceso
+escritor = EscritorSerializado()
+
+atexit.register(escritor.detener)
@@ -11,6 +11,833 @@ from src.config import config
 logger = logging.getLogger(__name__)
 
 
+TABLAS_EVALUACION_SQL = """
+-- =====================================================
+-- TABLA: evaluacion_cabecera
+-- Una fila por evaluación de un curador a un grupo con
+-- una ficha; guarda la observación global una sola vez
+-- =====================================================
+CREATE TABLE IF NOT EXISTS evaluacion_cabecera (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario_id INTEGER NOT NULL,
+    codigo_grupo TEXT NOT NULL,
+    ficha_id INTEGER NOT NULL,
+    observacion TEXT NOT NULL,
+    fecha_registro TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id) ON DELETE CASCADE,
+    FOREIGN KEY (codigo_grupo) REFERENCES grupos(codigo) ON DELETE CASCADE,
+    FOREIGN KEY (ficha_id) REFERENCES fichas(id) ON DELETE CASCADE,
+
+    UNIQUE (usuario_id, codigo_grupo, ficha_id),
+    CHECK (length(observacion) >= 5)
+);
+
+CREATE INDEX IF NOT EXISTS idx_eval_cabecera_grupo ON evaluacion_cabecera(codigo_grupo);
+CREATE INDEX IF NOT EXISTS idx_eval_cabecera_ficha ON evaluacion_cabecera(ficha_id);
+CREATE INDEX IF NOT EXISTS idx_eval_cabecera_fecha ON evaluacion_cabecera(fecha_registro);
+
+
+-- =====================================================
+-- TABLA: evaluacion_detalle
+-- Calificación (0, 1, 2) de cada aspecto. La observación
+-- sólo se guarda si difiere de la de la cabecera (datos
+-- migrados del esquema anterior)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS evaluacion_detalle (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cabecera_id INTEGER NOT NULL,
+    aspecto_id INTEGER NOT NULL,
+    resultado INTEGER CHECK (resultado IN (0,1,2)) NOT NULL,
+    observacion TEXT,
+
+    FOREIGN KEY (cabecera_id) REFERENCES evaluacion_cabecera(id) ON DELETE CASCADE,
+    FOREIGN KEY (aspecto_id) REFERENCES aspectos(id) ON DELETE CASCADE,
+
+    UNIQUE (cabecera_id, aspecto_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_eval_detalle_aspecto ON evaluacion_detalle(aspecto_id);
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+# TABLAS RESUMEN (mantenidas por triggers)
+# ═══════════════════════════════════════════════════════════════════
+
+# Tabla resumen -> columnas clave. Cada tabla guarda suma, conteo y conteos
+# de resultados 0/1/2 por clave. Grupo y curador se desglosan además por
+# ficha para poder contar grupos y curadores distintos de cada ficha.
+TABLAS_RESUMEN = {
+    'resumen_grupo': ('codigo_grupo', 'ficha_id'),
+    'resumen_grupo_dimension': ('codigo_grupo', 'dimension_id'),
+    'resumen_aspecto': ('aspecto_id',),
+    'resumen_ficha': ('ficha_id',),
+    'resumen_curador': ('usuario_id', 'ficha_id'),
+}
+
+_TIPOS_CLAVE_RESUMEN = {
+    'codigo_grupo': 'TEXT',
+    'ficha_id': 'INTEGER',
+    'dimension_id': 'INTEGER',
+    'aspecto_id': 'INTEGER',
+    'usuario_id': 'INTEGER',
+}
+
+# Claves de un aspecto evaluado a partir de su cabecera y su aspecto.
+# {detalle} es NEW u OLD dentro de los triggers de evaluacion_detalle.
+_FUENTE_DETALLE = """
+    SELECT c.usuario_id, c.codigo_grupo, c.ficha_id, a.dimension_id,
+           {detalle}.aspecto_id AS aspecto_id
+    FROM evaluacion_cabecera c
+    LEFT JOIN aspectos a ON a.id = {detalle}.aspecto_id
+    WHERE c.id = {detalle}.cabecera_id
+"""
+
+# Aspectos de una cabecera recién eliminada (trigger de evaluacion_cabecera)
+_FUENTE_CABECERA = """
+    SELECT OLD.usuario_id AS usuario_id, OLD.codigo_grupo AS codigo_grupo,
+           OLD.ficha_id AS ficha_id, a.dimension_id, d.aspecto_id, d.resultado
+    FROM evaluacion_detalle d
+    LEFT JOIN aspectos a ON a.id = d.aspecto_id
+    WHERE d.cabecera_id = OLD.id
+"""
+
+
+def _sql_tabla_resumen(tabla: str, claves: tuple) -> str:
+    columnas = ",\n    ".join(f"{c} {_TIPOS_CLAVE_RESUMEN[c]} NOT NULL" for c in claves)
+    return f"""
+CREATE TABLE IF NOT EXISTS {tabla} (
+    {columnas},
+    suma INTEGER NOT NULL DEFAULT 0,
+    conteo INTEGER NOT NULL DEFAULT 0,
+    n0 INTEGER NOT NULL DEFAULT 0,
+    n1 INTEGER NOT NULL DEFAULT 0,
+    n2 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY ({', '.join(claves)})
+);
+"""
+
+
+def _sql_incrementar(tabla: str, claves: tuple) -> str:
+    lista = ', '.join(claves)
+    no_nulas = ' AND '.join(f"{c} IS NOT NULL" for c in claves)
+    return f"""
+    INSERT INTO {tabla} ({lista}, suma, conteo, n0, n1, n2)
+    SELECT {lista}, NEW.resultado, 1, NEW.resultado = 0, NEW.resultado = 1, NEW.resultado = 2
+    FROM ({_FUENTE_DETALLE.format(detalle='NEW')}) AS f
+    WHERE {no_nulas}
+    ON CONFLICT ({lista}) DO UPDATE SET
+        suma = suma + excluded.suma,
+        conteo = conteo + 1,
+        n0 = n0 + excluded.n0,
+        n1 = n1 + excluded.n1,
+        n2 = n2 + excluded.n2;
+"""
+
+
+def _sql_decrementar_detalle(tabla: str, claves: tuple) -> str:
+    # Si la cabecera ya no existe el descuento lo hizo su propio trigger
+    lista = ', '.join(claves)
+    return f"""
+    UPDATE {tabla} SET
+        suma = suma - OLD.resultado,
+        conteo = conteo - 1,
+        n0 = n0 - (OLD.resultado = 0),
+        n1 = n1 - (OLD.resultado = 1),
+        n2 = n2 - (OLD.resultado = 2)
+    WHERE ({lista}) = (SELECT {lista} FROM ({_FUENTE_DETALLE.format(detalle='OLD')}));
+"""
+
+
+def _sql_descontar(tabla: str, claves: tuple, fuente: str) -> str:
+    """Descuenta de la tabla resumen los aspectos de la fuente (con su resultado)."""
+    lista = ', '.join(claves)
+    correlacion = ' AND '.join(f"f.{c} = {tabla}.{c}" for c in claves)
+
+    def total(expresion: str) -> str:
+        return f"(SELECT COALESCE(SUM({expresion}), 0) FROM ({fuente}) f WHERE {correlacion})"
+
+    return f"""
+    UPDATE {tabla} SET
+        suma = suma - {total('f.resultado')},
+        conteo = conteo - {total('1')},
+        n0 = n0 - {total('f.resultado = 0')},
+        n1 = n1 - {total('f.resultado = 1')},
+        n2 = n2 - {total('f.resultado = 2')}
+    WHERE ({lista}) IN (SELECT {lista} FROM ({fuente}));
+"""
+
+
+def _sql_decrementar_cabecera(tabla: str, claves: tuple) -> str:
+    return _sql_descontar(tabla, claves, _FUENTE_CABECERA)
+
+
+def _sql_agregar(tabla: str, claves: tuple, fuente: str) -> str:
+    """Suma a la tabla resumen los aspectos de la fuente (con su resultado)."""
+    lista = ', '.join(claves)
+    no_nulas = ' AND '.join(f"{c} IS NOT NULL" for c in claves)
+    return f"""
+    INSERT INTO {tabla} ({lista}, suma, conteo, n0, n1, n2)
+    SELECT {lista}, SUM(resultado), COUNT(*), SUM(resultado = 0), SUM(resultado = 1), SUM(resultado = 2)
+    FROM ({fuente})
+    WHERE {no_nulas}
+    GROUP BY {lista}
+    ON CONFLICT ({lista}) DO UPDATE SET
+        suma = suma + excluded.suma,
+        conteo = conteo + excluded.conteo,
+        n0 = n0 + excluded.n0,
+        n1 = n1 + excluded.n1,
+        n2 = n2 + excluded.n2;
+"""
+
+
+# Aspectos evaluados de un aspecto del catálogo, atribuidos a la dimensión
+# {dimension} (OLD.dimension_id o NEW.dimension_id en los triggers de aspectos)
+_FUENTE_ASPECTO = """
+    SELECT c.usuario_id, c.codigo_grupo, c.ficha_id, {dimension} AS dimension_id,
+           d.aspecto_id, d.resultado
+    FROM evaluacion_detalle d
+    JOIN evaluacion_cabecera c ON c.id = d.cabecera_id
+    WHERE d.aspecto_id = OLD.id
+"""
+
+# Tablas resumen desglosadas por dimensión: las únicas que dependen de la
+# dimensión actual de cada aspecto
+_RESUMENES_POR_DIMENSION = {
+    tabla: claves for tabla, claves in TABLAS_RESUMEN.items() if 'dimension_id' in claves
+}
+
+
+RESUMENES_SQL = "".join(
+    _sql_tabla_resumen(tabla, claves) for tabla, claves in TABLAS_RESUMEN.items()
+) + """
+CREATE INDEX IF NOT EXISTS idx_resumen_grupo_ficha ON resumen_grupo(ficha_id);
+CREATE INDEX IF NOT EXISTS idx_resumen_curador_ficha ON resumen_curador(ficha_id);
+
+-- Los triggers de borrado se recrean siempre: sustituyen a versiones
+-- anteriores que no actualizaban los resúmenes
+DROP TRIGGER IF EXISTS trg_eval_detalle_resumen_insert;
+DROP TRIGGER IF EXISTS trg_eval_detalle_delete;
+DROP TRIGGER IF EXISTS trg_eval_cabecera_delete;
+
+CREATE TRIGGER trg_eval_detalle_resumen_insert
+AFTER INSERT ON evaluacion_detalle
+BEGIN""" + "".join(
+    _sql_incrementar(tabla, claves) for tabla, claves in TABLAS_RESUMEN.items()
+) + """END;
+
+-- Descontar de los resúmenes y, si era el último aspecto, eliminar la cabecera
+-- (en un único trigger para garantizar el orden: primero descontar)
+CREATE TRIGGER trg_eval_detalle_delete
+AFTER DELETE ON evaluacion_detalle
+BEGIN""" + "".join(
+    _sql_decrementar_detalle(tabla, claves) for tabla, claves in TABLAS_RESUMEN.items()
+) + """
+    DELETE FROM evaluacion_cabecera
+    WHERE id = OLD.cabecera_id
+      AND NOT EXISTS (SELECT 1 FROM evaluacion_detalle WHERE cabecera_id = OLD.cabecera_id);
+END;
+
+-- Mantener cabecera y detalle consistentes aunque foreign_keys esté desactivado.
+-- Al borrar la cabecera sus aspectos ya no pueden resolver grupo, ficha ni
+-- curador, así que los resúmenes se descuentan aquí antes de borrarlos.
+CREATE TRIGGER trg_eval_cabecera_delete
+AFTER DELETE ON evaluacion_cabecera
+BEGIN""" + "".join(
+    _sql_decrementar_cabecera(tabla, claves) for tabla, claves in TABLAS_RESUMEN.items()
+) + """
+    DELETE FROM evaluacion_detalle WHERE cabecera_id = OLD.id;
+END;
+
+-- Los aspectos evaluados cuentan en la dimensión actual de su aspecto: al
+-- moverlo de dimensión sus conteos pasan a la nueva y al borrarlo dejan de contar
+DROP TRIGGER IF EXISTS trg_resumen_aspectos_update;
+DROP TRIGGER IF EXISTS trg_resumen_aspectos_delete;
+
+CREATE TRIGGER trg_resumen_aspectos_update
+AFTER UPDATE OF dimension_id ON aspectos
+WHEN OLD.dimension_id IS NOT NEW.dimension_id
+BEGIN""" + "".join(
+    _sql_descontar(tabla, claves, _FUENTE_ASPECTO.format(dimension='OLD.dimension_id'))
+    + _sql_agregar(tabla, claves, _FUENTE_ASPECTO.format(dimension='NEW.dimension_id'))
+    for tabla, claves in _RESUMENES_POR_DIMENSION.items()
+) + """END;
+
+CREATE TRIGGER trg_resumen_aspectos_delete
+AFTER DELETE ON aspectos
+BEGIN""" + "".join(
+    _sql_descontar(tabla, claves, _FUENTE_ASPECTO.format(dimension='OLD.dimension_id'))
+    for tabla, claves in _RESUMENES_POR_DIMENSION.items()
+) + """END;
+"""
+
+
+# Todos los aspectos evaluados con sus claves (reconstrucción completa)
+_FUENTE_RECONSTRUCCION = """
+    SELECT c.usuario_id, c.codigo_grupo, c.ficha_id, a.dimension_id, d.aspecto_id, d.resultado
+    FROM evaluacion_detalle d
+    JOIN evaluacion_cabecera c ON c.id = d.cabecera_id
+    LEFT JOIN aspectos a ON a.id = d.aspecto_id
+"""
+
+
+def _sql_agregado(claves: tuple) -> str:
+    """Valores de cada clave de una tabla resumen calculados desde el detalle."""
+    lista = ', '.join(claves)
+    no_nulas = ' AND '.join(f"{c} IS NOT NULL" for c in claves)
+    return f"""
+SELECT {lista}, SUM(resultado), COUNT(*),
+       SUM(resultado = 0), SUM(resultado = 1), SUM(resultado = 2)
+FROM ({_FUENTE_RECONSTRUCCION})
+WHERE {no_nulas}
+GROUP BY {lista}"""
+
+
+def _sql_reconstruir_resumenes() -> str:
+    sentencias = []
+    for tabla, claves in TABLAS_RESUMEN.items():
+        lista = ', '.join(claves)
+        sentencias.append(f"""
+DELETE FROM {tabla};
+INSERT INTO {tabla} ({lista}, suma, conteo, n0, n1, n2){_sql_agregado(claves)};
+""")
+    return "BEGIN;\n" + "".join(sentencias) + "COMMIT;\n"
+
+
+RECONSTRUIR_RESUMENES_SQL = _sql_reconstruir_resumenes()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ESTADO DE CADA EVALUACIÓN (mantenido por triggers)
+# ═══════════════════════════════════════════════════════════════════
+
+# Sin fila = pendiente (el curador aún no ha guardado nada para esa ficha)
+ESTADOS_EVALUACION = ('en_progreso', 'completa')
+
+# Aspectos de la ficha {ficha} (alias a = aspectos)
+_ASPECTOS_DE_FICHA = """
+    ficha_dimensiones fd
+    JOIN dimensiones dm ON dm.id = fd.dimension_id
+    JOIN aspectos a ON a.dimension_id = dm.id
+    WHERE fd.ficha_id = {ficha}
+"""
+
+_CLAVE_ESTADO = "(usuario_id, codigo_grupo, ficha_id)"
+
+
+def _sql_recalcular_estado(condicion: str) -> str:
+    """Recalcula desde cero el estado de las cabeceras que cumplen la condición (alias c)."""
+    completa = "esperados > 0 AND calificados >= esperados"
+    return f"""
+    INSERT OR REPLACE INTO estado_evaluacion
+        (usuario_id, codigo_grupo, ficha_id, aspectos_esperados, aspectos_calificados, estado, completada_en)
+    SELECT usuario_id, codigo_grupo, ficha_id, esperados, calificados,
+           CASE WHEN {completa} THEN 'completa' ELSE 'en_progreso' END,
+           CASE WHEN {completa} THEN COALESCE(completada_en, fecha_registro) END
+    FROM (
+        SELECT c.usuario_id, c.codigo_grupo, c.ficha_id, c.fecha_registro,
+               (SELECT COUNT(*) FROM {_ASPECTOS_DE_FICHA.format(ficha='c.ficha_id')}) AS esperados,
+               (SELECT COUNT(*) FROM {_ASPECTOS_DE_FICHA.format(ficha='c.ficha_id')}
+                AND a.id IN (SELECT aspecto_id FROM evaluacion_detalle WHERE cabecera_id = c.id)) AS calificados,
+               (SELECT e.completada_en FROM estado_evaluacion e
+                WHERE (e.usuario_id, e.codigo_grupo, e.ficha_id)
+                    = (c.usuario_id, c.codigo_grupo, c.ficha_id)) AS completada_en
+        FROM evaluacion_cabecera c
+        WHERE {condicion}
+    );
+"""
+
+
+def _sql_sumar_calificado(detalle: str, delta: str) -> str:
+    """Suma delta (+1/-1) a la cabecera de {detalle} si el aspecto es de su ficha."""
+    calificados = f"aspectos_calificados {delta}"
+    completa = f"aspectos_esperados > 0 AND {calificados} >= aspectos_esperados"
+    return f"""
+    UPDATE estado_evaluacion SET
+        aspectos_calificados = {calificados},
+        estado = CASE WHEN {completa} THEN 'completa' ELSE 'en_progreso' END,
+        completada_en = CASE WHEN {completa} THEN COALESCE(completada_en, CURRENT_TIMESTAMP) END
+    WHERE {_CLAVE_ESTADO} = (
+        SELECT c.usuario_id, c.codigo_grupo, c.ficha_id
+        FROM evaluacion_cabecera c
+        WHERE c.id = {detalle}.cabecera_id
+          AND EXISTS (SELECT 1 FROM {_ASPECTOS_DE_FICHA.format(ficha='c.ficha_id')} AND a.id = {detalle}.aspecto_id)
+    );
+"""
+
+
+# Cambios de catálogo que alteran los aspectos esperados de una ficha:
+# disparador -> cabeceras a recalcular
+_RECALCULAR_ESTADO = {
+    'trg_estado_aspectos_insert': (
+        "AFTER INSERT ON aspectos",
+        "c.ficha_id IN (SELECT ficha_id FROM ficha_dimensiones WHERE dimension_id = NEW.dimension_id)"),
+    'trg_estado_aspectos_delete': (
+        "AFTER DELETE ON aspectos",
+        "c.ficha_id IN (SELECT ficha_id FROM ficha_dimensiones WHERE dimension_id = OLD.dimension_id)"),
+    'trg_estado_aspectos_update': (
+        "AFTER UPDATE OF dimension_id ON aspectos",
+        "c.ficha_id IN (SELECT ficha_id FROM ficha_dimensiones"
+        " WHERE dimension_id IN (OLD.dimension_id, NEW.dimension_id))"),
+    'trg_estado_dimensiones_delete': (
+        "AFTER DELETE ON dimensiones",
+        "c.ficha_id IN (SELECT ficha_id FROM ficha_dimensiones WHERE dimension_id = OLD.id)"),
+    'trg_estado_ficha_dimensiones_insert': (
+        "AFTER INSERT ON ficha_dimensiones", "c.ficha_id = NEW.ficha_id"),
+    'trg_estado_ficha_dimensiones_delete': (
+        "AFTER DELETE ON ficha_dimensiones", "c.ficha_id = OLD.ficha_id"),
+    'trg_estado_ficha_dimensiones_update': (
+        "AFTER UPDATE OF ficha_id, dimension_id ON ficha_dimensiones", "c.ficha_id IN (OLD.ficha_id, NEW.ficha_id)"),
+}
+
+ESTADO_SQL = f"""
+-- =====================================================
+-- TABLA: estado_evaluacion
+-- Avance de cada curador en cada grupo con cada ficha:
+-- aspectos de la ficha frente a aspectos calificados
+-- =====================================================
+CREATE TABLE IF NOT EXISTS estado_evaluacion (
+    usuario_id INTEGER NOT NULL,
+    codigo_grupo TEXT NOT NULL,
+    ficha_id INTEGER NOT NULL,
+    aspectos_esperados INTEGER NOT NULL DEFAULT 0,
+    aspectos_calificados INTEGER NOT NULL DEFAULT 0,
+    estado TEXT NOT NULL DEFAULT 'en_progreso'
+        CHECK (estado IN ({', '.join(repr(e) for e in ESTADOS_EVALUACION)})),
+    completada_en TEXT,
+
+    PRIMARY KEY {_CLAVE_ESTADO}
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_estado_evaluacion_grupo ON estado_evaluacion(codigo_grupo, ficha_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_cabecera_insert
+AFTER INSERT ON evaluacion_cabecera
+BEGIN
+    INSERT OR REPLACE INTO estado_evaluacion
+        (usuario_id, codigo_grupo, ficha_id, aspectos_esperados, aspectos_calificados, estado)
+    VALUES (NEW.usuario_id, NEW.codigo_grupo, NEW.ficha_id,
+            (SELECT COUNT(*) FROM {_ASPECTOS_DE_FICHA.format(ficha='NEW.ficha_id')}), 0, 'en_progreso');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_cabecera_delete
+AFTER DELETE ON evaluacion_cabecera
+BEGIN
+    DELETE FROM estado_evaluacion
+    WHERE {_CLAVE_ESTADO} = (OLD.usuario_id, OLD.codigo_grupo, OLD.ficha_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_detalle_insert
+AFTER INSERT ON evaluacion_detalle
+BEGIN{_sql_sumar_calificado('NEW', '+ 1')}END;
+
+CREATE TRIGGER IF NOT EXISTS trg_estado_detalle_delete
+AFTER DELETE ON evaluacion_detalle
+BEGIN{_sql_sumar_calificado('OLD', '- 1')}END;
+""" + "".join(f"""
+CREATE TRIGGER IF NOT EXISTS {nombre}
+{evento}
+BEGIN{_sql_recalcular_estado(condicion)}END;
+""" for nombre, (evento, condicion) in _RECALCULAR_ESTADO.items())
+
+RECONSTRUIR_ESTADO_SQL = f"""
+BEGIN;
+DELETE FROM estado_evaluacion;
+{_sql_recalcular_estado('1')}
+COMMIT;
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ASIGNACIONES Y PROGRAMACIÓN DE PRESENTACIONES
+# ═══════════════════════════════════════════════════════════════════
+
+ASIGNACIONES_SQL = """
+-- =====================================================
+-- TABLA: asignaciones
+-- Grupos que debe evaluar cada curador (ver
+-- AsignacionModel.planificar); orden = posición del
+-- grupo en el orden de presentación
+-- =====================================================
+CREATE TABLE IF NOT EXISTS asignaciones (
+    usuario_id INTEGER NOT NULL,
+    codigo_grupo TEXT NOT NULL,
+    orden INTEGER NOT NULL,
+    fecha_asignacion TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id) ON DELETE CASCADE,
+    FOREIGN KEY (codigo_grupo) REFERENCES grupos(codigo) ON DELETE CASCADE,
+    PRIMARY KEY (usuario_id, codigo_grupo)
+) WITHOUT ROWID;
+
+-- Lista de trabajo de cada curador en orden de presentación
+CREATE INDEX IF NOT EXISTS idx_asignaciones_usuario_orden ON asignaciones(usuario_id, orden);
+CREATE INDEX IF NOT EXISTS idx_asignaciones_grupo ON asignaciones(codigo_grupo);
+
+-- foreign_keys está desactivado: limpiar a mano
+CREATE TRIGGER IF NOT EXISTS trg_asignaciones_grupo_delete
+AFTER DELETE ON grupos
+BEGIN
+    DELETE FROM asignaciones WHERE codigo_grupo = OLD.codigo;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asignaciones_usuario_delete
+AFTER DELETE ON usuarios
+BEGIN
+    DELETE FROM asignaciones WHERE usuario_id = OLD.id;
+END;
+
+
+-- =====================================================
+-- TABLA: programacion_presentaciones
+-- Orden de presentación de los grupos: una cola por día
+-- del evento (posición 1, 2, ...); cada grupo se
+-- presenta una sola vez
+-- =====================================================
+CREATE TABLE IF NOT EXISTS programacion_presentaciones (
+    fecha TEXT NOT NULL,
+    posicion INTEGER NOT NULL,
+    codigo_grupo TEXT NOT NULL UNIQUE,
+
+    FOREIGN KEY (codigo_grupo) REFERENCES grupos(codigo) ON DELETE CASCADE,
+    PRIMARY KEY (fecha, posicion),
+    CHECK (posicion > 0)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_programacion_grupo_delete
+AFTER DELETE ON grupos
+BEGIN
+    DELETE FROM programacion_presentaciones WHERE codigo_grupo = OLD.codigo;
+END;
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+# BORRADORES DE EVALUACIÓN
+# ═══════════════════════════════════════════════════════════════════
+
+BORRADORES_SQL = """
+-- =====================================================
+-- TABLA: evaluacion_borrador
+-- Formulario a medio llenar de cada curador, guardado
+-- periódicamente (ver BorradorModel.guardar);
+-- resultados = JSON {aspecto_id: resultado}
+-- =====================================================
+CREATE TABLE IF NOT EXISTS evaluacion_borrador (
+    usuario_id INTEGER NOT NULL,
+    codigo_grupo TEXT NOT NULL,
+    ficha_id INTEGER NOT NULL,
+    resultados TEXT NOT NULL DEFAULT '{}',
+    observacion TEXT NOT NULL DEFAULT '',
+    actualizado_en TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id) ON DELETE CASCADE,
+    FOREIGN KEY (codigo_grupo) REFERENCES grupos(codigo) ON DELETE CASCADE,
+    FOREIGN KEY (ficha_id) REFERENCES fichas(id) ON DELETE CASCADE,
+    PRIMARY KEY (usuario_id, codigo_grupo, ficha_id)
+) WITHOUT ROWID;
+
+-- Registrar la evaluación promueve el borrador: se descarta en la misma
+-- transacción que inserta la cabecera
+CREATE TRIGGER IF NOT EXISTS trg_borrador_cabecera_insert
+AFTER INSERT ON evaluacion_cabecera
+BEGIN
+    DELETE FROM evaluacion_borrador
+    WHERE usuario_id = NEW.usuario_id AND codigo_grupo = NEW.codigo_grupo AND ficha_id = NEW.ficha_id;
+END;
+
+-- foreign_keys está desactivado: limpiar a mano
+CREATE TRIGGER IF NOT EXISTS trg_borrador_grupo_delete
+AFTER DELETE ON grupos
+BEGIN
+    DELETE FROM evaluacion_borrador WHERE codigo_grupo = OLD.codigo;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_borrador_usuario_delete
+AFTER DELETE ON usuarios
+BEGIN
+    DELETE FROM evaluacion_borrador WHERE usuario_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_borrador_ficha_delete
+AFTER DELETE ON fichas
+BEGIN
+    DELETE FROM evaluacion_borrador WHERE ficha_id = OLD.id;
+END;
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ENVÍOS DE EVALUACIÓN (IDEMPOTENCIA)
+# ═══════════════════════════════════════════════════════════════════
+
+ENVIOS_SQL = """
+-- =====================================================
+-- TABLA: envios_evaluacion
+-- Clave de idempotencia de cada envío registrado del
+-- formulario (generada al mostrarlo) con su resultado;
+-- un reenvío con la misma clave devuelve este resultado
+-- sin volver a escribir (ver crear_evaluaciones_lote)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS envios_evaluacion (
+    clave TEXT PRIMARY KEY,
+    cabecera_id INTEGER NOT NULL,
+    guardadas INTEGER NOT NULL,
+    fecha_envio TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (cabecera_id) REFERENCES evaluacion_cabecera(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_envios_cabecera ON envios_evaluacion(cabecera_id);
+
+-- foreign_keys está desactivado: limpiar a mano
+CREATE TRIGGER IF NOT EXISTS trg_envios_cabecera_delete
+AFTER DELETE ON evaluacion_cabecera
+BEGIN
+    DELETE FROM envios_evaluacion WHERE cabecera_id = OLD.id;
+END;
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ÍNDICE DE BÚSQUEDA DE TEXTO (FTS5, mantenido por triggers)
+# ═══════════════════════════════════════════════════════════════════
+
+# Dos índices con los textos que se pueden buscar:
+# - evaluaciones_fts: una fila por evaluación (rowid = evaluacion_cabecera.id)
+#   con la observación global, la propuesta, su código y el curador
+# - aspectos_fts: una fila por aspecto evaluado (rowid = evaluacion_detalle.id)
+#   con su dimensión, su aspecto y su observación propia si la tiene
+# Así la observación de cada evaluación se indexa una sola vez. Los nombres de
+# catálogo se copian al índice, así que los renombres se propagan con
+# triggers sobre cada catálogo.
+COLUMNAS_BUSQUEDA = ('observacion', 'nombre_propuesta', 'codigo_grupo', 'curador')
+COLUMNAS_BUSQUEDA_ASPECTOS = ('observacion', 'dimension', 'aspecto')
+
+# Textos indexables de las evaluaciones que cumplen {condicion}
+_FUENTE_BUSQUEDA = """
+    SELECT c.id, c.observacion, g.nombre_propuesta, c.codigo_grupo, u.username
+    FROM evaluacion_cabecera c
+    LEFT JOIN grupos g ON g.codigo = c.codigo_grupo
+    LEFT JOIN usuarios u ON u.id = c.usuario_id
+    WHERE {condicion}
+"""
+
+# Textos indexables de los aspectos evaluados que cumplen {condicion}
+_FUENTE_BUSQUEDA_ASPECTOS = """
+    SELECT d.id, d.observacion, dim.nombre, a.nombre
+    FROM evaluacion_detalle d
+    LEFT JOIN aspectos a ON a.id = d.aspecto_id
+    LEFT JOIN dimensiones dim ON dim.id = a.dimension_id
+    WHERE {condicion}
+"""
+
+
+def _sql_indexar(condicion: str) -> str:
+    """(Re)indexa las evaluaciones que cumplen la condición (alias c)."""
+    return f"""
+    INSERT OR REPLACE INTO evaluaciones_fts (rowid, {', '.join(COLUMNAS_BUSQUEDA)})
+    {_FUENTE_BUSQUEDA.format(condicion=condicion)};
+"""
+
+
+def _sql_indexar_aspectos(condicion: str) -> str:
+    """(Re)indexa los aspectos evaluados que cumplen la condición (alias d, a)."""
+    return f"""
+    INSERT OR REPLACE INTO aspectos_fts (rowid, {', '.join(COLUMNAS_BUSQUEDA_ASPECTOS)})
+    {_FUENTE_BUSQUEDA_ASPECTOS.format(condicion=condicion)};
+"""
+
+
+# Disparador -> (evento, indexador, filas a reindexar). Cada condición usa un
+# índice de las tablas de evaluación o de catálogo.
+_REINDEXAR_BUSQUEDA = {
+    'trg_fts_cabecera_insert': ("AFTER INSERT ON evaluacion_cabecera", _sql_indexar, "c.id = NEW.id"),
+    'trg_fts_cabecera_update': ("AFTER UPDATE OF observacion, usuario_id, codigo_grupo ON evaluacion_cabecera",
+                                _sql_indexar, "c.id = NEW.id"),
+    'trg_fts_grupos_update': ("AFTER UPDATE OF nombre_propuesta ON grupos", _sql_indexar,
+                              "c.codigo_grupo = NEW.codigo"),
+    'trg_fts_usuarios_update': ("AFTER UPDATE OF username ON usuarios", _sql_indexar, "c.usuario_id = NEW.id"),
+    'trg_fts_detalle_insert': ("AFTER INSERT ON evaluacion_detalle", _sql_indexar_aspectos, "d.id = NEW.id"),
+    'trg_fts_detalle_update': ("AFTER UPDATE OF observacion, aspecto_id ON evaluacion_detalle",
+                               _sql_indexar_aspectos, "d.id = NEW.id"),
+    'trg_fts_dimensiones_update': ("AFTER UPDATE OF nombre ON dimensiones", _sql_indexar_aspectos,
+                                   "a.dimension_id = NEW.id"),
+    'trg_fts_aspectos_update': ("AFTER UPDATE OF nombre, dimension_id ON aspectos", _sql_indexar_aspectos,
+                                "d.aspecto_id = NEW.id"),
+}
+
+_OPCIONES_FTS = """
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'"""
+
+BUSQUEDA_SQL = f"""
+-- =====================================================
+-- TABLAS VIRTUALES: evaluaciones_fts y aspectos_fts
+-- Índices de texto completo de observaciones y nombres.
+-- remove_diacritics: 'patrimonio' encuentra 'património';
+-- prefix: índices de prefijos de 2 y 3 letras para 'pat*'
+-- =====================================================
+CREATE VIRTUAL TABLE IF NOT EXISTS evaluaciones_fts USING fts5(
+    {', '.join(COLUMNAS_BUSQUEDA)},{_OPCIONES_FTS}
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS aspectos_fts USING fts5(
+    {', '.join(COLUMNAS_BUSQUEDA_ASPECTOS)},{_OPCIONES_FTS}
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_cabecera_delete
+AFTER DELETE ON evaluacion_cabecera
+BEGIN
+    DELETE FROM evaluaciones_fts WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_fts_detalle_delete
+AFTER DELETE ON evaluacion_detalle
+BEGIN
+    DELETE FROM aspectos_fts WHERE rowid = OLD.id;
+END;
+""" + "".join(f"""
+CREATE TRIGGER IF NOT EXISTS {nombre}
+{evento}
+BEGIN{indexar(condicion)}END;
+""" for nombre, (evento, indexar, condicion) in _REINDEXAR_BUSQUEDA.items())
+
+RECONSTRUIR_BUSQUEDA_SQL = f"""
+BEGIN;
+DELETE FROM evaluaciones_fts;
+DELETE FROM aspectos_fts;
+{_sql_indexar('1')}
+{_sql_indexar_aspectos('1')}
+INSERT INTO evaluaciones_fts (evaluaciones_fts) VALUES ('optimize');
+INSERT INTO aspectos_fts (aspectos_fts) VALUES ('optimize');
+COMMIT;
+"""
+
+# Tablas de control para la carga incremental del DataFrame de evaluaciones:
+# las bajas quedan registradas en evaluaciones_eliminadas y cualquier cambio en
+# los catálogos que aparecen en el DataFrame incrementa version_catalogo
+TABLAS_CATALOGO_VERSIONADAS = ('usuarios', 'grupos', 'fichas', 'dimensiones', 'aspectos')
+
+CONTROL_CAMBIOS_SQL = """
+-- =====================================================
+-- TABLA: evaluaciones_eliminadas
+-- Registro de aspectos evaluados eliminados (lápidas)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS evaluaciones_eliminadas (
+    secuencia INTEGER PRIMARY KEY AUTOINCREMENT,
+    evaluacion_id INTEGER NOT NULL,
+    fecha TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_eval_detalle_lapida
+AFTER DELETE ON evaluacion_detalle
+BEGIN
+    INSERT INTO evaluaciones_eliminadas (evaluacion_id) VALUES (OLD.id);
+END;
+
+
+-- =====================================================
+-- TABLA: control_cambios
+-- Contador de versión de los catálogos (fila única)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS control_cambios (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version_catalogo INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO control_cambios (id, version_catalogo) VALUES (1, 0);
+""" + "".join(f"""
+CREATE TRIGGER IF NOT EXISTS trg_{tabla}_{operacion.lower()}_version
+AFTER {operacion} ON {tabla}
+BEGIN
+    UPDATE control_cambios SET version_catalogo = version_catalogo + 1 WHERE id = 1;
+END;
+""" for tabla in TABLAS_CATALOGO_VERSIONADAS for operacion in ('UPDATE', 'DELETE'))
+
+
+def _sql_contador_version(tabla_control: str, descripcion: str, operaciones: dict) -> str:
+    """Tabla de fila única con un contador y los triggers que lo incrementan."""
+    return f"""
+-- =====================================================
+-- TABLA: {tabla_control}
+-- Contador de versión del {descripcion} (fila única)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS {tabla_control} (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO {tabla_control} (id, version) VALUES (1, 0);
+""" + "".join(f"""
+CREATE TRIGGER IF NOT EXISTS trg_{tabla}_{operacion.lower()}_{tabla_control}
+AFTER {operacion} ON {tabla}
+BEGIN
+    UPDATE {tabla_control} SET version = version + 1 WHERE id = 1;
+END;
+""" for tabla, ops in operaciones.items() for operacion in ops)
+
+
+# Escrituras que cambian el catálogo de grupos en memoria del curador
+# (src/database/catalogo_grupos.py). A diferencia de version_catalogo, las
+# altas de grupos también cuentan.
+OPERACIONES_CATALOGO_GRUPOS = {
+    'grupos': ('INSERT', 'UPDATE', 'DELETE'),
+    'fichas': ('UPDATE', 'DELETE'),
+}
+
+CONTROL_GRUPOS_SQL = _sql_contador_version('control_grupos', 'catálogo de grupos', OPERACIONES_CATALOGO_GRUPOS)
+
+# Escrituras que cambian el árbol fichas -> dimensiones -> aspectos en memoria
+# (src/database/catalogo_fichas.py): cualquier alta, modificación o baja, ya
+# venga de models.py, de sync_dimensions.py o de un script
+OPERACIONES_CATALOGO_FICHAS = {
+    tabla: ('INSERT', 'UPDATE', 'DELETE')
+    for tabla in ('fichas', 'dimensiones', 'ficha_dimensiones', 'aspectos')
+}
+
+CONTROL_FICHAS_SQL = _sql_contador_version(
+    'control_fichas', 'catálogo de fichas, dimensiones y aspectos', OPERACIONES_CATALOGO_FICHAS
+)
+
+
+# Reescribe la antigua tabla evaluaciones (una fila por aspecto con la
+# observación repetida) en cabecera + detalle, conservando los IDs
+MIGRACION_EVALUACIONES_SQL = """
+BEGIN;
+""" + TABLAS_EVALUACION_SQL + """
+INSERT INTO evaluacion_cabecera (usuario_id, codigo_grupo, ficha_id, observacion, fecha_registro)
+SELECT e.usuario_id, e.codigo_grupo, e.ficha_id, e.observacion, e.fecha_registro
+FROM evaluaciones e
+WHERE e.id = (
+    SELECT MIN(e2.id) FROM evaluaciones e2
+    WHERE e2.usuario_id = e.usuario_id
+      AND e2.codigo_grupo = e.codigo_grupo
+      AND e2.ficha_id = e.ficha_id
+)
+ORDER BY e.id;
+
+INSERT INTO evaluacion_detalle (id, cabecera_id, aspecto_id, resultado, observacion)
+SELECT e.id, c.id, e.aspecto_id, e.resultado,
+       CASE WHEN e.observacion = c.observacion THEN NULL ELSE e.observacion END
+FROM evaluaciones e
+JOIN evaluacion_cabecera c
+  ON c.usuario_id = e.usuario_id
+ AND c.codigo_grupo = e.codigo_grupo
+ AND c.ficha_id = e.ficha_id
+ORDER BY e.id;
+
+-- No reutilizar IDs de evaluaciones eliminadas antes de la migración
+UPDATE sqlite_sequence
+SET seq = MAX(seq, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'evaluaciones'), 0))
+WHERE name = 'evaluacion_detalle';
+
+DROP TABLE evaluaciones;
+COMMIT;
+"""
+
+
 SCHEMA_SQL = """
 -- =====================================================
 -- TABLA: usuarios
@@ -127,35 +954,50 @@ CREATE TABLE IF NOT EXISTS grupos (
 CREATE INDEX IF NOT EXISTS idx_grupos_modalidad ON grupos(modalidad);
 CREATE INDEX IF NOT EXISTS idx_grupos_ano ON grupos(ano_evento);
 CREATE INDEX IF NOT EXISTS idx_grupos_ficha ON grupos(ficha_id);
-
+""" + TABLAS_EVALUACION_SQL + """
 
 -- =====================================================
--- TABLA: evaluaciones
--- Evaluaciones por ficha y aspecto
+-- VISTA: evaluaciones
+-- Compatibilidad: una fila por aspecto evaluado, con las
+-- mismas columnas que la antigua tabla evaluaciones
 -- =====================================================
-CREATE TABLE IF NOT EXISTS evaluaciones (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    usuario_id INTEGER NOT NULL,
-    codigo_grupo TEXT NOT NULL,
-    ficha_id INTEGER NOT NULL,
-    aspecto_id INTEGER NOT NULL,
-    resultado INTEGER CHECK (resultado IN (0,1,2)) NOT NULL,
-    observacion TEXT NOT NULL,
-    fecha_registro TEXT DEFAULT CURRENT_TIMESTAMP,
+CREATE VIEW IF NOT EXISTS evaluaciones AS
+SELECT
+    d.id,
+    c.usuario_id,
+    c.codigo_grupo,
+    c.ficha_id,
+    d.aspecto_id,
+    d.resultado,
+    COALESCE(d.observacion, c.observacion) AS observacion,
+    c.fecha_registro,
+    d.cabecera_id
+FROM evaluacion_detalle d
+JOIN evaluacion_cabecera c ON c.id = d.cabecera_id;
 
-    FOREIGN KEY (usuario_id) REFERENCES usuarios(id) ON DELETE CASCADE,
-    FOREIGN KEY (codigo_grupo) REFERENCES grupos(codigo) ON DELETE CASCADE,
-    FOREIGN KEY (ficha_id) REFERENCES fichas(id) ON DELETE CASCADE,
-    FOREIGN KEY (aspecto_id) REFERENCES aspectos(id) ON DELETE CASCADE,
+-- Escrituras heredadas sobre la vista (scripts de mantenimiento)
+CREATE TRIGGER IF NOT EXISTS trg_evaluaciones_insert
+INSTEAD OF INSERT ON evaluaciones
+BEGIN
+    INSERT INTO evaluacion_cabecera (usuario_id, codigo_grupo, ficha_id, observacion, fecha_registro)
+    VALUES (NEW.usuario_id, NEW.codigo_grupo, NEW.ficha_id, NEW.observacion,
+            COALESCE(NEW.fecha_registro, CURRENT_TIMESTAMP))
+    ON CONFLICT (usuario_id, codigo_grupo, ficha_id) DO NOTHING;
 
-    UNIQUE (usuario_id, codigo_grupo, ficha_id, aspecto_id),
-    CHECK (length(observacion) >= 5)
-);
+    INSERT INTO evaluacion_detalle (cabecera_id, aspecto_id, resultado, observacion)
+    SELECT c.id, NEW.aspecto_id, NEW.resultado,
+           CASE WHEN c.observacion = NEW.observacion THEN NULL ELSE NEW.observacion END
+    FROM evaluacion_cabecera c
+    WHERE c.usuario_id = NEW.usuario_id
+      AND c.codigo_grupo = NEW.codigo_grupo
+      AND c.ficha_id = NEW.ficha_id;
+END;
 
-CREATE INDEX IF NOT EXISTS idx_evaluaciones_usuario ON evaluaciones(usuario_id);
-CREATE INDEX IF NOT EXISTS idx_evaluaciones_grupo ON evaluaciones(codigo_grupo);
-CREATE INDEX IF NOT EXISTS idx_evaluaciones_ficha ON evaluaciones(ficha_id);
-CREATE INDEX IF NOT EXISTS idx_evaluaciones_aspecto ON evaluaciones(aspecto_id);
+CREATE TRIGGER IF NOT EXISTS trg_evaluaciones_delete
+INSTEAD OF DELETE ON evaluaciones
+BEGIN
+    DELETE FROM evaluacion_detalle WHERE id = OLD.id;
+END;
 
 
 -- =====================================================
@@ -172,10 +1014,256 @@ CREATE TABLE IF NOT EXISTS logs_sistema (
 
 CREATE INDEX IF NOT EXISTS idx_logs_fecha ON logs_sistema(fecha);
 CREATE INDEX IF NOT EXISTS idx_logs_usuario ON logs_sistema(usuario);
-"""
+""" + CONTROL_CAMBIOS_SQL + CONTROL_GRUPOS_SQL + CONTROL_FICHAS_SQL + RESUMENES_SQL + ESTADO_SQL + ASIGNACIONES_SQL + BORRADORES_SQL + ENVIOS_SQL + BUSQUEDA_SQL
+
+
+
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MIGRACIÓN DEL ESQUEMA DE EVALUACIONES
+# ═══════════════════════════════════════════════════════════════════
+
+def migrar_evaluaciones_normalizadas() -> bool:
+    """
+    Migra la antigua tabla evaluaciones (una fila por aspecto con la
+    observación repetida) a evaluacion_cabecera + evaluacion_detalle.
+    
+    Tras la migración, evaluaciones pasa a ser una vista con las mismas
+    columnas, por lo que las consultas existentes siguen funcionando.
+    No hace nada si la base de datos ya usa el esquema normalizado.
+    
+    Returns:
+        True si no había nada que migrar o la migración fue exitosa
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'evaluaciones'"
+            )
+            if cursor.fetchone()[0] == 0:
+                return True
+            
+            cursor.execute("SELECT COUNT(*) FROM evaluaciones")
+            total_filas = cursor.fetchone()[0]
+        
+        logger.info(f"Migrando {total_filas} evaluaciones al esquema cabecera/detalle...")
+        ejecutar_script(MIGRACION_EVALUACIONES_SQL)
+        
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM evaluacion_cabecera")
+            total_cabeceras = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM evaluacion_detalle WHERE observacion IS NOT NULL")
+            observaciones_distintas = cursor.fetchone()[0]
+        
+        # Recuperar el espacio que ocupaban las observaciones duplicadas
+        ejecutar_script("VACUUM;")
+        
+        logger.info(
+            f"✅ Migración completada: {total_filas} aspectos en {total_cabeceras} cabeceras"
+        )
+        if observaciones_distintas:
+            logger.warning(
+                f"⚠️ {observaciones_distintas} aspectos conservan una observación propia "
+                f"distinta a la de su cabecera"
+            )
+        return True
+        
+    except Exception as e:
+        logger.exception(f"❌ Error migrando evaluaciones: {e}")
+        return False
+
+
+# ═══════════════════════════════════════════════════════════════════
+# TABLAS RESUMEN: VERIFICACIÓN Y RECONSTRUCCIÓN
+# ═══════════════════════════════════════════════════════════════════
+
+def reconstruir_resumenes() -> bool:
+    """
+    Recalcula todas las tablas resumen desde evaluacion_detalle.
+    
+    Los triggers las mantienen al día; esto sólo hace falta para
+    recuperarse de escrituras hechas sin triggers o de cambios de catálogo
+    que alteran las claves (p.ej. mover un aspecto a otra dimensión).
+    
+    Returns:
+        True si la reconstrucción fue exitosa
+    """
+    try:
+        ejecutar_script(RECONSTRUIR_RESUMENES_SQL)
+        logger.info("✅ Tablas resumen reconstruidas")
+        return True
+    except Exception as e:
+        logger.exception(f"❌ Error reconstruyendo tablas resumen: {e}")
+        return False
+
+
+def resumenes_consistentes() -> bool:
+    """
+    Comprueba que cada tabla resumen tenga, clave por clave, los mismos
+    suma, conteo, n0, n1 y n2 que una reconstrucción desde evaluacion_detalle.
+    Las filas que quedaron a cero tras descontar equivalen a no tener fila.
+    
+    Returns:
+        True si todas las tablas resumen cuadran
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for tabla, claves in TABLAS_RESUMEN.items():
+            lista = ', '.join(claves)
+            en_resumen = f"""
+                SELECT {lista}, suma, conteo, n0, n1, n2 FROM {tabla}
+                WHERE suma != 0 OR conteo != 0 OR n0 != 0 OR n1 != 0 OR n2 != 0"""
+            en_detalle = _sql_agregado(claves)
+            cursor.execute(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM ({en_resumen} EXCEPT {en_detalle})),
+                    (SELECT COUNT(*) FROM ({en_detalle} EXCEPT {en_resumen}))
+            """)
+            sobrantes, faltantes = cursor.fetchone()
+            if sobrantes or faltantes:
+                logger.warning(
+                    f"⚠️ {tabla} desincronizada: {sobrantes} claves con valores que no cuadran, "
+                    f"{faltantes} claves evaluadas sin su valor correcto"
+                )
+                return False
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ESTADO DE LAS EVALUACIONES: VERIFICACIÓN Y RECONSTRUCCIÓN
+# ═══════════════════════════════════════════════════════════════════
+
+def reconstruir_estado_evaluaciones() -> bool:
+    """
+    Recalcula estado_evaluacion desde las cabeceras, los aspectos calificados
+    y el catálogo de cada ficha.
+
+    Returns:
+        True si la reconstrucción fue exitosa
+    """
+    try:
+        ejecutar_script(RECONSTRUIR_ESTADO_SQL)
+        logger.info("✅ Estado de las evaluaciones reconstruido")
+        return True
+    except Exception as e:
+        logger.exception(f"❌ Error reconstruyendo el estado de las evaluaciones: {e}")
+        return False
 
 
+def estado_evaluaciones_consistente() -> bool:
+    """
+    Comprueba que estado_evaluacion tenga una fila por cabecera y el mismo
+    total de aspectos calificados que evaluacion_detalle (comprobación barata).
 
+    Returns:
+        True si los totales cuadran
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM estado_evaluacion),
+                (SELECT COUNT(*) FROM evaluacion_cabecera),
+                (SELECT COALESCE(SUM(aspectos_calificados), 0) FROM estado_evaluacion),
+                (SELECT COUNT(*) FROM evaluacion_detalle d
+                 JOIN evaluacion_cabecera c ON c.id = d.cabecera_id
+                 WHERE EXISTS (SELECT 1 FROM {_ASPECTOS_DE_FICHA.format(ficha='c.ficha_id')}
+                               AND a.id = d.aspecto_id))
+        """)
+        filas, cabeceras, en_estado, en_detalle = cursor.fetchone()
+    if filas != cabeceras or en_estado != en_detalle:
+        logger.warning(
+            f"⚠️ estado_evaluacion desincronizada: {filas} filas / {cabeceras} cabeceras, "
+            f"{en_estado} aspectos contados / {en_detalle} calificados"
+        )
+        return False
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ÍNDICE DE BÚSQUEDA: VERIFICACIÓN Y RECONSTRUCCIÓN
+# ═══════════════════════════════════════════════════════════════════
+
+def reconstruir_indice_busqueda() -> bool:
+    """
+    Vuelve a indexar todas las evaluaciones en evaluaciones_fts y todos los
+    aspectos evaluados en aspectos_fts.
+
+    Returns:
+        True si la reconstrucción fue exitosa
+    """
+    try:
+        ejecutar_script(RECONSTRUIR_BUSQUEDA_SQL)
+        logger.info("✅ Índice de búsqueda reconstruido")
+        return True
+    except Exception as e:
+        logger.exception(f"❌ Error reconstruyendo el índice de búsqueda: {e}")
+        return False
+
+
+def indice_busqueda_consistente() -> bool:
+    """
+    Comprueba que evaluaciones_fts tenga una fila por evaluación y
+    aspectos_fts una por aspecto evaluado.
+
+    Returns:
+        True si el número de filas indexadas coincide
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for tabla, fuente in (('evaluaciones_fts', _FUENTE_BUSQUEDA), ('aspectos_fts', _FUENTE_BUSQUEDA_ASPECTOS)):
+            cursor.execute(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM {tabla}),
+                    (SELECT COUNT(*) FROM ({fuente.format(condicion='1')}))
+            """)
+            indexadas, evaluadas = cursor.fetchone()
+            if indexadas != evaluadas:
+                logger.warning(
+                    f"⚠️ {tabla} desincronizada: {indexadas} filas indexadas, {evaluadas} a indexar"
+                )
+                return False
+    return True
+
+
+def migrar_indice_busqueda() -> bool:
+    """
+    Descarta el índice de búsqueda anterior (una fila por aspecto evaluado con
+    la observación de la evaluación repetida en cada una) y sus triggers; el
+    esquema crea los nuevos y inicializar_base_datos los puebla.
+    No hace nada si evaluaciones_fts ya tiene las columnas actuales.
+
+    Returns:
+        True si no había nada que migrar o la migración fue exitosa
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'evaluaciones_fts'"
+            )
+            if cursor.fetchone()[0] == 0:
+                return True
+            cursor.execute("PRAGMA table_info(evaluaciones_fts)")
+            if tuple(row['name'] for row in cursor.fetchall()) == COLUMNAS_BUSQUEDA:
+                return True
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_fts_%'")
+            triggers = [row['name'] for row in cursor.fetchall()]
+
+        ejecutar_script(
+            "BEGIN;\n"
+            + "".join(f"DROP TRIGGER IF EXISTS {nombre};\n" for nombre in triggers)
+            + "DROP TABLE evaluaciones_fts;\nCOMMIT;\n"
+        )
+        logger.info("Índice de búsqueda anterior descartado: se reconstruye por evaluación y por aspecto")
+        return True
+
+    except Exception as e:
+        logger.exception(f"❌ Error migrando el índice de búsqueda: {e}")
+        return False
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -192,10 +1280,23 @@ def inicializar_base_datos() -> bool:
     try:
         logger.info("Inicializando base de datos...")
         
-        # 1. Crear esquema
+        # 1. Crear esquema (migrando evaluaciones del esquema anterior si aplica)
+        if not migrar_evaluaciones_normalizadas():
+            return False
+        if not migrar_indice_busqueda():
+            return False
         ejecutar_script(SCHEMA_SQL)
         logger.info("Esquema de base de datos creado")
         
+        # Poblar las tablas resumen, el estado de las evaluaciones y el índice de
+        # búsqueda si son nuevos o quedaron desincronizados
+        if not resumenes_consistentes() and not reconstruir_resumenes():
+            return False
+        if not estado_evaluaciones_consistente() and not reconstruir_estado_evaluaciones():
+            return False
+        if not indice_busqueda_consistente() and not reconstruir_indice_busqueda():
+            return False
+        
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
@@ -320,8 +1421,11 @@ def verificar_integridad_bd() -> bool:
             # Verificar tablas requeridas
             tablas_requeridas = [
                 'usuarios', 'fichas', 'dimensiones', 'ficha_dimensiones',
-                'aspectos', 'grupos', 'evaluaciones', 'logs_sistema'
-            ]
+                'aspectos', 'grupos', 'evaluacion_cabecera', 'evaluacion_detalle',
+                'logs_sistema', 'evaluaciones_eliminadas', 'control_cambios', 'control_grupos',
+                'control_fichas', 'estado_evaluacion', 'asignaciones',
+                'programacion_presentaciones', 'evaluacion_borrador', 'envios_evaluacion'
+            ] + list(TABLAS_RESUMEN) + ['evaluaciones_fts']
 
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tablas_existentes = [row[0] for row in cursor.fetchall()]
@@ -331,6 +1435,12 @@ def verificar_integridad_bd() -> bool:
                     logger.error(f"❌ Tabla faltante: {tabla}")
                     return False
             
+            # Verificar la vista de compatibilidad
+            cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='view' AND name='evaluaciones'")
+            if cursor.fetchone()[0] == 0:
+                logger.error("❌ Vista faltante: evaluaciones")
+                return False
+            
             # Verificar que existan fichas
             cursor.execute("SELECT COUNT(*) FROM fichas")
             count_fichas = cursor.fetchone()[0]
@@ -0,0 +1,153 @@
+"""
+Lectura columnar de consultas analíticas
+Recorre el cursor por lotes (fetchmany) y vuelca cada columna directamente en
+buffers NumPy tipados, sin sqlite3.Row, dicts por fila ni
+DataFrame.from_records. Las columnas categóricas guardan un código entero por
+fila y una sola copia de cada valor distinto, de modo que la memoria máxima
+no crece con un objeto Python por celda.
+"""
+import sqlite3
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+# Filas leídas del cursor en cada fetchmany
+TAMANO_LOTE = 5000
+
+
+class _ColumnaNumerica:
+    """Buffer NumPy preasignado que crece al doble cuando se llena."""
+
+    def __init__(self, dtype, capacidad: int = TAMANO_LOTE):
+        self.datos = np.empty(capacidad, dtype=dtype)
+        self.n = 0
+
+    def _reservar(self, extra: int) -> None:
+        if self.n + extra > len(self.datos):
+            nuevo = np.empty(max(2 * len(self.datos), self.n + extra), dtype=self.datos.dtype)
+            nuevo[:self.n] = self.datos[:self.n]
+            self.datos = nuevo
+
+    def _convertir(self, valores: tuple) -> np.ndarray:
+        if self.datos.dtype.kind == 'f':
+            return np.array(valores, dtype=self.datos.dtype)  # None -> NaN
+        try:
+            return np.fromiter(valores, dtype=self.datos.dtype, count=len(valores))
+        except TypeError:
+            # NULL en una columna entera: como pandas, se pasa a float64 con NaN
+            self.datos = self.datos.astype(np.float64)
+            return np.array(valores, dtype=np.float64)
+
+    def agregar_array(self, lote: np.ndarray) -> None:
+        self._reservar(len(lote))
+        self.datos[self.n:self.n + len(lote)] = lote
+        self.n += len(lote)
+
+    def agregar(self, valores: tuple) -> None:
+        self.agregar_array(self._convertir(valores))
+
+    def resultado(self):
+        return self.datos[:self.n]
+
+
+class _ColumnaFecha(_ColumnaNumerica):
+    """Textos ISO 8601 de SQLite convertidos a datetime64 lote a lote."""
+
+    def __init__(self, capacidad: int = TAMANO_LOTE):
+        super().__init__('datetime64[ns]', capacidad)
+
+    def _convertir(self, valores: tuple) -> np.ndarray:
+        fechas = pd.to_datetime(pd.Series(valores, dtype=object), format='ISO8601', errors='coerce')
+        return fechas.to_numpy(dtype='datetime64[ns]')
+
+
+class _ColumnaCategorica:
+    """Códigos int32 por fila más un diccionario de valores distintos."""
+
+    def __init__(self, capacidad: int = TAMANO_LOTE):
+        self.codigos = _ColumnaNumerica(np.int32, capacidad)
+        self.valores: Dict[object, int] = {}
+
+    def agregar(self, valores: tuple) -> None:
+        codigos_lote, distintos = pd.factorize(np.array(valores, dtype=object))
+        if len(distintos) == 0:
+            self.codigos.agregar_array(codigos_lote.astype(np.int32))
+            return
+        # Traducir los códigos del lote a los globales (un paso por valor distinto)
+        globales = np.fromiter(
+            (self.valores.setdefault(valor, len(self.valores)) for valor in distintos),
+            dtype=np.int32, count=len(distintos)
+        )
+        self.codigos.agregar_array(np.where(codigos_lote >= 0, globales[codigos_lote], -1).astype(np.int32))
+
+    def resultado(self):
+        codigos = self.codigos.resultado()
+        categorias = np.array(list(self.valores), dtype=object)
+        # Categorías en orden alfabético, como pd.Categorical
+        orden = np.argsort(categorias, kind='stable')
+        posicion = np.empty(len(orden), dtype=np.int32)
+        posicion[orden] = np.arange(len(orden), dtype=np.int32)
+        if len(orden):
+            codigos = np.where(codigos >= 0, posicion[np.maximum(codigos, 0)], -1)
+        return pd.Categorical.from_codes(codigos, categories=pd.Index(categorias[orden], dtype=object))
+
+
+class _ColumnaObjeto:
+    """Columna sin tipo declarado: se conserva como object."""
+
+    def __init__(self):
+        self.partes = []
+
+    def agregar(self, valores: tuple) -> None:
+        self.partes.append(np.array(valores, dtype=object))
+
+    def resultado(self):
+        return np.concatenate(self.partes) if self.partes else np.empty(0, dtype=object)
+
+
+def _crear_columna(tipo: Optional[str]):
+    if tipo is None or tipo == 'object':
+        return _ColumnaObjeto()
+    if tipo == 'category':
+        return _ColumnaCategorica()
+    if tipo.startswith('datetime64'):
+        return _ColumnaFecha()
+    return _ColumnaNumerica(tipo)
+
+
+def leer_columnar(conn: sqlite3.Connection, query: str, params: tuple = (),
+                  tipos: Optional[Dict[str, str]] = None,
+                  tamano_lote: int = TAMANO_LOTE) -> pd.DataFrame:
+    """
+    Ejecuta una consulta y construye el DataFrame columna a columna.
+
+    Args:
+        conn: Conexión abierta (su row_factory no se modifica)
+        query: Consulta SQL
+        params: Parámetros de la consulta
+        tipos: Tipo de cada columna: 'category', 'datetime64[ns]' o un dtype
+            numérico de NumPy. Las columnas sin tipo quedan como object
+        tamano_lote: Filas por fetchmany
+
+    Returns:
+        DataFrame con las columnas de la consulta en los tipos indicados
+    """
+    tipos = tipos or {}
+    cursor = conn.cursor()
+    try:
+        # Tuplas en lugar de sqlite3.Row sólo para este cursor
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        nombres = [descripcion[0] for descripcion in cursor.description]
+        columnas = [_crear_columna(tipos.get(nombre)) for nombre in nombres]
+
+        while True:
+            lote = cursor.fetchmany(tamano_lote)
+            if not lote:
+                break
+            for columna, valores in zip(columnas, zip(*lote)):
+                columna.agregar(valores)
+    finally:
+        cursor.close()
+
+    return pd.DataFrame({nombre: columna.resultado() for nombre, columna in zip(nombres, columnas)})
@@ -5,10 +5,21 @@ ACTUALIZADO: Sistema completo con fichas dinámicas
 import logging
 import pandas as pd
 import bcrypt
+import json
 import re
+import sqlite3
+from contextlib import nullcontext
 from typing import Optional, List, Dict, Tuple
+from src.config import config
 from src.database.connection import get_db_connection, ejecutar_insert
+from src.database.cache_evaluaciones import TIPOS_EVALUACIONES, cache_evaluaciones, leer_evaluaciones
+from src.database.catalogo_fichas import catalogo_fichas
+from src.database.archivo_logs import ESQUEMA_ARCHIVO, archivar_logs, con_archivo
+from src.database.auditoria import auditoria
+from src.database.escritor import escritor
+from src.database.lector_columnar import leer_columnar
 from src.utils.validators import validar_codigo_grupo, validar_observacion, validar_resultado
+from src.utils.asignacion import repartir_grupos
 
 logger = logging.getLogger(__name__)
 
@@ -287,13 +298,9 @@ class FichaModel:
     
     @staticmethod
     def obtener_todas() -> List[Dict]:
-        """Obtiene todas las fichas."""
+        """Obtiene todas las fichas (desde el catálogo en memoria)."""
         try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM fichas ORDER BY nombre")
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+            return [ficha.fila() for ficha in catalogo_fichas.arbol().fichas]
         except Exception as e:
             logger.error(f"Error obteniendo fichas: {e}")
             return []
@@ -301,34 +308,14 @@ class FichaModel:
     @staticmethod
     def obtener_por_id(ficha_id: int) -> Optional[Dict]:
         """Obtiene una ficha por su ID."""
-        try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM fichas WHERE id = ?", (ficha_id,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return dict(row)
-                return None
-        except Exception as e:
-            logger.error(f"Error obteniendo ficha: {e}")
-            return None
+        ficha = catalogo_fichas.arbol().fichas_por_id.get(ficha_id)
+        return ficha.fila() if ficha else None
     
     @staticmethod
     def obtener_por_codigo(codigo: str) -> Optional[Dict]:
         """Obtiene una ficha por su código."""
-        try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM fichas WHERE codigo = ?", (codigo,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return dict(row)
-                return None
-        except Exception as e:
-            logger.error(f"Error obteniendo ficha por código: {e}")
-            return None
+        ficha = catalogo_fichas.arbol().fichas_por_codigo.get(codigo)
+        return ficha.fila() if ficha else None
     
     @staticmethod
     def actualizar_ficha(ficha_id: int, nombre: str, descripcion: str = None) -> Tuple[bool, Optional[str]]:
@@ -395,13 +382,9 @@ class DimensionModel:
     
     @staticmethod
     def obtener_todas() -> List[Dict]:
-        """Obtiene todas las dimensiones ordenadas."""
+        """Obtiene todas las dimensiones ordenadas (desde el catálogo en memoria)."""
         try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM dimensiones ORDER BY orden")
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+            return [dimension.fila() for dimension in catalogo_fichas.arbol().dimensiones]
         except Exception as e:
             logger.error(f"Error obteniendo dimensiones: {e}")
             return []
@@ -409,34 +392,14 @@ class DimensionModel:
     @staticmethod
     def obtener_por_id(dimension_id: int) -> Optional[Dict]:
         """Obtiene una dimensión por su ID."""
-        try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM dimensiones WHERE id = ?", (dimension_id,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return dict(row)
-                return None
-        except Exception as e:
-            logger.error(f"Error obteniendo dimensión: {e}")
-            return None
+        dimension = catalogo_fichas.arbol().dimensiones_por_id.get(dimension_id)
+        return dimension.fila() if dimension else None
     
     @staticmethod
     def obtener_por_codigo(codigo: str) -> Optional[Dict]:
         """Obtiene una dimensión por su código."""
-        try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM dimensiones WHERE codigo = ?", (codigo,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return dict(row)
-                return None
-        except Exception as e:
-            logger.error(f"Error obteniendo dimensión: {e}")
-            return None
+        dimension = catalogo_fichas.arbol().dimensiones_por_codigo.get(codigo)
+        return dimension.fila() if dimension else None
     
     @staticmethod
     def actualizar_dimension(dimension_id: int, nombre: str, descripcion: str = None, orden: int = None) -> Tuple[bool, Optional[str]]:
@@ -513,16 +476,11 @@ class AspectoModel:
     def obtener_todos() -> List[Dict]:
         """Obtiene todos los aspectos ordenados."""
         try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT a.*, d.nombre as dimension_nombre, d.codigo as dimension_codigo
-                    FROM aspectos a
-                    JOIN dimensiones d ON a.dimension_id = d.id
-                    ORDER BY d.orden, a.orden
-                """)
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+            return [
+                {**aspecto.fila(), 'dimension_nombre': dimension.nombre, 'dimension_codigo': dimension.codigo}
+                for dimension in catalogo_fichas.arbol().dimensiones
+                for aspecto in dimension.aspectos
+            ]
         except Exception as e:
             logger.error(f"Error obteniendo aspectos: {e}")
             return []
@@ -530,112 +488,48 @@ class AspectoModel:
     @staticmethod
     def obtener_por_dimension(dimension_id: int) -> List[Dict]:
         """Obtiene todos los aspectos de una dimensión específica."""
-        try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT * FROM aspectos 
-                    WHERE dimension_id = ? 
-                    ORDER BY orden
-                """, (dimension_id,))
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
-        except Exception as e:
-            logger.error(f"Error obteniendo aspectos de dimensión: {e}")
-            return []
+        dimension = catalogo_fichas.arbol().dimensiones_por_id.get(dimension_id)
+        return [aspecto.fila() for aspecto in dimension.aspectos] if dimension else []
+    
+    @staticmethod
+    def _agrupar(dimensiones) -> Dict[int, Dict]:
+        """{dimension_id: {'dimension': {...}, 'aspectos': [...]}} a partir de (dimensión, orden)."""
+        return {
+            dimension.id: {
+                'dimension': {
+                    'id': dimension.id,
+                    'codigo': dimension.codigo,
+                    'nombre': dimension.nombre,
+                    'orden': orden
+                },
+                'aspectos': [
+                    {'id': aspecto.id, 'nombre': aspecto.nombre, 'orden': aspecto.orden}
+                    for aspecto in dimension.aspectos
+                ]
+            }
+            for dimension, orden in dimensiones
+        }
     
     @staticmethod
     def obtener_agrupados_por_dimension() -> Dict[int, Dict]:
         """Obtiene aspectos agrupados por dimensión."""
         try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        d.id as dimension_id,
-                        d.codigo as dimension_codigo,
-                        d.nombre as dimension_nombre,
-                        d.orden as dimension_orden,
-                        a.id as aspecto_id,
-                        a.nombre as aspecto_nombre,
-                        a.orden as aspecto_orden
-                    FROM dimensiones d
-                    LEFT JOIN aspectos a ON d.id = a.dimension_id
-                    ORDER BY d.orden, a.orden
-                """)
-                rows = cursor.fetchall()
-                
-                resultado = {}
-                for row in rows:
-                    dim_id = row['dimension_id']
-                    if dim_id not in resultado:
-                        resultado[dim_id] = {
-                            'dimension': {
-                                'id': row['dimension_id'],
-                                'codigo': row['dimension_codigo'],
-                                'nombre': row['dimension_nombre'],
-                                'orden': row['dimension_orden']
-                            },
-                            'aspectos': []
-                        }
-                    
-                    if row['aspecto_id']:
-                        resultado[dim_id]['aspectos'].append({
-                            'id': row['aspecto_id'],
-                            'nombre': row['aspecto_nombre'],
-                            'orden': row['aspecto_orden']
-                        })
-                
-                return resultado
+            return AspectoModel._agrupar((d, d.orden) for d in catalogo_fichas.arbol().dimensiones)
         except Exception as e:
             logger.error(f"Error obteniendo aspectos agrupados: {e}")
             return {}
     
     @staticmethod
     def obtener_por_ficha(ficha_id: int) -> Dict[int, Dict]:
-        """Obtiene aspectos agrupados por dimensión para una ficha específica."""
+        """
+        Obtiene aspectos agrupados por dimensión para una ficha específica,
+        con el orden de cada dimensión dentro de la ficha.
+        """
         try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        d.id as dimension_id,
-                        d.codigo as dimension_codigo,
-                        d.nombre as dimension_nombre,
-                        fd.orden as dimension_orden,
-                        a.id as aspecto_id,
-                        a.nombre as aspecto_nombre,
-                        a.orden as aspecto_orden
-                    FROM ficha_dimensiones fd
-                    JOIN dimensiones d ON fd.dimension_id = d.id
-                    LEFT JOIN aspectos a ON d.id = a.dimension_id
-                    WHERE fd.ficha_id = ?
-                    ORDER BY fd.orden, a.orden
-                """, (ficha_id,))
-                rows = cursor.fetchall()
-                
-                resultado = {}
-                for row in rows:
-                    dim_id = row['dimension_id']
-                    if dim_id not in resultado:
-                        resultado[dim_id] = {
-                            'dimension': {
-                                'id': row['dimension_id'],
-                                'codigo': row['dimension_codigo'],
-                                'nombre': row['dimension_nombre'],
-                                'orden': row['dimension_orden']
-                            },
-                            'aspectos': []
-                        }
-                    
-                    if row['aspecto_id']:
-                        resultado[dim_id]['aspectos'].append({
-                            'id': row['aspecto_id'],
-                            'nombre': row['aspecto_nombre'],
-                            'orden': row['aspecto_orden']
-                        })
-                
-                return resultado
+            ficha = catalogo_fichas.arbol().fichas_por_id.get(ficha_id)
+            if ficha is None:
+                return {}
+            return AspectoModel._agrupar((fd.dimension, fd.orden) for fd in ficha.dimensiones)
         except Exception as e:
             logger.error(f"Error obteniendo aspectos por ficha: {e}")
             return {}
@@ -715,20 +609,13 @@ class FichaDimensionModel:
     def obtener_dimensiones_de_ficha(ficha_id: int) -> List[Dict]:
         """Obtiene todas las dimensiones asignadas a una ficha."""
         try:
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        fd.*,
-                        d.codigo as dimension_codigo,
-                        d.nombre as dimension_nombre
-                    FROM ficha_dimensiones fd
-                    JOIN dimensiones d ON fd.dimension_id = d.id
-                    WHERE fd.ficha_id = ?
-                    ORDER BY fd.orden
-                """, (ficha_id,))
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+            ficha = catalogo_fichas.arbol().fichas_por_id.get(ficha_id)
+            if ficha is None:
+                return []
+            return [
+                {**fd.fila(), 'dimension_codigo': fd.dimension.codigo, 'dimension_nombre': fd.dimension.nombre}
+                for fd in ficha.dimensiones
+            ]
         except Exception as e:
             logger.error(f"Error obteniendo dimensiones de ficha: {e}")
             return []
@@ -994,7 +881,7 @@ class GrupoModel:
 # ═══════════════════════════════════════════════════════════════════
 
 class EvaluacionModel:
-    """Operaciones sobre la tabla evaluaciones"""
+    """Operaciones sobre evaluaciones (cabecera + detalle, vista evaluaciones)"""
     
     @staticmethod
     def crear_evaluacion(usuario_id: int, codigo_grupo: str, ficha_id: int, 
@@ -1013,12 +900,25 @@ class EvaluacionModel:
                 logger.error(f"Observación inválida: {error}")
                 return None
             
-            query = """
-                INSERT INTO evaluaciones (usuario_id, codigo_grupo, ficha_id, aspecto_id, resultado, observacion)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                
+                # La cabecera guarda la observación una sola vez por grupo/ficha
+                cursor.execute("""
+                    INSERT INTO evaluacion_cabecera (usuario_id, codigo_grupo, ficha_id, observacion)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (usuario_id, codigo_grupo, ficha_id) DO NOTHING
+                """, (usuario_id, codigo_grupo, ficha_id, observacion))
+                
+                cursor.execute("""
+                    INSERT INTO evaluacion_detalle (cabecera_id, aspecto_id, resultado, observacion)
+                    SELECT id, ?, ?, CASE WHEN observacion = ? THEN NULL ELSE ? END
+                    FROM evaluacion_cabecera
+                    WHERE usuario_id = ? AND codigo_grupo = ? AND ficha_id = ?
+                """, (aspecto_id, resultado, observacion, observacion,
+                      usuario_id, codigo_grupo, ficha_id))
+                eval_id = cursor.lastrowid
             
-            eval_id = ejecutar_insert(query, (usuario_id, codigo_grupo, ficha_id, aspecto_id, resultado, observacion))
             logger.info(f"Evaluación creada: ID {eval_id} - Ficha {ficha_id}, Aspecto {aspecto_id}")
             return eval_id
             
@@ -1027,39 +927,223 @@ class EvaluacionModel:
             return None
     
     @staticmethod
-    def evaluacion_existe(usuario_id: int, codigo_grupo: str, ficha_id: int) -> bool:
-        """Verifica si ya existe una evaluación completa del usuario para el grupo con esa ficha."""
+    def crear_evaluaciones_lote(usuario_id: int, codigo_grupo: str, ficha_id: int,
+                                resultados: List[Tuple[int, int]], observacion: str,
+                                clave_envio: Optional[str] = None) -> Dict:
+        """
+        Registra todos los aspectos de una ficha en una sola transacción.
+        
+        La observación se valida y se guarda una vez en la cabecera, los aspectos
+        se insertan en evaluacion_detalle con executemany y el log de auditoría se
+        escribe en la misma transacción: o se guarda la evaluación completa o no
+        se guarda nada. El borrador del formulario (evaluacion_borrador) se
+        descarta por trigger dentro de esa misma transacción. La escritura la
+        hace el escritor único del proceso (src.database.escritor), que la
+        confirma en grupo con las demás escrituras pendientes.
+        
+        Con clave_envio el envío es idempotente: la clave se guarda en
+        envios_evaluacion junto con la evaluación y un reenvío con la misma
+        clave (doble clic, re-ejecución) se resuelve con una búsqueda por
+        clave primaria que devuelve el resultado original sin escribir nada.
+        Los envíos fallidos no se registran, así que se pueden reintentar.
+        
+        Args:
+            usuario_id: ID del curador
+            codigo_grupo: Código del grupo evaluado
+            ficha_id: ID de la ficha aplicada
+            resultados: Lista de tuplas (aspecto_id, resultado)
+            observacion: Observación cualitativa global
+            clave_envio: Clave de idempotencia generada al mostrar el formulario
+            
+        Returns:
+            Dict con 'exito' (bool), 'error' (Optional[str]), 'guardadas' (int)
+            y 'duplicado' (bool: True si la clave ya estaba registrada)
+        """
+        if clave_envio:
+            original = EvaluacionModel._envio_registrado(clave_envio)
+            if original is not None:
+                return original
+        
+        if not resultados:
+            return {'exito': False, 'error': "No hay aspectos para registrar", 'guardadas': 0, 'duplicado': False}
+        
+        valido, error = validar_observacion(observacion)
+        if not valido:
+            logger.error(f"Observación inválida: {error}")
+            return {'exito': False, 'error': error, 'guardadas': 0, 'duplicado': False}
+        
+        aspectos_vistos = set()
+        for aspecto_id, resultado in resultados:
+            valido, error = validar_resultado(resultado)
+            if not valido:
+                logger.error(f"Resultado inválido para aspecto {aspecto_id}: {error}")
+                return {'exito': False, 'error': error, 'guardadas': 0, 'duplicado': False}
+            if aspecto_id in aspectos_vistos:
+                return {'exito': False, 'error': f"Aspecto repetido: {aspecto_id}", 'guardadas': 0, 'duplicado': False}
+            aspectos_vistos.add(aspecto_id)
+        
+        # Se ejecuta en el hilo escritor, agrupada con otras escrituras
+        def registrar(cursor: sqlite3.Cursor) -> int:
+            cursor.execute("""
+                INSERT INTO evaluacion_cabecera (usuario_id, codigo_grupo, ficha_id, observacion)
+                VALUES (?, ?, ?, ?)
+            """, (usuario_id, codigo_grupo, ficha_id, observacion))
+            cabecera_id = cursor.lastrowid
+            
+            filas = [(cabecera_id, aspecto_id, resultado) for aspecto_id, resultado in resultados]
+            cursor.executemany("""
+                INSERT INTO evaluacion_detalle (cabecera_id, aspecto_id, resultado)
+                VALUES (?, ?, ?)
+            """, filas)
+            
+            if clave_envio:
+                cursor.execute("""
+                    INSERT INTO envios_evaluacion (clave, cabecera_id, guardadas)
+                    VALUES (?, ?, ?)
+                """, (clave_envio, cabecera_id, len(filas)))
+            
+            cursor.execute("""
+                SELECT
+                    (SELECT username FROM usuarios WHERE id = ?) as username,
+                    (SELECT nombre_propuesta FROM grupos WHERE codigo = ?) as nombre_propuesta,
+                    (SELECT nombre FROM fichas WHERE id = ?) as ficha_nombre
+            """, (usuario_id, codigo_grupo, ficha_id))
+            info = cursor.fetchone()
+            
+            LogModel.registrar_log_con_cursor(
+                cursor,
+                usuario=info['username'],
+                accion="EVALUACION_CREADA",
+                detalle=f"Grupo: {codigo_grupo} - {info['nombre_propuesta']} | Ficha: {info['ficha_nombre']} | {len(filas)} aspectos"
+            )
+            return len(filas)
+        
+        try:
+            guardadas = escritor.ejecutar(registrar)
+            logger.info(f"Evaluación registrada: grupo {codigo_grupo}, ficha {ficha_id}, {guardadas} aspectos")
+            return {'exito': True, 'error': None, 'guardadas': guardadas, 'duplicado': False}
+            
+        except sqlite3.IntegrityError as e:
+            # Otro envío con la misma clave pudo confirmarse entre la búsqueda y el INSERT
+            original = EvaluacionModel._envio_registrado(clave_envio) if clave_envio else None
+            if original is not None:
+                return original
+            logger.warning(f"Evaluación duplicada o inválida para grupo {codigo_grupo}: {e}")
+            return {'exito': False, 'error': "El grupo ya tiene aspectos evaluados por este curador", 'guardadas': 0,
+                    'duplicado': False}
+        except Exception as e:
+            logger.error(f"Error registrando evaluación en lote: {e}")
+            return {'exito': False, 'error': f"Error: {str(e)}", 'guardadas': 0, 'duplicado': False}
+    
+    @staticmethod
+    def _envio_registrado(clave_envio: str) -> Optional[Dict]:
+        """
+        Resultado original de un envío ya registrado con esa clave.
+        
+        Returns:
+            Dict como el de crear_evaluaciones_lote con 'duplicado' = True, o
+            None si la clave no está registrada (o no se pudo consultar)
+        """
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT guardadas FROM envios_evaluacion WHERE clave = ?", (clave_envio,))
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Error consultando envío {clave_envio}: {e}")
+            return None
+        if row is None:
+            return None
+        logger.info(f"Envío repetido ignorado: {clave_envio}")
+        return {'exito': True, 'error': None, 'guardadas': row['guardadas'], 'duplicado': True}
+
+    @staticmethod
+    def eliminar_con_cursor(cursor: sqlite3.Cursor, condicion: str = "1=1", params: tuple = ()) -> int:
+        """
+        Elimina aspectos evaluados usando un cursor existente (misma transacción).
+
+        Borra directamente en evaluacion_detalle porque un DELETE sobre la vista
+        evaluaciones no informa rowcount. Las cabeceras sin aspectos se eliminan
+        por trigger.
+
+        Args:
+            cursor: Cursor de una conexión abierta
+            condicion: Filtro SQL sobre las columnas de la vista evaluaciones
+            params: Parámetros del filtro
+
+        Returns:
+            Número de aspectos eliminados
+        """
+        cursor.execute(f"""
+            DELETE FROM evaluacion_detalle
+            WHERE id IN (SELECT id FROM evaluaciones WHERE {condicion})
+        """, params)
+        return cursor.rowcount
+
+    @staticmethod
+    def obtener_estado(usuario_id: int, codigo_grupo: str, ficha_id: int) -> Optional[Dict]:
+        """
+        Avance del curador en un grupo con una ficha (fila de estado_evaluacion).
+        
+        Returns:
+            Dict con aspectos_esperados, aspectos_calificados, estado
+            ('en_progreso' o 'completa') y completada_en; None si aún no
+            guardó nada (pendiente)
+        """
         try:
             with get_db_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Query optimizada: cuenta aspectos evaluados vs totales en una sola query
                 cursor.execute("""
-                    SELECT 
-                        COUNT(DISTINCT e.aspecto_id) as evaluados,
-                        COUNT(DISTINCT a.id) as totales
-                    FROM ficha_dimensiones fd
-                    JOIN dimensiones d ON fd.dimension_id = d.id
-                    LEFT JOIN aspectos a ON d.id = a.dimension_id
-                    LEFT JOIN evaluaciones e ON e.aspecto_id = a.id 
-                        AND e.usuario_id = ? 
-                        AND e.codigo_grupo = ? 
-                        AND e.ficha_id = ?
-                    WHERE fd.ficha_id = ?
-                """, (usuario_id, codigo_grupo, ficha_id, ficha_id))
-                
+                    SELECT * FROM estado_evaluacion
+                    WHERE usuario_id = ? AND codigo_grupo = ? AND ficha_id = ?
+                """, (usuario_id, codigo_grupo, ficha_id))
                 row = cursor.fetchone()
-                if row:
-                    evaluados = row['evaluados'] or 0
-                    totales = row['totales'] or 0
-                    # Si ha evaluado todos los aspectos de la ficha, la evaluación está completa
-                    return totales > 0 and evaluados >= totales
-                
-                return False
-                
+                return dict(row) if row else None
         except Exception as e:
-            logger.error(f"Error verificando evaluación: {e}")
-            return False
+            logger.error(f"Error obteniendo estado de evaluación: {e}")
+            return None
+    
+    @staticmethod
+    def evaluacion_existe(usuario_id: int, codigo_grupo: str, ficha_id: int) -> bool:
+        """Verifica si ya existe una evaluación completa del usuario para el grupo con esa ficha."""
+        estado = EvaluacionModel.obtener_estado(usuario_id, codigo_grupo, ficha_id)
+        return estado is not None and estado['estado'] == 'completa'
+    
+    @staticmethod
+    def obtener_progreso(usuario_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Avance de las evaluaciones por curador, grupo y ficha.
+        
+        Args:
+            usuario_id: Limitar a un curador (None = todos)
+            
+        Returns:
+            DataFrame con una fila por evaluación iniciada: curador,
+            codigo_grupo, ficha, aspectos_esperados, aspectos_calificados,
+            estado y completada_en
+        """
+        try:
+            with get_db_connection() as conn:
+                return pd.read_sql_query("""
+                    SELECT
+                        e.usuario_id,
+                        u.username as curador,
+                        e.codigo_grupo,
+                        e.ficha_id,
+                        f.nombre as ficha,
+                        e.aspectos_esperados,
+                        e.aspectos_calificados,
+                        e.estado,
+                        e.completada_en
+                    FROM estado_evaluacion e
+                    LEFT JOIN usuarios u ON u.id = e.usuario_id
+                    LEFT JOIN fichas f ON f.id = e.ficha_id
+                    WHERE ? IS NULL OR e.usuario_id = ?
+                    ORDER BY e.usuario_id, e.codigo_grupo
+                """, conn, params=(usuario_id, usuario_id))
+        except Exception as e:
+            logger.error(f"Error obteniendo progreso de evaluaciones: {e}")
+            return pd.DataFrame()
     
     @staticmethod
     def obtener_evaluacion_grupo_usuario(usuario_id: int, codigo_grupo: str) -> List[Dict]:
@@ -1089,68 +1173,205 @@ class EvaluacionModel:
     
     @staticmethod
     def obtener_todas_dataframe() -> pd.DataFrame:
-        """Obtiene todas las evaluaciones en formato DataFrame."""
+        """
+        Obtiene todas las evaluaciones en formato DataFrame.
+        
+        Se lee con el lector columnar y los tipos de TIPOS_EVALUACIONES
+        (cache_evaluaciones): columnas de texto categóricas, resultado int8 y
+        fecha_registro datetime64.
+        """
+        try:
+            with get_db_connection() as conn:
+                return leer_evaluaciones(conn)
+                
+        except Exception as e:
+            logger.error(f"Error obteniendo evaluaciones: {e}")
+            return pd.DataFrame()
+    
+    @staticmethod
+    def obtener_todas_dataframe_incremental() -> pd.DataFrame:
+        """
+        Obtiene todas las evaluaciones desde la caché compartida del proceso.
+        
+        Tras la primera carga sólo se consultan las altas y bajas posteriores,
+        por lo que es apta para llamarse en cada rerun de Streamlit.
+        
+        Returns:
+            DataFrame con las mismas columnas que obtener_todas_dataframe
+        """
+        return cache_evaluaciones.obtener()
+    
+    # Filtros admitidos por buscar() -> condición SQL sobre evaluacion_cabecera c
+    # y evaluacion_detalle d. Todos usan índices salvo resultado.
+    FILTROS_BUSQUEDA = {
+        'resultado': "d.resultado = ?",
+        'usuario_id': "c.usuario_id = ?",
+        'ficha_id': "c.ficha_id = ?",
+        'codigo_grupo': "c.codigo_grupo = ?",
+        'dimension_id': "d.aspecto_id IN (SELECT id FROM aspectos WHERE dimension_id = ?)",
+        'fecha_desde': "c.fecha_registro >= ?",
+        'fecha_hasta': "c.fecha_registro < date(?, '+1 day')",
+        # Una condición por palabra del texto libre: cada palabra debe aparecer
+        # en la evaluación o en el propio aspecto (ver BusquedaModel)
+        'texto': "(c.id IN (SELECT rowid FROM evaluaciones_fts WHERE evaluaciones_fts MATCH ?)"
+                 " OR d.id IN (SELECT rowid FROM aspectos_fts WHERE aspectos_fts MATCH ?))",
+    }
+    
+    @staticmethod
+    def _condiciones_busqueda(filtros: Optional[Dict]) -> Tuple[List[str], List]:
+        """Traduce los filtros de buscar() a condiciones y parámetros SQL."""
+        condiciones, params = [], []
+        for clave, valor in (filtros or {}).items():
+            if clave == 'texto':
+                for termino in BusquedaModel.terminos_fts(valor):
+                    condiciones.append(EvaluacionModel.FILTROS_BUSQUEDA['texto'])
+                    params.extend([termino, termino])
+                continue
+            if valor is None:
+                continue
+            if clave not in EvaluacionModel.FILTROS_BUSQUEDA:
+                raise ValueError(f"Filtro de búsqueda desconocido: {clave}")
+            condiciones.append(EvaluacionModel.FILTROS_BUSQUEDA[clave])
+            params.append(str(valor) if clave.startswith('fecha_') else valor)
+        return condiciones, params
+    
+    @staticmethod
+    def buscar(filtros: Optional[Dict] = None, orden: str = 'desc',
+               cursor: Optional[Tuple[str, int]] = None,
+               limite: Optional[int] = 50) -> Tuple[pd.DataFrame, Optional[Tuple[str, int]]]:
+        """
+        Busca evaluaciones con filtros en SQL y paginación por clave.
+        
+        Las páginas se recorren por (fecha_registro, id): cada página continúa
+        tras la última fila de la anterior, sin OFFSET, por lo que el coste de
+        una página no depende de su posición.
+        
+        Args:
+            filtros: Dict con cualquiera de FILTROS_BUSQUEDA; las fechas se
+                aceptan como date o 'YYYY-MM-DD' (fecha_hasta inclusive)
+            orden: 'desc' (más recientes primero) o 'asc'
+            cursor: Valor devuelto por la página anterior; None para la primera
+            limite: Filas por página; None devuelve todo el resultado (exportar)
+        
+        Returns:
+            Tupla (DataFrame de la página, cursor de la siguiente página o None
+            si no hay más)
+        """
+        try:
+            condiciones, params = EvaluacionModel._condiciones_busqueda(filtros)
+            descendente = orden.lower() != 'asc'
+            if cursor is not None:
+                # Equivale a (c.fecha_registro, d.id) < (?, ?), escrito de modo
+                # que la primera condición recorra idx_eval_cabecera_fecha
+                op = '<' if descendente else '>'
+                condiciones.append(
+                    f"c.fecha_registro {op}= ? AND (c.fecha_registro {op} ? OR d.id {op} ?)"
+                )
+                params.extend([cursor[0], cursor[0], cursor[1]])
+            direccion = "DESC" if descendente else "ASC"
+            
+            query = f"""
+                SELECT
+                    d.id,
+                    u.username as curador,
+                    c.codigo_grupo,
+                    g.nombre_propuesta,
+                    g.modalidad,
+                    f.nombre as ficha,
+                    fg.nombre as ficha_grupo,
+                    dim.nombre as dimension,
+                    a.nombre as aspecto,
+                    d.resultado,
+                    COALESCE(d.observacion, c.observacion) as observacion,
+                    c.fecha_registro
+                FROM evaluacion_cabecera c
+                -- CROSS JOIN fija la cabecera como bucle externo: se recorre en
+                -- orden de fecha por índice y se detiene al completar el LIMIT
+                CROSS JOIN evaluacion_detalle d ON d.cabecera_id = c.id
+                LEFT JOIN usuarios u ON c.usuario_id = u.id
+                LEFT JOIN grupos g ON c.codigo_grupo = g.codigo
+                LEFT JOIN fichas f ON c.ficha_id = f.id
+                LEFT JOIN fichas fg ON g.ficha_id = fg.id
+                JOIN aspectos a ON d.aspecto_id = a.id
+                JOIN dimensiones dim ON a.dimension_id = dim.id
+                {'WHERE ' + ' AND '.join(condiciones) if condiciones else ''}
+                ORDER BY c.fecha_registro {direccion}, d.id {direccion}
+            """
+            if limite is not None:
+                # Una fila extra indica si existe una página siguiente
+                query += " LIMIT ?"
+                params.append(limite + 1)
+            
+            # La fecha se lee como texto para construir el cursor
+            tipos = {**TIPOS_EVALUACIONES, 'fecha_registro': 'object'}
+            with get_db_connection() as conn:
+                df = leer_columnar(conn, query, tuple(params), tipos)
+            
+            siguiente = None
+            if limite is not None and len(df) > limite:
+                df = df.iloc[:limite]
+                ultima = df.iloc[-1]
+                siguiente = (ultima['fecha_registro'], int(ultima['id']))
+            
+            df['fecha_registro'] = pd.to_datetime(df['fecha_registro'], format='ISO8601', errors='coerce')
+            return df, siguiente
+            
+        except Exception as e:
+            logger.error(f"Error buscando evaluaciones: {e}")
+            return pd.DataFrame(), None
+    
+    @staticmethod
+    def contar(filtros: Optional[Dict] = None) -> int:
+        """
+        Cuenta las evaluaciones que cumplen los filtros de buscar().
+        
+        Args:
+            filtros: Mismos filtros que buscar()
+        
+        Returns:
+            Número de aspectos evaluados
+        """
+        try:
+            condiciones, params = EvaluacionModel._condiciones_busqueda(filtros)
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT COUNT(*)
+                    FROM evaluacion_cabecera c
+                    JOIN evaluacion_detalle d ON d.cabecera_id = c.id
+                    JOIN aspectos a ON d.aspecto_id = a.id
+                    JOIN dimensiones dim ON a.dimension_id = dim.id
+                    {'WHERE ' + ' AND '.join(condiciones) if condiciones else ''}
+                """, tuple(params))
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error contando evaluaciones: {e}")
+            return 0
+    
+    @staticmethod
+    def obtener_por_grupo(codigo_grupo: str) -> pd.DataFrame:
+        """Obtiene todas las evaluaciones de un grupo específico."""
         try:
             with get_db_connection() as conn:
                 query = """
                     SELECT 
-                        e.id,
                         u.username as curador,
-                        e.codigo_grupo,
-                        g.nombre_propuesta,
-                        g.modalidad,
-                        g.tipo,
-                        g.naturaleza,
                         f.nombre as ficha,
-                        -- Ficha asociada al grupo (ficha del grupo)
-                        fg.nombre as ficha_grupo,
                         d.nombre as dimension,
                         a.nombre as aspecto,
                         e.resultado,
                         e.observacion,
                         e.fecha_registro
                     FROM evaluaciones e
-                    LEFT JOIN usuarios u ON e.usuario_id = u.id
-                    LEFT JOIN grupos g ON e.codigo_grupo = g.codigo
-                    LEFT JOIN fichas f ON e.ficha_id = f.id
-                    LEFT JOIN fichas fg ON g.ficha_id = fg.id
+                    JOIN usuarios u ON e.usuario_id = u.id
+                    JOIN fichas f ON e.ficha_id = f.id
                     JOIN aspectos a ON e.aspecto_id = a.id
                     JOIN dimensiones d ON a.dimension_id = d.id
-                    ORDER BY e.fecha_registro DESC
+                    WHERE e.codigo_grupo = ?
+                    ORDER BY d.orden, a.orden, u.username
                 """
                 
-                df = pd.read_sql_query(query, conn)
-                return df
-                
-        except Exception as e:
-            logger.error(f"Error obteniendo evaluaciones: {e}")
-            return pd.DataFrame()
-    
-    @staticmethod
-    def obtener_por_grupo(codigo_grupo: str) -> pd.DataFrame:
-        """Obtiene todas las evaluaciones de un grupo específico."""
-        try:
-            with get_db_connection() as conn:
-                query = """
-                    SELECT 
-                        u.username as curador,
-                        f.nombre as ficha,
-                        d.nombre as dimension,
-                        a.nombre as aspecto,
-                        e.resultado,
-                        e.observacion,
-                        e.fecha_registro
-                    FROM evaluaciones e
-                    JOIN usuarios u ON e.usuario_id = u.id
-                    JOIN fichas f ON e.ficha_id = f.id
-                    JOIN aspectos a ON e.aspecto_id = a.id
-                    JOIN dimensiones d ON a.dimension_id = d.id
-                    WHERE e.codigo_grupo = ?
-                    ORDER BY d.orden, a.orden, u.username
-                """
-                
-                df = pd.read_sql_query(query, conn, params=(codigo_grupo,))
-                return df
+                return leer_columnar(conn, query, (codigo_grupo,), TIPOS_EVALUACIONES)
                 
         except Exception as e:
             logger.error(f"Error obteniendo evaluaciones del grupo: {e}")
@@ -1182,8 +1403,7 @@ class EvaluacionModel:
                     ORDER BY e.fecha_registro DESC
                 """
                 
-                df = pd.read_sql_query(query, conn, params=(ficha_id,))
-                return df
+                return leer_columnar(conn, query, (ficha_id,), TIPOS_EVALUACIONES)
                 
         except Exception as e:
             logger.error(f"Error obteniendo evaluaciones de ficha: {e}")
@@ -1191,23 +1411,30 @@ class EvaluacionModel:
     
     @staticmethod
     def obtener_estadisticas_por_ficha() -> pd.DataFrame:
-        """Obtiene estadísticas agregadas por ficha."""
+        """
+        Obtiene estadísticas agregadas por ficha.
+        
+        Se leen de las tablas resumen (una fila por ficha, grupo o curador),
+        sin recorrer las evaluaciones.
+        """
         try:
             with get_db_connection() as conn:
                 query = """
                     SELECT 
                         f.id as ficha_id,
                         f.nombre as ficha,
-                        COUNT(DISTINCT e.codigo_grupo) as grupos_evaluados,
-                        COUNT(DISTINCT e.usuario_id) as curadores,
-                        COUNT(*) as total_evaluaciones,
-                        AVG(e.resultado) as promedio_general,
-                        SUM(CASE WHEN e.resultado = 2 THEN 1 ELSE 0 END) as fortalezas,
-                        SUM(CASE WHEN e.resultado = 1 THEN 1 ELSE 0 END) as oportunidades,
-                        SUM(CASE WHEN e.resultado = 0 THEN 1 ELSE 0 END) as riesgos
-                    FROM evaluaciones e
-                    JOIN fichas f ON e.ficha_id = f.id
-                    GROUP BY f.id, f.nombre
+                        (SELECT COUNT(*) FROM resumen_grupo rg
+                         WHERE rg.ficha_id = r.ficha_id AND rg.conteo > 0) as grupos_evaluados,
+                        (SELECT COUNT(*) FROM resumen_curador rc
+                         WHERE rc.ficha_id = r.ficha_id AND rc.conteo > 0) as curadores,
+                        r.conteo as total_evaluaciones,
+                        CAST(r.suma AS REAL) / r.conteo as promedio_general,
+                        r.n2 as fortalezas,
+                        r.n1 as oportunidades,
+                        r.n0 as riesgos
+                    FROM resumen_ficha r
+                    JOIN fichas f ON r.ficha_id = f.id
+                    WHERE r.conteo > 0
                     ORDER BY promedio_general DESC
                 """
                 
@@ -1220,73 +1447,888 @@ class EvaluacionModel:
 
 
 # ═══════════════════════════════════════════════════════════════════
-# MODELO: Logs
+# MODELO: Borradores de evaluación
 # ═══════════════════════════════════════════════════════════════════
 
-class LogModel:
-    """Operaciones sobre logs del sistema"""
+class BorradorModel:
+    """
+    Formulario a medio llenar de cada curador (tabla evaluacion_borrador).
+    
+    Una fila por (curador, grupo, ficha) que se sobrescribe con un único
+    UPSERT; al registrar la evaluación el trigger trg_borrador_cabecera_insert
+    la elimina en la misma transacción.
+    """
     
     @staticmethod
-    def registrar_log(usuario: str, accion: str, detalle: str = None) -> bool:
-        """Registra una acción en los logs."""
+    def guardar(usuario_id: int, codigo_grupo: str, ficha_id: int,
+                resultados: Dict[int, int], observacion: str) -> bool:
+        """
+        Guarda (o reemplaza) el borrador del curador para un grupo y ficha.
+        
+        Args:
+            usuario_id: ID del curador
+            codigo_grupo: Código del grupo
+            ficha_id: ID de la ficha aplicada
+            resultados: aspecto_id -> resultado de los aspectos ya calificados
+            observacion: Observación escrita hasta el momento
+            
+        Returns:
+            True si se guardó
+        """
+        parametros = (usuario_id, codigo_grupo, ficha_id,
+                      json.dumps({str(a): r for a, r in resultados.items()}), observacion or '')
         try:
-            query = """
-                INSERT INTO logs_sistema (usuario, accion, detalle)
-                VALUES (?, ?, ?)
-            """
-            ejecutar_insert(query, (usuario, accion, detalle))
+            escritor.ejecutar(lambda cursor: cursor.execute("""
+                INSERT INTO evaluacion_borrador (usuario_id, codigo_grupo, ficha_id, resultados, observacion)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (usuario_id, codigo_grupo, ficha_id) DO UPDATE SET
+                    resultados = excluded.resultados,
+                    observacion = excluded.observacion,
+                    actualizado_en = CURRENT_TIMESTAMP
+            """, parametros))
             return True
         except Exception as e:
-            logger.error(f"Error registrando log: {e}")
+            logger.error(f"Error guardando borrador del grupo {codigo_grupo}: {e}")
             return False
     
     @staticmethod
-    def obtener_logs_recientes(limite: int = 100) -> List[Dict]:
-        """Obtiene los logs más recientes."""
+    def obtener(usuario_id: int, codigo_grupo: str, ficha_id: int) -> Optional[Dict]:
+        """
+        Borrador del curador para un grupo y ficha.
+        
+        Returns:
+            Dict con 'resultados' (aspecto_id -> resultado), 'observacion' y
+            'actualizado_en'; None si no hay borrador
+        """
         try:
             with get_db_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT * FROM logs_sistema 
-                    ORDER BY fecha DESC 
-                    LIMIT ?
-                """, (limite,))
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                    SELECT resultados, observacion, actualizado_en FROM evaluacion_borrador
+                    WHERE usuario_id = ? AND codigo_grupo = ? AND ficha_id = ?
+                """, (usuario_id, codigo_grupo, ficha_id))
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                return {
+                    'resultados': {int(a): r for a, r in json.loads(row['resultados']).items()},
+                    'observacion': row['observacion'],
+                    'actualizado_en': row['actualizado_en'],
+                }
         except Exception as e:
-            logger.error(f"Error obteniendo logs: {e}")
+            logger.error(f"Error obteniendo borrador del grupo {codigo_grupo}: {e}")
+            return None
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MODELO: Asignaciones
+# ═══════════════════════════════════════════════════════════════════
+
+class AsignacionModel:
+    """
+    Grupos asignados a cada curador (tabla asignaciones).
+    
+    planificar() reparte los grupos entre los curadores activos; la lista de
+    pendientes de cada curador se lee del índice (usuario_id, orden) cruzado
+    con estado_evaluacion, sin recorrer las evaluaciones.
+    """
+    
+    @staticmethod
+    def _grupos_en_orden(cursor: sqlite3.Cursor) -> List[str]:
+        """
+        Grupos evaluables (con ficha) en orden de presentación: primero los
+        programados por día y posición, después el resto por código.
+        """
+        cursor.execute("""
+            SELECT g.codigo
+            FROM grupos g
+            LEFT JOIN programacion_presentaciones p ON p.codigo_grupo = g.codigo
+            WHERE g.ficha_id IS NOT NULL
+            ORDER BY p.fecha IS NULL, p.fecha, p.posicion, g.codigo
+        """)
+        return [row['codigo'] for row in cursor.fetchall()]
+    
+    @staticmethod
+    def renumerar(cursor: sqlite3.Cursor) -> int:
+        """
+        Vuelve a numerar el orden de las asignaciones según el orden de
+        presentación actual (tras cambiar la programación).
+        
+        Returns:
+            Número de asignaciones cuyo orden cambió
+        """
+        grupos = AsignacionModel._grupos_en_orden(cursor)
+        cursor.executemany("""
+            UPDATE asignaciones SET orden = ?
+            WHERE codigo_grupo = ? AND orden != ?
+        """, [(orden, codigo, orden) for orden, codigo in enumerate(grupos, start=1)])
+        return cursor.rowcount
+    
+    @staticmethod
+    def planificar(curadores_por_grupo: Optional[int] = None,
+                   reemplazar_pendientes: bool = False) -> Dict:
+        """
+        Completa las asignaciones para que cada grupo tenga curadores_por_grupo
+        curadores, equilibrando la carga y sin superar config.max_grupos_por_curador.
+        
+        Las asignaciones existentes y las evaluaciones ya iniciadas cuentan para
+        la cobertura y no se repiten.
+        
+        Args:
+            curadores_por_grupo: Curadores por grupo (None = config.curadores_por_grupo)
+            reemplazar_pendientes: Descartar antes las asignaciones sin evaluación
+                iniciada y repartir de nuevo
+            
+        Returns:
+            Dict con 'exito', 'error', 'asignadas' (nuevas) y 'sin_cubrir'
+            (grupos que no alcanzan la cobertura pedida)
+        """
+        n = curadores_por_grupo or config.curadores_por_grupo
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                
+                if reemplazar_pendientes:
+                    cursor.execute("""
+                        DELETE FROM asignaciones
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM estado_evaluacion e
+                            WHERE e.usuario_id = asignaciones.usuario_id
+                              AND e.codigo_grupo = asignaciones.codigo_grupo
+                        )
+                    """)
+                
+                cursor.execute("SELECT id FROM usuarios WHERE rol = 'curador' AND activo = 1")
+                curadores = [row['id'] for row in cursor.fetchall()]
+                
+                # Parejas ya cubiertas: asignadas o con evaluación iniciada
+                cursor.execute("""
+                    SELECT usuario_id, codigo_grupo FROM asignaciones
+                    UNION
+                    SELECT usuario_id, codigo_grupo FROM estado_evaluacion
+                """)
+                parejas = {(row['usuario_id'], row['codigo_grupo']) for row in cursor.fetchall()}
+                
+                cargas: Dict[int, int] = {}
+                for usuario_id, _ in parejas:
+                    cargas[usuario_id] = cargas.get(usuario_id, 0) + 1
+                
+                cursor.execute("SELECT usuario_id, MAX(orden) AS orden FROM asignaciones GROUP BY usuario_id")
+                ultimos_ordenes = {row['usuario_id']: row['orden'] for row in cursor.fetchall()}
+                
+                grupos = AsignacionModel._grupos_en_orden(cursor)
+                nuevas = repartir_grupos(
+                    grupos, curadores, n, config.max_grupos_por_curador, cargas, parejas, ultimos_ordenes
+                )
+                cursor.executemany("""
+                    INSERT INTO asignaciones (usuario_id, codigo_grupo, orden)
+                    VALUES (?, ?, ?)
+                """, nuevas)
+                
+                cubiertos: Dict[str, int] = {}
+                for _, codigo in parejas:
+                    cubiertos[codigo] = cubiertos.get(codigo, 0) + 1
+                for _, codigo, _ in nuevas:
+                    cubiertos[codigo] = cubiertos.get(codigo, 0) + 1
+                sin_cubrir = sum(1 for codigo in grupos if cubiertos.get(codigo, 0) < n)
+                
+                LogModel.registrar_log_con_cursor(
+                    cursor,
+                    usuario="SISTEMA",
+                    accion="ASIGNACIONES_PLANIFICADAS",
+                    detalle=f"{len(nuevas)} asignaciones nuevas | {n} curadores por grupo | "
+                            f"{len(curadores)} curadores | {sin_cubrir} grupos sin cubrir"
+                )
+            
+            logger.info(f"Asignaciones planificadas: {len(nuevas)} nuevas, {sin_cubrir} grupos sin cubrir")
+            return {'exito': True, 'error': None, 'asignadas': len(nuevas), 'sin_cubrir': sin_cubrir}
+            
+        except Exception as e:
+            logger.error(f"Error planificando asignaciones: {e}")
+            return {'exito': False, 'error': str(e), 'asignadas': 0, 'sin_cubrir': 0}
+    
+    @staticmethod
+    def asignar(usuario_id: int, codigo_grupo: str) -> Tuple[bool, Optional[str]]:
+        """Asigna un grupo a un curador respetando config.max_grupos_por_curador."""
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM asignaciones WHERE usuario_id = ?", (usuario_id,))
+                if cursor.fetchone()[0] >= config.max_grupos_por_curador:
+                    return False, f"El curador ya tiene {config.max_grupos_por_curador} grupos asignados"
+                
+                grupos = AsignacionModel._grupos_en_orden(cursor)
+                if codigo_grupo not in grupos:
+                    return False, "Grupo no encontrado o sin ficha asignada"
+                
+                cursor.execute("""
+                    INSERT OR IGNORE INTO asignaciones (usuario_id, codigo_grupo, orden)
+                    VALUES (?, ?, ?)
+                """, (usuario_id, codigo_grupo, grupos.index(codigo_grupo) + 1))
+                if cursor.rowcount == 0:
+                    return False, "El grupo ya está asignado a este curador"
+                return True, None
+        except Exception as e:
+            logger.error(f"Error asignando grupo: {e}")
+            return False, f"Error: {str(e)}"
+    
+    @staticmethod
+    def obtener_pendientes(usuario_id: int) -> List[Dict]:
+        """
+        Lista de trabajo del curador: grupos asignados sin evaluación completa,
+        en orden de presentación.
+        
+        Returns:
+            Lista de dicts con orden, codigo_grupo, nombre_propuesta, ficha_id,
+            ficha_nombre, estado (None = pendiente), aspectos_calificados y
+            aspectos_esperados
+        """
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT
+                        a.orden,
+                        a.codigo_grupo,
+                        g.nombre_propuesta,
+                        g.ficha_id,
+                        f.nombre as ficha_nombre,
+                        e.estado,
+                        e.aspectos_calificados,
+                        e.aspectos_esperados
+                    FROM asignaciones a
+                    JOIN grupos g ON g.codigo = a.codigo_grupo
+                    LEFT JOIN fichas f ON f.id = g.ficha_id
+                    LEFT JOIN estado_evaluacion e
+                        ON e.usuario_id = a.usuario_id
+                       AND e.codigo_grupo = a.codigo_grupo
+                       AND e.ficha_id = g.ficha_id
+                    WHERE a.usuario_id = ?
+                      AND e.estado IS NOT 'completa'
+                    ORDER BY a.orden
+                """, (usuario_id,))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error obteniendo grupos pendientes: {e}")
             return []
     
     @staticmethod
-    def obtener_logs_por_usuario(username: str, limite: int = 50) -> List[Dict]:
-        """Obtiene los logs de un usuario específico."""
+    def obtener_cargas() -> pd.DataFrame:
+        """
+        Carga de cada curador activo.
+        
+        Returns:
+            DataFrame con curador, asignados, completados y pendientes
+        """
+        try:
+            with get_db_connection() as conn:
+                return pd.read_sql_query("""
+                    SELECT
+                        u.username as curador,
+                        COUNT(a.codigo_grupo) as asignados,
+                        COUNT(CASE WHEN e.estado = 'completa' THEN 1 END) as completados,
+                        COUNT(a.codigo_grupo) - COUNT(CASE WHEN e.estado = 'completa' THEN 1 END) as pendientes
+                    FROM usuarios u
+                    LEFT JOIN asignaciones a ON a.usuario_id = u.id
+                    LEFT JOIN grupos g ON g.codigo = a.codigo_grupo
+                    LEFT JOIN estado_evaluacion e
+                        ON e.usuario_id = a.usuario_id
+                       AND e.codigo_grupo = a.codigo_grupo
+                       AND e.ficha_id = g.ficha_id
+                    WHERE u.rol = 'curador' AND u.activo = 1
+                    GROUP BY u.id
+                    ORDER BY u.username
+                """, conn)
+        except Exception as e:
+            logger.error(f"Error obteniendo cargas de curadores: {e}")
+            return pd.DataFrame()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MODELO: Programación de presentaciones
+# ═══════════════════════════════════════════════════════════════════
+
+class ProgramacionModel:
+    """Cola de presentaciones de cada día del evento (tabla programacion_presentaciones)"""
+    
+    @staticmethod
+    def establecer_dia(fecha: str, codigos: List[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Reemplaza la programación de un día.
+        
+        Args:
+            fecha: Día del evento (YYYY-MM-DD)
+            codigos: Códigos de grupo en orden de presentación. Si alguno
+                estaba programado otro día, se mueve a este. Las asignaciones
+                existentes se renumeran con el nuevo orden
+            
+        Returns:
+            Tupla (exito, mensaje_error)
+        """
+        codigos = [str(c).strip().upper() for c in codigos if str(c).strip()]
+        repetidos = sorted({c for c in codigos if codigos.count(c) > 1})
+        if repetidos:
+            return False, f"Códigos repetidos: {', '.join(repetidos)}"
+        
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT codigo FROM grupos")
+                existentes = {row['codigo'] for row in cursor.fetchall()}
+                desconocidos = [c for c in codigos if c not in existentes]
+                if desconocidos:
+                    return False, f"Grupos no encontrados: {', '.join(desconocidos)}"
+                
+                cursor.execute("DELETE FROM programacion_presentaciones WHERE fecha = ?", (fecha,))
+                cursor.executemany(
+                    "DELETE FROM programacion_presentaciones WHERE codigo_grupo = ?",
+                    [(c,) for c in codigos]
+                )
+                cursor.executemany("""
+                    INSERT INTO programacion_presentaciones (fecha, posicion, codigo_grupo)
+                    VALUES (?, ?, ?)
+                """, [(fecha, posicion, c) for posicion, c in enumerate(codigos, start=1)])
+                
+                # Las listas de pendientes se leen por asignaciones.orden
+                AsignacionModel.renumerar(cursor)
+                
+                LogModel.registrar_log_con_cursor(
+                    cursor,
+                    usuario="SISTEMA",
+                    accion="PROGRAMACION_ACTUALIZADA",
+                    detalle=f"{fecha}: {len(codigos)} presentaciones"
+                )
+            
+            logger.info(f"Programación del {fecha}: {len(codigos)} presentaciones")
+            return True, None
+        except Exception as e:
+            logger.error(f"Error guardando programación: {e}")
+            return False, f"Error: {str(e)}"
+    
+    @staticmethod
+    def obtener_dia(fecha: str) -> List[Dict]:
+        """Presentaciones de un día en orden (posicion, codigo_grupo, nombre_propuesta)."""
         try:
             with get_db_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT * FROM logs_sistema 
-                    WHERE usuario = ?
-                    ORDER BY fecha DESC 
+                    SELECT p.posicion, p.codigo_grupo, g.nombre_propuesta
+                    FROM programacion_presentaciones p
+                    LEFT JOIN grupos g ON g.codigo = p.codigo_grupo
+                    WHERE p.fecha = ?
+                    ORDER BY p.posicion
+                """, (fecha,))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error obteniendo programación: {e}")
+            return []
+    
+    @staticmethod
+    def obtener_fechas() -> List[str]:
+        """Días con presentaciones programadas."""
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT DISTINCT fecha FROM programacion_presentaciones ORDER BY fecha")
+                return [row['fecha'] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error obteniendo días programados: {e}")
+            return []
+    
+    @staticmethod
+    def siguientes(codigo_grupo: str, cantidad: int) -> List[str]:
+        """
+        Grupos que se presentan después de uno dado el mismo día.
+        
+        Args:
+            codigo_grupo: Grupo de referencia (normalmente el que se acaba de evaluar)
+            cantidad: Máximo de grupos
+            
+        Returns:
+            Códigos en orden de presentación (vacío si el grupo no está programado)
+        """
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT p.codigo_grupo
+                    FROM programacion_presentaciones actual
+                    JOIN programacion_presentaciones p
+                        ON p.fecha = actual.fecha AND p.posicion > actual.posicion
+                    WHERE actual.codigo_grupo = ?
+                    ORDER BY p.posicion
                     LIMIT ?
-                """, (username, limite))
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+                """, (codigo_grupo, cantidad))
+                return [row['codigo_grupo'] for row in cursor.fetchall()]
         except Exception as e:
-            logger.error(f"Error obteniendo logs de usuario: {e}")
+            logger.error(f"Error obteniendo siguientes presentaciones: {e}")
             return []
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MODELO: Resúmenes de puntuación
+# ═══════════════════════════════════════════════════════════════════
+
+class ResumenModel:
+    """
+    Lecturas sobre las tablas resumen (resumen_grupo, resumen_ficha...).
+    
+    Los triggers de evaluacion_detalle las mantienen al día, por lo que el
+    coste de estas consultas depende del número de grupos, no del de
+    evaluaciones. Para recalcularlas: scripts/reconstruir_resumenes.py
+    """
     
     @staticmethod
-    def obtener_logs_dataframe(limite: int = 500) -> pd.DataFrame:
-        """Obtiene logs en formato DataFrame."""
+    def obtener_kpis() -> Dict:
+        """
+        Obtiene los indicadores globales del dashboard.
+        
+        Returns:
+            Dict con total_evaluaciones, curadores_activos, grupos_evaluados,
+            suma, fortalezas, oportunidades y riesgos
+        """
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT
+                        COALESCE(SUM(conteo), 0) as total_evaluaciones,
+                        COALESCE(SUM(suma), 0) as suma,
+                        COALESCE(SUM(n2), 0) as fortalezas,
+                        COALESCE(SUM(n1), 0) as oportunidades,
+                        COALESCE(SUM(n0), 0) as riesgos,
+                        (SELECT COUNT(DISTINCT usuario_id) FROM resumen_curador
+                         WHERE conteo > 0) as curadores_activos,
+                        (SELECT COUNT(DISTINCT codigo_grupo) FROM resumen_grupo
+                         WHERE conteo > 0) as grupos_evaluados
+                    FROM resumen_ficha
+                """)
+                return dict(cursor.fetchone())
+        except Exception as e:
+            logger.error(f"Error obteniendo KPIs: {e}")
+            return {
+                'total_evaluaciones': 0, 'suma': 0, 'fortalezas': 0,
+                'oportunidades': 0, 'riesgos': 0,
+                'curadores_activos': 0, 'grupos_evaluados': 0
+            }
+    
+    @staticmethod
+    def obtener_promedios_por_grupo(ficha_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Obtiene el promedio de cada grupo evaluado.
+        
+        Args:
+            ficha_id: Si se indica, sólo los grupos evaluados con esa ficha
+        
+        Returns:
+            DataFrame con codigo_grupo, nombre_propuesta, ficha, promedio,
+            evaluaciones, fortalezas, oportunidades y riesgos
+        """
         try:
             with get_db_connection() as conn:
                 query = """
-                    SELECT * FROM logs_sistema 
-                    ORDER BY fecha DESC 
+                    SELECT
+                        r.codigo_grupo,
+                        g.nombre_propuesta,
+                        f.nombre as ficha,
+                        CAST(r.suma AS REAL) / r.conteo as promedio,
+                        r.conteo as evaluaciones,
+                        r.n2 as fortalezas,
+                        r.n1 as oportunidades,
+                        r.n0 as riesgos
+                    FROM resumen_grupo r
+                    JOIN grupos g ON r.codigo_grupo = g.codigo
+                    JOIN fichas f ON r.ficha_id = f.id
+                    WHERE r.conteo > 0
+                """
+                params = ()
+                if ficha_id is not None:
+                    query += " AND r.ficha_id = ?"
+                    params = (ficha_id,)
+                query += " ORDER BY r.codigo_grupo, g.nombre_propuesta, f.nombre"
+                
+                return pd.read_sql_query(query, conn, params=params)
+        except Exception as e:
+            logger.error(f"Error obteniendo promedios por grupo: {e}")
+            return pd.DataFrame()
+    
+    @staticmethod
+    def obtener_ranking_grupos(limite: int = 10, ficha_id: Optional[int] = None,
+                               ascendente: bool = False) -> pd.DataFrame:
+        """
+        Obtiene los grupos con mejor (o peor) promedio.
+        
+        Args:
+            limite: Número máximo de grupos
+            ficha_id: Si se indica, sólo los grupos evaluados con esa ficha
+            ascendente: True para obtener los de menor promedio
+        
+        Returns:
+            DataFrame con posicion, codigo_grupo, nombre_propuesta, ficha y promedio
+        """
+        try:
+            orden = "ASC" if ascendente else "DESC"
+            with get_db_connection() as conn:
+                query = f"""
+                    SELECT
+                        r.codigo_grupo,
+                        g.nombre_propuesta,
+                        f.nombre as ficha,
+                        CAST(r.suma AS REAL) / r.conteo as promedio
+                    FROM resumen_grupo r
+                    JOIN grupos g ON r.codigo_grupo = g.codigo
+                    JOIN fichas f ON r.ficha_id = f.id
+                    WHERE r.conteo > 0 AND (? IS NULL OR r.ficha_id = ?)
+                    ORDER BY promedio {orden}, r.codigo_grupo
                     LIMIT ?
                 """
-                df = pd.read_sql_query(query, conn, params=(limite,))
+                df = pd.read_sql_query(query, conn, params=(ficha_id, ficha_id, limite))
+                df.insert(0, 'posicion', range(1, len(df) + 1))
+                return df
+        except Exception as e:
+            logger.error(f"Error obteniendo ranking de grupos: {e}")
+            return pd.DataFrame()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MODELO: Búsqueda de texto
+# ═══════════════════════════════════════════════════════════════════
+
+class BusquedaModel:
+    """
+    Búsqueda de texto completo sobre los índices evaluaciones_fts (una fila
+    por evaluación) y aspectos_fts (una fila por aspecto evaluado).
+
+    Cada palabra escrita se busca como prefijo ('patri' encuentra
+    'patrimonio') sin distinguir mayúsculas ni tildes, y los resultados se
+    ordenan por relevancia (BM25). Una evaluación coincide si cada palabra
+    aparece en su observación, propuesta o curador, o en alguno de sus aspectos.
+    """
+
+    # Marcas de las coincidencias en fragmentos y nombres (negrita en Markdown)
+    MARCA_INICIO = '**'
+    MARCA_FIN = '**'
+
+    # Peso BM25 de cada columna de evaluaciones_fts: observacion,
+    # nombre_propuesta, codigo_grupo, curador
+    PESOS = (1.0, 3.0, 3.0, 2.0)
+
+    # Peso BM25 de cada columna de aspectos_fts: observacion, dimension, aspecto
+    PESOS_ASPECTOS = (1.0, 1.0, 1.0)
+
+    @staticmethod
+    def terminos_fts(texto: str) -> List[str]:
+        """
+        Una consulta MATCH de FTS5 por palabra del texto, como prefijo.
+
+        Sólo se conservan las palabras (letras y dígitos), de modo que comillas,
+        guiones u operadores no pueden producir errores de sintaxis.
+        """
+        return [f'"{palabra}"*' for palabra in re.findall(r'\w+', texto or '')]
+
+    @staticmethod
+    def consulta_fts(texto: str, columnas: Optional[Tuple[str, ...]] = None) -> Optional[str]:
+        """
+        Convierte el texto escrito por el usuario en una consulta MATCH de FTS5.
+
+        Args:
+            texto: Texto libre
+            columnas: Si se indica, restringe la búsqueda a esas columnas
+
+        Returns:
+            Consulta con todas las palabras como prefijos, o None si no hay palabras
+        """
+        terminos = BusquedaModel.terminos_fts(texto)
+        if not terminos:
+            return None
+        consulta = ' '.join(terminos)
+        if columnas:
+            consulta = f"{{{' '.join(columnas)}}} : ({consulta})"
+        return consulta
+
+    @staticmethod
+    def buscar(texto: str, limite: int = 20) -> pd.DataFrame:
+        """
+        Busca evaluaciones por observación, propuesta, curador, dimensión o aspecto.
+
+        Cada palabra puede coincidir en la evaluación o en cualquiera de sus
+        aspectos; la relevancia suma la mejor coincidencia de cada palabra.
+
+        Args:
+            texto: Texto a buscar
+            limite: Máximo de evaluaciones devueltas
+
+        Returns:
+            DataFrame ordenado por relevancia con cabecera_id, codigo_grupo,
+            nombre_propuesta, curador, ficha, fecha_registro, fragmento (texto
+            con las coincidencias resaltadas), aspectos (aspectos cuyos textos
+            coinciden con alguna palabra) y relevancia
+        """
+        terminos = BusquedaModel.terminos_fts(texto)
+        if not terminos:
+            return pd.DataFrame()
+
+        pesos = ', '.join(map(str, BusquedaModel.PESOS))
+        pesos_aspectos = ', '.join(map(str, BusquedaModel.PESOS_ASPECTOS))
+        # MATERIALIZED impide que SQLite funda las subconsultas con los
+        # GROUP BY, donde bm25() no está permitida
+        por_palabra = [f"""
+                    palabra{i} AS MATERIALIZED (
+                        SELECT rowid AS cabecera_id, bm25(evaluaciones_fts, {pesos}) AS rango
+                        FROM evaluaciones_fts
+                        WHERE evaluaciones_fts MATCH :termino{i}
+                        UNION ALL
+                        SELECT d.cabecera_id, bm25(aspectos_fts, {pesos_aspectos})
+                        FROM aspectos_fts
+                        JOIN evaluacion_detalle d ON d.id = aspectos_fts.rowid
+                        WHERE aspectos_fts MATCH :termino{i}
+                    ),
+                    mejor{i} AS (
+                        SELECT cabecera_id, MIN(rango) AS rango FROM palabra{i} GROUP BY cabecera_id
+                    )""" for i in range(len(terminos))]
+        rango = ' + '.join(f"mejor{i}.rango" for i in range(len(terminos)))
+        uniones = ''.join(
+            f"\n                        JOIN mejor{i} USING (cabecera_id)" for i in range(1, len(terminos))
+        )
+
+        try:
+            with get_db_connection() as conn:
+                query = f"""
+                    WITH{','.join(por_palabra)},
+                    mejores AS MATERIALIZED (
+                        SELECT cabecera_id, {rango} AS rango
+                        FROM mejor0{uniones}
+                        ORDER BY rango, cabecera_id DESC
+                        LIMIT :limite
+                    ),
+                    -- Aspectos que coinciden con alguna palabra, sólo de las
+                    -- evaluaciones devueltas (un único recorrido del índice)
+                    aspectos_coincidentes AS MATERIALIZED (
+                        SELECT d.cabecera_id, aspectos_fts.rowid AS id,
+                               bm25(aspectos_fts, {pesos_aspectos}) AS rango
+                        FROM aspectos_fts
+                        JOIN evaluacion_detalle d ON d.id = aspectos_fts.rowid
+                        WHERE aspectos_fts MATCH :alguna
+                          AND d.cabecera_id IN (SELECT cabecera_id FROM mejores)
+                    ),
+                    por_evaluacion AS (
+                        -- Con MIN, SQLite toma id de la fila de mejor rango
+                        SELECT cabecera_id, id, MIN(rango) AS rango, COUNT(*) AS aspectos
+                        FROM aspectos_coincidentes
+                        GROUP BY cabecera_id
+                    )
+                    SELECT
+                        b.cabecera_id,
+                        c.codigo_grupo,
+                        g.nombre_propuesta,
+                        u.username as curador,
+                        f.nombre as ficha,
+                        c.fecha_registro,
+                        -- Los fragmentos sólo se generan para las filas devueltas:
+                        -- el de la evaluación o, si no coincide, el de su mejor aspecto
+                        COALESCE(
+                            (SELECT snippet(evaluaciones_fts, -1, :inicio, :fin, '…', 16)
+                             FROM evaluaciones_fts
+                             WHERE evaluaciones_fts MATCH :alguna AND rowid = b.cabecera_id),
+                            (SELECT snippet(aspectos_fts, -1, :inicio, :fin, '…', 16)
+                             FROM aspectos_fts
+                             WHERE aspectos_fts MATCH :alguna AND rowid = pe.id)
+                        ) as fragmento,
+                        COALESCE(pe.aspectos, 0) as aspectos,
+                        -b.rango as relevancia
+                    FROM mejores b
+                    JOIN evaluacion_cabecera c ON c.id = b.cabecera_id
+                    LEFT JOIN por_evaluacion pe ON pe.cabecera_id = b.cabecera_id
+                    LEFT JOIN grupos g ON c.codigo_grupo = g.codigo
+                    LEFT JOIN usuarios u ON c.usuario_id = u.id
+                    LEFT JOIN fichas f ON c.ficha_id = f.id
+                    ORDER BY b.rango, b.cabecera_id DESC
+                """
+                params = {f'termino{i}': termino for i, termino in enumerate(terminos)}
+                df = pd.read_sql_query(query, conn, params={
+                    **params, 'alguna': ' OR '.join(terminos), 'limite': limite,
+                    'inicio': BusquedaModel.MARCA_INICIO, 'fin': BusquedaModel.MARCA_FIN,
+                })
+                df['fecha_registro'] = pd.to_datetime(df['fecha_registro'], format='ISO8601', errors='coerce')
                 return df
         except Exception as e:
-            logger.error(f"Error obteniendo DataFrame de logs: {e}")
+            logger.error(f"Error en la búsqueda de texto: {e}")
+            return pd.DataFrame()
+
+    @staticmethod
+    def buscar_grupos(texto: str, limite: int = 10) -> pd.DataFrame:
+        """
+        Busca grupos evaluados por código o nombre de la propuesta.
+
+        Args:
+            texto: Código o palabras del nombre (se aceptan prefijos)
+            limite: Máximo de grupos devueltos
+
+        Returns:
+            DataFrame ordenado por relevancia con codigo_grupo,
+            nombre_propuesta, nombre_resaltado y relevancia
+        """
+        consulta = BusquedaModel.consulta_fts(texto, ('nombre_propuesta', 'codigo_grupo'))
+        if consulta is None:
+            return pd.DataFrame()
+
+        try:
+            with get_db_connection() as conn:
+                query = """
+                    WITH coincidencias AS MATERIALIZED (
+                        SELECT
+                            codigo_grupo,
+                            highlight(evaluaciones_fts, 1, :inicio, :fin) AS nombre_resaltado,
+                            rank AS rango
+                        FROM evaluaciones_fts
+                        WHERE evaluaciones_fts MATCH :consulta
+                    )
+                    SELECT
+                        m.codigo_grupo,
+                        g.nombre_propuesta,
+                        m.nombre_resaltado,
+                        -MIN(m.rango) as relevancia
+                    FROM coincidencias m
+                    LEFT JOIN grupos g ON m.codigo_grupo = g.codigo
+                    GROUP BY m.codigo_grupo
+                    ORDER BY MIN(m.rango), m.codigo_grupo
+                    LIMIT :limite
+                """
+                return pd.read_sql_query(query, conn, params={
+                    'consulta': consulta, 'limite': limite,
+                    'inicio': BusquedaModel.MARCA_INICIO, 'fin': BusquedaModel.MARCA_FIN,
+                })
+        except Exception as e:
+            logger.error(f"Error buscando grupos: {e}")
             return pd.DataFrame()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MODELO: Logs
+# ═══════════════════════════════════════════════════════════════════
+
+class LogModel:
+    """Operaciones sobre logs del sistema"""
+    
+    @staticmethod
+    def registrar_log(usuario: str, accion: str, detalle: str = None) -> bool:
+        """
+        Registra una acción en los logs sin esperar a la base de datos: el
+        evento queda en el buffer de auditoría y se escribe en el siguiente
+        volcado (ver src.database.auditoria).
+        
+        Returns:
+            True si se encoló, False si se descartó por buffer lleno
+        """
+        return auditoria.registrar(usuario, accion, detalle)
+    
+    @staticmethod
+    def registrar_log_con_cursor(cursor: sqlite3.Cursor, usuario: str, accion: str, detalle: str = None) -> None:
+        """Registra una acción en los logs dentro de una transacción ya abierta."""
+        cursor.execute("""
+            INSERT INTO logs_sistema (usuario, accion, detalle)
+            VALUES (?, ?, ?)
+        """, (usuario, accion, detalle))
+    
+    @staticmethod
+    def _sql_logs(condicion: str, params: tuple, limite: int, con_archivo: bool) -> Tuple[str, tuple]:
+        """
+        Consulta de los logs más recientes que cumplen la condición.
+        
+        Con con_archivo (base de archivo adjunta) une los de logs_sistema y los
+        archivados; cada parte se limita antes de unirlas y del archivo se
+        descartan los id que siguen en la tabla principal (lote a medio mover).
+        
+        Returns:
+            (SQL, parámetros)
+        """
+        if not con_archivo:
+            return f"""
+                SELECT * FROM logs_sistema
+                WHERE {condicion}
+                ORDER BY fecha DESC
+                LIMIT ?
+            """, params + (limite,)
+        return f"""
+            SELECT * FROM (
+                SELECT * FROM (
+                    SELECT * FROM main.logs_sistema
+                    WHERE {condicion}
+                    ORDER BY fecha DESC LIMIT ?
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT * FROM {ESQUEMA_ARCHIVO}.logs_sistema a
+                    WHERE {condicion}
+                      AND NOT EXISTS (SELECT 1 FROM main.logs_sistema h WHERE h.id = a.id)
+                    ORDER BY fecha DESC LIMIT ?
+                )
+            )
+            ORDER BY fecha DESC
+            LIMIT ?
+        """, params + (limite,) + params + (limite, limite)
+    
+    @staticmethod
+    def consultar_logs(usuario: Optional[str] = None, accion: Optional[str] = None,
+                       desde: Optional[str] = None, hasta: Optional[str] = None,
+                       limite: int = 500, incluir_archivo: bool = False) -> List[Dict]:
+        """
+        Logs más recientes con filtros opcionales.
+        
+        Args:
+            usuario: Sólo los de este usuario
+            accion: Sólo los de esta acción
+            desde: Fecha mínima inclusive ('AAAA-MM-DD' o 'AAAA-MM-DD HH:MM:SS', UTC)
+            hasta: Fecha máxima exclusive (mismo formato)
+            limite: Máximo de filas
+            incluir_archivo: Buscar también en los logs archivados (ver
+                src.database.archivo_logs)
+            
+        Returns:
+            Lista de dicts ordenada por fecha descendente
+        """
+        filtros = [('usuario = ?', usuario), ('accion = ?', accion), ('fecha >= ?', desde), ('fecha < ?', hasta)]
+        condicion = " AND ".join([sql for sql, valor in filtros if valor is not None] or ["1=1"])
+        params = tuple(valor for _, valor in filtros if valor is not None)
+        
+        # Incluir los eventos que siguen en el buffer
+        auditoria.vaciar()
+        try:
+            with get_db_connection() as conn:
+                with con_archivo(conn) if incluir_archivo else nullcontext(False) as adjunto:
+                    query, parametros = LogModel._sql_logs(condicion, params, limite, adjunto)
+                    rows = conn.execute(query, parametros).fetchall()
+                return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error consultando logs: {e}")
+            return []
+    
+    @staticmethod
+    def obtener_logs_recientes(limite: int = 100, incluir_archivo: bool = False) -> List[Dict]:
+        """Obtiene los logs más recientes."""
+        return LogModel.consultar_logs(limite=limite, incluir_archivo=incluir_archivo)
+    
+    @staticmethod
+    def obtener_logs_por_usuario(username: str, limite: int = 50, incluir_archivo: bool = False) -> List[Dict]:
+        """Obtiene los logs de un usuario específico."""
+        return LogModel.consultar_logs(usuario=username, limite=limite, incluir_archivo=incluir_archivo)
+    
+    @staticmethod
+    def obtener_logs_dataframe(limite: int = 500, incluir_archivo: bool = False) -> pd.DataFrame:
+        """Obtiene logs en formato DataFrame."""
+        logs = LogModel.consultar_logs(limite=limite, incluir_archivo=incluir_archivo)
+        return pd.DataFrame(logs, columns=['id', 'usuario', 'accion', 'detalle', 'fecha'])
+    
+    @staticmethod
+    def archivar_antiguos(dias: Optional[int] = None) -> int:
+        """
+        Mueve a la base de archivo los logs fuera de la ventana de retención.
+        
+        Args:
+            dias: Días que se conservan (None = config.log_retencion_dias)
+            
+        Returns:
+            Número de eventos archivados (-1 si hubo un error)
+        """
+        auditoria.vaciar()
+        return archivar_logs(dias)
@@ -8,6 +8,7 @@ import altair as alt
 import numpy as np
 from .utils import estado_patrimonial
 from src.config import config
+from src.database.models import ResumenModel
 
 
 def mostrar_dashboard(df_eval: pd.DataFrame):
@@ -25,11 +26,11 @@ def mostrar_dashboard(df_eval: pd.DataFrame):
     if 'ficha' not in df_eval.columns and 'ficha_grupo' in df_eval.columns:
         df_eval['ficha'] = df_eval['ficha_grupo']
     
-    # Calcular promedios por grupo (promedio de TODOS los aspectos evaluados)
-    # Usar 'ficha' en lugar de 'modalidad'
-    df_promedios = (df_eval
-        .groupby(['codigo_grupo', 'nombre_propuesta', 'ficha'], as_index=False)
-        .agg(promedio_final=('resultado', 'mean'))
+    # Promedios por grupo (promedio de TODOS los aspectos evaluados), leídos
+    # de las tablas resumen. Usar 'ficha' en lugar de 'modalidad'
+    df_promedios = (ResumenModel.obtener_promedios_por_grupo()
+        .reindex(columns=['codigo_grupo', 'nombre_propuesta', 'ficha', 'promedio'])
+        .rename(columns={'promedio': 'promedio_final'})
         .dropna(subset=['promedio_final'])
     )
     
@@ -45,9 +46,10 @@ def mostrar_dashboard(df_eval: pd.DataFrame):
     st.markdown("---")
     st.subheader("📈 Métricas Clave")
     
-    total_evaluaciones = len(df_eval)
-    curadores_activos = df_eval['curador'].nunique()
-    grupos_evaluados = df_promedios['codigo_grupo'].nunique()
+    kpis = ResumenModel.obtener_kpis()
+    total_evaluaciones = kpis['total_evaluaciones']
+    curadores_activos = kpis['curadores_activos']
+    grupos_evaluados = kpis['grupos_evaluados']
     promedio_general = df_promedios['promedio_final'].mean()
     desviacion_std = df_promedios['promedio_final'].std()
     
@@ -1,81 +1,217 @@
-import pandas as pd
+"""
+Vista de Evaluaciones Detalladas del comité
+Los filtros se aplican en SQL y la tabla se pagina por clave (fecha_registro, id):
+cada rerun sólo lee y envía al navegador una página de filas. La búsqueda de
+texto usa los índices FTS5 evaluaciones_fts y aspectos_fts.
+"""
 import streamlit as st
-import altair as alt
 import pandas as pd
+from io import BytesIO
+from src.database.models import EvaluacionModel, BusquedaModel, UsuarioModel, FichaModel, DimensionModel
+
+# Claves de st.session_state de esta vista
+_CLAVE_CURSORES = "eval_detalladas_cursores"
+_CLAVE_FILTROS = "eval_detalladas_filtros"
+_CLAVE_EXPORTACION = "eval_detalladas_exportacion"
+
+COLUMNAS_TABLA = [
+    'curador', 'codigo_grupo', 'nombre_propuesta', 'ficha_grupo',
+    'modalidad', 'dimension', 'aspecto', 'resultado_emoji',
+    'observacion', 'fecha_registro'
+]
+
+
+def _selector(etiqueta: str, opciones: dict, key: str):
+    """Selectbox con opción 'Todos'; devuelve el valor asociado o None."""
+    seleccion = st.selectbox(etiqueta, ["Todos"] + list(opciones), key=key)
+    return opciones.get(seleccion)
+
+
+def _leer_filtros() -> dict:
+    """Dibuja los controles de filtro y devuelve los filtros de EvaluacionModel.buscar."""
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        resultado = _selector(
+            "Resultado",
+            {"🟢 Fortaleza (2)": 2, "🟡 Oportunidad (1)": 1, "🔴 Riesgo (0)": 0},
+            key="eval_det_resultado"
+        )
+    with col2:
+        usuario_id = _selector(
+            "Curador",
+            {u['username']: u['id'] for u in UsuarioModel.obtener_todos(incluir_inactivos=True)},
+            key="eval_det_curador"
+        )
+    with col3:
+        ficha_id = _selector(
+            "Ficha",
+            {f['nombre']: f['id'] for f in FichaModel.obtener_todas()},
+            key="eval_det_ficha"
+        )
+    with col4:
+        dimension_id = _selector(
+            "Dimensión",
+            {d['nombre']: d['id'] for d in DimensionModel.obtener_todas()},
+            key="eval_det_dimension"
+        )
+
+    col5, col6, col7, col8 = st.columns([3, 1, 2, 1])
+    with col5:
+        texto = st.text_input(
+            "🔍 Buscar",
+            placeholder="Observación, propuesta, curador, dimensión o aspecto",
+            help="Busca palabras o inicios de palabra, sin distinguir mayúsculas ni tildes",
+            key="eval_det_texto"
+        )
+    with col6:
+        codigo_grupo = st.text_input("Código de grupo", placeholder="Ej: P001", key="eval_det_grupo")
+    with col7:
+        rango = st.date_input("Rango de fechas", value=(), key="eval_det_fechas")
+    with col8:
+        st.selectbox("Filas por página", [25, 50, 100, 200], index=1, key="eval_det_limite")
+
+    fecha_desde = rango[0] if len(rango) > 0 else None
+    fecha_hasta = rango[1] if len(rango) > 1 else None
+
+    return {
+        'resultado': resultado,
+        'usuario_id': usuario_id,
+        'ficha_id': ficha_id,
+        'dimension_id': dimension_id,
+        'codigo_grupo': codigo_grupo.strip().upper() or None,
+        'fecha_desde': fecha_desde,
+        'fecha_hasta': fecha_hasta,
+        'texto': texto.strip() or None,
+    }
+
+
+def _mostrar_coincidencias(texto: str) -> None:
+    """Evaluaciones más relevantes para el texto buscado, con las coincidencias resaltadas."""
+    df = BusquedaModel.buscar(texto, limite=10)
+    if df.empty:
+        return
 
+    with st.expander(f"🎯 Coincidencias más relevantes para «{texto}»", expanded=True):
+        for _, fila in df.iterrows():
+            st.markdown(
+                f"**{fila['codigo_grupo']}** · {fila['nombre_propuesta']} · {fila['curador']} "
+                f"· {fila['ficha']} · {fila['fecha_registro']:%d/%m/%Y}  \n"
+                f"{fila['fragmento']}"
+            )
+            if fila['aspectos']:
+                st.caption(f"{fila['aspectos']} aspecto(s) coinciden")
 
-def mostrar_evaluaciones_detalladas(df_eval: pd.DataFrame) -> None:
+
+def _reiniciar_paginacion_si_cambian(filtros: dict, limite: int) -> None:
+    """Vuelve a la primera página cuando cambian los filtros o el tamaño de página."""
+    firma = (tuple(sorted((k, str(v)) for k, v in filtros.items())), limite)
+    if st.session_state.get(_CLAVE_FILTROS) != firma:
+        st.session_state[_CLAVE_FILTROS] = firma
+        st.session_state[_CLAVE_CURSORES] = [None]
+        st.session_state.pop(_CLAVE_EXPORTACION, None)
+
+
+def _pagina_siguiente(cursor) -> None:
+    st.session_state[_CLAVE_CURSORES].append(cursor)
+
+
+def _pagina_anterior() -> None:
+    if len(st.session_state[_CLAVE_CURSORES]) > 1:
+        st.session_state[_CLAVE_CURSORES].pop()
+
+
+def _preparar_exportacion(filtros: dict) -> None:
+    """Lee el resultado completo (sin paginar) y genera los archivos a descargar."""
+    df, _ = EvaluacionModel.buscar(filtros, limite=None)
+    df_exportar = df.drop(columns=['id'])
+
+    excel_buffer = BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+        df_exportar.to_excel(writer, sheet_name='Evaluaciones', index=False)
+
+    st.session_state[_CLAVE_EXPORTACION] = {
+        'filas': len(df_exportar),
+        'excel': excel_buffer.getvalue(),
+        'csv': df_exportar.to_csv(index=False),
+        'marca': pd.Timestamp.now().strftime('%Y%m%d_%H%M%S'),
+    }
+
+
+def mostrar_evaluaciones_detalladas() -> None:
     """Tabla detallada de todas las evaluaciones"""
 
     st.header("📋 Evaluaciones Detalladas")
     st.caption("Vista completa de todas las evaluaciones por aspecto")
 
-    # Opciones de visualización
-    col_opt1, col_opt2, col_opt3 = st.columns([3, 1, 1])
+    filtros = _leer_filtros()
+    limite = st.session_state.get("eval_det_limite", 50)
+    _reiniciar_paginacion_si_cambian(filtros, limite)
 
-    with col_opt1:
-        buscar = st.text_input(
-            "🔍 Buscar",
-            placeholder="Buscar por grupo, curador, dimensión o aspecto...",
-        )
+    if filtros['texto']:
+        _mostrar_coincidencias(filtros['texto'])
 
-    with col_opt2:
-        st.markdown("<br>", unsafe_allow_html=True)
-        filtro_resultado = st.selectbox(
-            "Filtrar por resultado",
-            ["Todos", "🟢 Fortaleza (2)", "🟡 Oportunidad (1)", "🔴 Riesgo (0)"]
-        )
+    cursores = st.session_state[_CLAVE_CURSORES]
+    df_pagina, siguiente = EvaluacionModel.buscar(filtros, cursor=cursores[-1], limite=limite)
+    total = EvaluacionModel.contar(filtros)
 
-    with col_opt3:
-        st.markdown("<br>", unsafe_allow_html=True)
-        # Export placeholder; real export implemented in exports.py if needed
-
-    # Filtrar
-    df_mostrar = df_eval.copy()
-    if buscar:
-        df_mostrar = df_mostrar[
-            df_mostrar['nombre_propuesta'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['curador'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['dimension'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['aspecto'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['ficha_grupo'].astype(str).str.contains(buscar, case=False, na=False)
-        ]
-
-    if filtro_resultado != "Todos":
-        resultado_map = {
-            "🟢 Fortaleza (2)": 2,
-            "🟡 Oportunidad (1)": 1,
-            "🔴 Riesgo (0)": 0
-        }
-        df_mostrar = df_mostrar[df_mostrar['resultado'] == resultado_map[filtro_resultado]]
+    if df_pagina.empty:
+        st.info("No hay evaluaciones que coincidan con los filtros")
+        return
 
     # Mapear resultados a emojis
-    df_mostrar['resultado_emoji'] = df_mostrar['resultado'].map({2: '🟢', 1: '🟡', 0: '🔴'})
+    df_pagina['resultado_emoji'] = df_pagina['resultado'].map({2: '🟢', 1: '🟡', 0: '🔴'})
 
-    # Mostrar tabla
     st.dataframe(
-        df_mostrar[[
-            'curador', 'codigo_grupo', 'nombre_propuesta', 'ficha_grupo',
-            'modalidad', 'dimension', 'aspecto', 'resultado_emoji',
-            'observacion', 'fecha_registro'
-        ]].sort_values('fecha_registro', ascending=False),
+        df_pagina[COLUMNAS_TABLA],
         use_container_width=True,
         hide_index=True,
         column_config={
-            'resultado_emoji': st.column_config.TextColumn('Resultado')
+            'resultado_emoji': st.column_config.TextColumn('Resultado'),
+            'fecha_registro': st.column_config.DatetimeColumn('Fecha', format='DD/MM/YYYY HH:mm')
         }
     )
 
-    _count = len(df_mostrar)
-    st.caption(f"Total de registros: {_count}")
+    # Navegación entre páginas
+    pagina_actual = len(cursores)
+    total_paginas = max(1, -(-total // limite))
+    col_ant, col_info, col_sig = st.columns([1, 2, 1])
+    with col_ant:
+        st.button("⬅️ Anterior", on_click=_pagina_anterior, disabled=pagina_actual == 1,
+                  use_container_width=True)
+    with col_info:
+        st.caption(f"Página {pagina_actual} de {total_paginas} · Total de registros: {total}")
+    with col_sig:
+        st.button("Siguiente ➡️", on_click=_pagina_siguiente, args=(siguiente,),
+                  disabled=siguiente is None, use_container_width=True)
 
-    col_exp1, col_exp2, col_exp3 = st.columns([1, 2, 1])
+    # Exportar el resultado completo (todas las páginas)
+    st.markdown("---")
+    exportacion = st.session_state.get(_CLAVE_EXPORTACION)
+    if exportacion is None:
+        st.button(
+            f"📦 Preparar exportación ({total} registros)",
+            on_click=_preparar_exportacion, args=(filtros,),
+            use_container_width=True
+        )
+        return
+
+    col_exp1, col_exp2 = st.columns(2)
+    with col_exp1:
+        st.download_button(
+            label=f"📥 Exportar Excel ({exportacion['filas']} registros)",
+            data=exportacion['excel'],
+            file_name=f"evaluaciones_detalladas_{exportacion['marca']}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            type="primary",
+            use_container_width=True
+        )
     with col_exp2:
-        csv_data = df_mostrar.to_csv(index=False)
         st.download_button(
-            label="📥 Exportar CSV",
-            data=csv_data,
-            file_name=f"evaluaciones_detalladas_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            label=f"📥 Exportar CSV ({exportacion['filas']} registros)",
+            data=exportacion['csv'],
+            file_name=f"evaluaciones_detalladas_{exportacion['marca']}.csv",
             mime="text/csv",
-            type="primary"
+            type="secondary",
+            use_container_width=True
         )
@@ -9,6 +9,7 @@ import zipfile
 import os
 from fpdf import FPDF
 from src.config import config
+from src.database.connection import get_db_connection
 from .utils import estado_patrimonial_texto
 
 
@@ -54,7 +55,7 @@ def generar_pdf_grupo(df_grupo: pd.DataFrame) -> bytes:
     pdf.set_font("Arial", "", 10)
 
     df_dim_grupo = (df_grupo
-        .groupby('dimension', as_index=False)
+        .groupby('dimension', as_index=False, observed=True)
         .agg(
             promedio=('resultado', 'mean'),
             evaluaciones=('resultado', 'count')
@@ -73,7 +74,7 @@ def generar_pdf_grupo(df_grupo: pd.DataFrame) -> bytes:
     pdf.set_font("Arial", "", 9)
 
     df_aspecto_grupo = (df_grupo
-        .groupby(['dimension', 'aspecto'], as_index=False)
+        .groupby(['dimension', 'aspecto'], as_index=False, observed=True)
         .agg(promedio=('resultado', 'mean'))
         .sort_values(['dimension', 'promedio'], ascending=[True, False])
     )
@@ -113,6 +114,9 @@ def crear_backup_zip() -> bytes:
         # Agregar la base de datos
         db_path = config.db_path
         if os.path.exists(db_path):
+            # En modo WAL los últimos commits pueden estar aún en el archivo -wal
+            with get_db_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             zip_file.write(db_path, os.path.basename(db_path))
         else:
             raise FileNotFoundError("Archivo de base de datos no encontrado")
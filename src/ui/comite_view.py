@@ -4,16 +4,25 @@ ACTUALIZADO: Análisis corregido para evaluaciones por aspecto
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 import logging
 from io import BytesIO
+from typing import Optional
 from src.config import config
-from src.database.models import EvaluacionModel, AspectoModel, FichaModel, FichaDimensionModel
+from src.database.models import (
+    EvaluacionModel, AspectoModel, FichaModel, FichaDimensionModel, BusquedaModel, AsignacionModel,
+    ProgramacionModel, LogModel
+)
+from src.database.auditoria import auditoria
+from src.database.cache_evaluaciones import invalidar_cache_evaluaciones
 from src.auth.authentication import crear_boton_logout
 from streamlit_option_menu import option_menu
 from .comite.utils import estado_patrimonial, estado_patrimonial_texto
 from .comite.exports import generar_pdf_grupo, crear_backup_zip
 from .comite.dashboard import mostrar_dashboard
+from .comite.evaluations import mostrar_evaluaciones_detalladas
+from src.analytics import obtener_agregados, obtener_cubo
 
 logger = logging.getLogger(__name__)
 
@@ -39,13 +48,23 @@ def mostrar_informe_grupo(df_eval: pd.DataFrame, codigo_grupo: str):
     grupo_info = df_grupo.iloc[0]
     st.success(f"✅ Informe encontrado para: **{grupo_info['nombre_propuesta']}** ({codigo_grupo})")
 
+    # Agregados compartidos, restringidos a este grupo
+    agregados = obtener_agregados()
+
+    def filas_del_grupo(df: pd.DataFrame) -> pd.DataFrame:
+        return df[df['codigo_grupo'].str.upper() == codigo_grupo.upper()]
+
+    resumen_grupo = filas_del_grupo(
+        agregados.resumir(['codigo_grupo'], {'curadores': 'curador', 'aspectos': 'aspecto'})
+    ).iloc[0]
+
     # Métricas principales del grupo
     col1, col2, col3, col4 = st.columns(4)
 
-    promedio_grupo = df_grupo['resultado'].mean()
-    evaluaciones_total = len(df_grupo)
-    curadores_unicos = df_grupo['curador'].nunique()
-    aspectos_evaluados = df_grupo['aspecto'].nunique()
+    promedio_grupo = resumen_grupo['promedio']
+    evaluaciones_total = int(resumen_grupo['evaluaciones'])
+    curadores_unicos = int(resumen_grupo['curadores'])
+    aspectos_evaluados = int(resumen_grupo['aspectos'])
 
     with col1:
         st.metric("Promedio General", f"{promedio_grupo:.2f}")
@@ -65,13 +84,8 @@ def mostrar_informe_grupo(df_eval: pd.DataFrame, codigo_grupo: str):
     # Desempeño por dimensión
     st.subheader("📊 Desempeño por Dimensión")
 
-    df_dim_grupo = (df_grupo
-        .groupby('dimension', as_index=False)
-        .agg(
-            promedio=('resultado', 'mean'),
-            evaluaciones=('resultado', 'count'),
-            curadores=('curador', 'nunique')
-        )
+    df_dim_grupo = (filas_del_grupo(agregados.resumir(['codigo_grupo', 'dimension'], {'curadores': 'curador'}))
+        [['dimension', 'promedio', 'evaluaciones', 'curadores']]
         .sort_values('promedio', ascending=False)
     )
 
@@ -84,12 +98,8 @@ def mostrar_informe_grupo(df_eval: pd.DataFrame, codigo_grupo: str):
     # Desempeño por aspecto
     st.subheader("✅ Detalle por Aspecto")
 
-    df_aspecto_grupo = (df_grupo
-        .groupby(['dimension', 'aspecto'], as_index=False)
-        .agg(
-            promedio=('resultado', 'mean'),
-            evaluaciones=('resultado', 'count')
-        )
+    df_aspecto_grupo = (filas_del_grupo(agregados.resumir(['codigo_grupo', 'dimension', 'aspecto']))
+        [['dimension', 'aspecto', 'promedio', 'evaluaciones']]
         .sort_values(['dimension', 'promedio'], ascending=[True, False])
     )
 
@@ -162,9 +172,6 @@ def mostrar_informe_grupo(df_eval: pd.DataFrame, codigo_grupo: str):
             
 def mostrar_vista_comite():
     """Renderiza la vista completa del comité"""
-    # Cargar evaluaciones
-    df_eval = EvaluacionModel.obtener_todas_dataframe()
-    
     # Sidebar - Navegación
     with st.sidebar:
         pagina = option_menu(
@@ -200,7 +207,15 @@ def mostrar_vista_comite():
         
         crear_boton_logout()
     
-    paginas_sin_evaluaciones = ["Administración", "Gestión de Usuarios","Gestión de Fichas"]
+    paginas_sin_evaluaciones = ["Administración", "Gestión de Usuarios","Gestión de Fichas",
+                                "Evaluaciones Detalladas"]
+    
+    # Cargar evaluaciones (caché incremental compartida) sólo si la página las usa.
+    # Evaluaciones Detalladas consulta cada página directamente en SQL.
+    if pagina in ("Administración", "Gestión de Fichas", "Evaluaciones Detalladas"):
+        df_eval = pd.DataFrame()
+    else:
+        df_eval = EvaluacionModel.obtener_todas_dataframe_incremental()
     
     # Si la página requiere evaluaciones y no hay, mostrar aviso
     if pagina not in paginas_sin_evaluaciones and df_eval.empty:
@@ -216,7 +231,7 @@ def mostrar_vista_comite():
     if pagina == "Dashboard General":
         mostrar_dashboard(df_eval)
     elif pagina == "Evaluaciones Detalladas":
-        mostrar_evaluaciones_detalladas(df_eval)
+        mostrar_evaluaciones_detalladas()
     elif pagina == "Análisis por Grupos":
         mostrar_analisis_grupos(df_eval)
     elif pagina == "Análisis por Dimensión":
@@ -237,104 +252,31 @@ def mostrar_vista_comite():
 
 
 
-def mostrar_evaluaciones_detalladas(df_eval: pd.DataFrame) -> None:
-    """Tabla detallada de todas las evaluaciones"""
-    
-    st.header("📋 Evaluaciones Detalladas")
-    st.caption("Vista completa de todas las evaluaciones por aspecto")
-    
-    # Opciones de visualización
-    col_opt1, col_opt2, col_opt3 = st.columns([3, 1, 1])
-    
-    with col_opt1:
-        buscar = st.text_input(
-            "🔍 Buscar", 
-            placeholder="Buscar por grupo, curador, dimensión o aspecto..."
-        )
-    
-    with col_opt2:
-        st.markdown("<br>", unsafe_allow_html=True)
-        filtro_resultado = st.selectbox(
-            "Filtrar por resultado",
-            ["Todos", "🟢 Fortaleza (2)", "🟡 Oportunidad (1)", "🔴 Riesgo (0)"]
-        )
-    
-    with col_opt3:
-        st.markdown("<br>", unsafe_allow_html=True)
-        # Placeholder for export button, will be added after filtering
-    
-    # Filtrar
-    df_mostrar = df_eval.copy()
-    
-    if buscar:
-        df_mostrar = df_mostrar[
-            df_mostrar['nombre_propuesta'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['curador'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['dimension'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['aspecto'].str.contains(buscar, case=False, na=False) |
-            df_mostrar['ficha_grupo'].astype(str).str.contains(buscar, case=False, na=False)
-        ]
-    
-    if filtro_resultado != "Todos":
-        resultado_map = {
-            "🟢 Fortaleza (2)": 2,
-            "🟡 Oportunidad (1)": 1,
-            "🔴 Riesgo (0)": 0
-        }
-        df_mostrar = df_mostrar[df_mostrar['resultado'] == resultado_map[filtro_resultado]]
-    
-    # Mapear resultados a emojis
-    df_mostrar['resultado_emoji'] = df_mostrar['resultado'].map({
-        2: '🟢',
-        1: '🟡',
-        0: '🔴'
-    })
-    
-    # Mostrar tabla
-    st.dataframe(
-        df_mostrar[[
-            'curador', 'codigo_grupo', 'nombre_propuesta', 
-            'modalidad', 'dimension', 'aspecto', 'resultado_emoji', 
-            'observacion', 'fecha_registro'
-        ]].sort_values('fecha_registro', ascending=False),
-        use_container_width=True,
-        hide_index=True,
-        column_config={
-            'resultado_emoji': st.column_config.TextColumn('Resultado')
-        }
-    )
-    
-    st.caption(f"Total de registros: {len(df_mostrar)}")
+def _resolver_grupo(df_eval: pd.DataFrame, texto: str) -> Optional[str]:
+    """
+    Traduce lo escrito en la búsqueda de grupos a un código de grupo.
 
-    # Exportar datos (después de filtrar)
-    col_exp1, col_exp2, col_exp3 = st.columns(3)
-    
-    with col_exp1:
-        # Exportar a Excel
-        excel_buffer = BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            df_mostrar.to_excel(writer, sheet_name='Evaluaciones', index=False)
-        
-        st.download_button(
-            label="📥 Exportar Excel",
-            data=excel_buffer.getvalue(),
-            file_name=f"evaluaciones_detalladas_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            type="primary",
-            use_container_width=True
-        )
+    Un código exacto se usa directamente; si no, se buscan grupos por código
+    o nombre en el índice de texto y, si hay varios, se pide elegir uno.
+    """
+    codigos = df_eval['codigo_grupo'].astype(str)
+    if (codigos.str.upper() == texto.upper()).any():
+        return texto
 
-    with col_exp2:
-        # Exportar a CSV
-        csv_data = df_mostrar.to_csv(index=False)
-        st.download_button(
-            label="📥 Exportar CSV",
-            data=csv_data,
-            file_name=f"evaluaciones_detalladas_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv",
-            type="secondary",
-            use_container_width=True
-        )
+    candidatos = BusquedaModel.buscar_grupos(texto, limite=20)
+    if candidatos.empty:
+        # Sin coincidencias: el informe muestra el aviso y los códigos disponibles
+        return texto
+    if len(candidatos) == 1:
+        return candidatos.iloc[0]['codigo_grupo']
+
+    etiquetas = dict(zip(candidatos['codigo_grupo'], candidatos['nombre_resaltado']))
+    return st.radio(
+        f"🔎 {len(candidatos)} grupos coinciden con «{texto}» (ordenados por relevancia):",
+        list(etiquetas),
+        format_func=lambda codigo: f"{codigo} · {etiquetas[codigo]}",
+        key="busqueda_grupo_candidato"
+    )
 
 
 def mostrar_analisis_grupos(df_eval: pd.DataFrame):
@@ -354,16 +296,16 @@ def mostrar_analisis_grupos(df_eval: pd.DataFrame):
     # TAB 1: BÚSQUEDA INDIVIDUAL DE GRUPO
     # ============================================================
     with tab1:
-        st.subheader("🔍 Búsqueda de Grupo por Código")
-        st.caption("Ingrese el código del grupo para ver su informe detallado")
+        st.subheader("🔍 Búsqueda de Grupo por Código o Nombre")
+        st.caption("Ingrese el código o parte del nombre de la propuesta para ver su informe detallado")
         
         col_busq1, col_busq2 = st.columns([3, 1])
         
         with col_busq1:
             id_busqueda = st.text_input(
-                "Ingrese el código del grupo:",
-                placeholder="Ej: P123",
-                help="Ingrese el código tal como aparece en la lista",
+                "Ingrese el código o el nombre del grupo:",
+                placeholder="Ej: P123 o palabras del nombre",
+                help="Se aceptan inicios de palabra, sin distinguir mayúsculas ni tildes",
                 key="busqueda_grupo_tab1"
             )
         
@@ -376,19 +318,20 @@ def mostrar_analisis_grupos(df_eval: pd.DataFrame):
         
         # Mostrar informe del grupo si se buscó
         if id_busqueda:
-            mostrar_informe_grupo(df_eval, id_busqueda)
+            codigo_grupo = _resolver_grupo(df_eval, id_busqueda.strip())
+            if codigo_grupo:
+                mostrar_informe_grupo(df_eval, codigo_grupo)
         else:
-            st.info("👆 Ingrese un código de grupo para ver su informe detallado")
+            st.info("👆 Ingrese un código o nombre de grupo para ver su informe detallado")
             
             # Mostrar lista de grupos disponibles
             with st.expander("📋 Ver grupos disponibles"):
-                grupos_disponibles = sorted(df_eval['codigo_grupo'].unique())
-                grupos_df = pd.DataFrame({
-                    'Código': grupos_disponibles,
-                    'Nombre': [df_eval[df_eval['codigo_grupo'] == cod]['nombre_propuesta'].iloc[0] 
-                              if not df_eval[df_eval['codigo_grupo'] == cod].empty else 'N/A' 
-                              for cod in grupos_disponibles]
-                })
+                grupos_df = (obtener_agregados().por_grupo
+                    .drop_duplicates(subset=['codigo_grupo'])
+                    .sort_values('codigo_grupo')
+                    .rename(columns={'codigo_grupo': 'Código', 'nombre_propuesta': 'Nombre'})
+                    [['Código', 'Nombre']]
+                )
                 st.dataframe(grupos_df, use_container_width=True, hide_index=True)
 
     # ============================================================
@@ -398,23 +341,24 @@ def mostrar_analisis_grupos(df_eval: pd.DataFrame):
         st.subheader("📊 Análisis de Grupos con Filtros")
         st.caption("Filtre y analice grupos por ficha y estado patrimonial")
         
-        # Calcular promedios por grupo y dimensión
-        df_grupo_dim = (df_eval
-            .groupby(['codigo_grupo', 'nombre_propuesta', 'ficha', 'dimension'], as_index=False)
-            .agg(promedio_dimension=('resultado', 'mean'))
-        )
+        # Promedios grupo × ficha × dimensión directamente del cubo de puntuaciones
+        cubo = obtener_cubo()
+        conteos = cubo.conteos('grupo', 'ficha', 'dimension')
         
-        if df_grupo_dim.empty:
+        if not conteos.any():
             st.warning("⚠️ No hay datos suficientes para análisis por dimensión")
             return
         
-        # Crear tabla pivote
-        df_pivot = df_grupo_dim.pivot_table(
-            index=['codigo_grupo', 'nombre_propuesta', 'ficha'],
-            columns='dimension',
-            values='promedio_dimension',
-            fill_value=0  # Rellenar NaN con 0 para grupos sin todas las dimensiones
-        ).reset_index()
+        # Tabla pivote: una fila por (grupo, ficha) evaluado, una columna por
+        # dimensión evaluada; 0 para grupos sin todas las dimensiones
+        filas_g, filas_f = np.nonzero(conteos.sum(axis=2))
+        dims = np.flatnonzero(conteos.sum(axis=(0, 1)))
+        medias = cubo.medias('grupo', 'ficha', 'dimension')[filas_g, filas_f][:, dims]
+        df_pivot = pd.DataFrame(np.nan_to_num(medias, nan=0.0), columns=list(cubo.dimensiones[dims]))
+        df_pivot.insert(0, 'codigo_grupo', cubo.grupos[filas_g])
+        df_pivot.insert(1, 'nombre_propuesta', cubo.nombres_grupo[filas_g])
+        df_pivot.insert(2, 'ficha', cubo.fichas[filas_f])
+        df_pivot = df_pivot.dropna(subset=['codigo_grupo', 'nombre_propuesta', 'ficha'])
         
         # Calcular promedio final (promedio de todas las dimensiones)
         dim_cols = [c for c in df_pivot.columns if c not in ['codigo_grupo', 'nombre_propuesta', 'ficha']]
@@ -694,19 +638,10 @@ def mostrar_analisis_dimensiones(df_eval: pd.DataFrame):
         st.warning("⚠️ No hay evaluaciones para analizar por dimensión")
         return
 
-    # Promedio por dimensión con más métricas
-    df_dim = (df_eval
-        .groupby('dimension', as_index=False)
-        .agg(
-            promedio=('resultado', 'mean'),
-            mediana=('resultado', 'median'),
-            desviacion=('resultado', 'std'),
-            evaluaciones=('resultado', 'count'),
-            grupos=('codigo_grupo', 'nunique'),
-            fortalezas=('resultado', lambda x: (x == 2).sum()),
-            oportunidades=('resultado', lambda x: (x == 1).sum()),
-            riesgos=('resultado', lambda x: (x == 0).sum())
-        )
+    # Promedio por dimensión con más métricas (agregados compartidos)
+    df_dim = (obtener_agregados().por_dimension
+        [['dimension', 'promedio', 'mediana', 'desviacion', 'evaluaciones',
+          'grupos', 'fortalezas', 'oportunidades', 'riesgos']]
         .sort_values('promedio', ascending=False)
     )
     
@@ -823,19 +758,15 @@ def mostrar_analisis_aspectos(df_eval: pd.DataFrame):
     st.header("✅ Análisis por Aspecto")
     st.caption("Desempeño detallado en cada aspecto evaluado")
     
-    # Promedio por dimensión y aspecto con más métricas
-    df_aspecto = (df_eval
-        .groupby(['dimension', 'aspecto'], as_index=False)
-        .agg(
-            promedio=('resultado', 'mean'),
-            mediana=('resultado', 'median'),
-            desviacion=('resultado', 'std'),
-            evaluaciones=('resultado', 'count'),
-            grupos=('codigo_grupo', 'nunique'),
-            fortaleza=('resultado', lambda x: (x == 2).sum()),
-            oportunidad=('resultado', lambda x: (x == 1).sum()),
-            riesgo=('resultado', lambda x: (x == 0).sum())
-        )
+    # Promedio por dimensión y aspecto con más métricas (agregados compartidos)
+    df_aspecto = (obtener_agregados().por_aspecto
+        .rename(columns={
+            'fortalezas': 'fortaleza',
+            'oportunidades': 'oportunidad',
+            'riesgos': 'riesgo'
+        })
+        [['dimension', 'aspecto', 'promedio', 'mediana', 'desviacion', 'evaluaciones',
+          'grupos', 'fortaleza', 'oportunidad', 'riesgo']]
         .sort_values(['dimension', 'promedio'], ascending=[True, False])
     )
     
@@ -1093,35 +1024,37 @@ def mostrar_analisis_por_ficha(df_eval: pd.DataFrame):
     ficha_seleccionada = st.selectbox("Seleccionar ficha:", fichas_disponibles)
     
     if ficha_seleccionada:
-        # Filtrar evaluaciones de esta ficha
-        df_ficha = df_eval[df_eval['ficha'] == ficha_seleccionada]
+        # Agregados compartidos de esta ficha
+        agregados = obtener_agregados()
+
+        def filas_de_ficha(df: pd.DataFrame) -> pd.DataFrame:
+            return df[df['ficha'] == ficha_seleccionada]
+
+        df_resumen_ficha = filas_de_ficha(agregados.por_ficha)
         
-        if df_ficha.empty:
+        if df_resumen_ficha.empty:
             st.warning(f"No hay evaluaciones para la ficha '{ficha_seleccionada}'")
         else:
+            resumen_ficha = df_resumen_ficha.iloc[0]
             col_info1, col_info2, col_info3 = st.columns(3)
             
             with col_info1:
-                grupos_ficha = df_ficha['codigo_grupo'].nunique()
+                grupos_ficha = int(resumen_ficha['grupos'])
                 st.metric("Grupos Evaluados", grupos_ficha)
             
             with col_info2:
-                promedio_ficha = df_ficha['resultado'].mean()
+                promedio_ficha = resumen_ficha['promedio']
                 st.metric("Promedio de Ficha", f"{promedio_ficha:.2f}")
             
             with col_info3:
-                evaluaciones_ficha = len(df_ficha)
+                evaluaciones_ficha = int(resumen_ficha['evaluaciones'])
                 st.metric("Total Evaluaciones", evaluaciones_ficha)
             
             # Análisis por dimensión dentro de la ficha
             st.markdown("**Desempeño por Dimensión:**")
             
-            df_dim_ficha = (df_ficha
-                .groupby('dimension', as_index=False)
-                .agg(
-                    promedio=('resultado', 'mean'),
-                    evaluaciones=('resultado', 'count')
-                )
+            df_dim_ficha = (filas_de_ficha(agregados.resumir(['ficha', 'dimension']))
+                [['dimension', 'promedio', 'evaluaciones']]
                 .sort_values('promedio', ascending=False)
             )
             
@@ -1148,9 +1081,8 @@ def mostrar_analisis_por_ficha(df_eval: pd.DataFrame):
             # Top grupos de esta ficha
             st.markdown("**🏆 Top 5 Grupos de esta Ficha:**")
             
-            df_grupos_ficha = (df_ficha
-                .groupby(['codigo_grupo', 'nombre_propuesta'], as_index=False)
-                .agg(promedio=('resultado', 'mean'))
+            df_grupos_ficha = (filas_de_ficha(agregados.resumir(['ficha', 'codigo_grupo', 'nombre_propuesta']))
+                [['codigo_grupo', 'nombre_propuesta', 'promedio']]
                 .nlargest(5, 'promedio')
             )
             
@@ -1161,15 +1093,12 @@ def mostrar_analisis_por_ficha(df_eval: pd.DataFrame):
             )
             
             # Aspectos más fuertes y débiles de esta ficha
+            df_asp_ficha = filas_de_ficha(agregados.resumir(['ficha', 'aspecto']))[['aspecto', 'promedio']]
             col_asp1, col_asp2 = st.columns(2)
             
             with col_asp1:
                 st.markdown("**🟢 Aspectos Más Fuertes:**")
-                df_asp_fuerte = (df_ficha
-                    .groupby('aspecto', as_index=False)
-                    .agg(promedio=('resultado', 'mean'))
-                    .nlargest(5, 'promedio')
-                )
+                df_asp_fuerte = df_asp_ficha.nlargest(5, 'promedio')
                 st.dataframe(
                     df_asp_fuerte.style.format({'promedio': '{:.2f}'}),
                     use_container_width=True,
@@ -1178,11 +1107,7 @@ def mostrar_analisis_por_ficha(df_eval: pd.DataFrame):
             
             with col_asp2:
                 st.markdown("**🔴 Aspectos a Fortalecer:**")
-                df_asp_debil = (df_ficha
-                    .groupby('aspecto', as_index=False)
-                    .agg(promedio=('resultado', 'mean'))
-                    .nsmallest(5, 'promedio')
-                )
+                df_asp_debil = df_asp_ficha.nsmallest(5, 'promedio')
                 st.dataframe(
                     df_asp_debil.style.format({'promedio': '{:.2f}'}),
                     use_container_width=True,
@@ -1195,20 +1120,21 @@ def mostrar_analisis_curadores(df_eval: pd.DataFrame):
     st.header("👥 Análisis por Curador")
     st.caption("Estadísticas detalladas de evaluación por curador")
     
-    # Estadísticas por curador mejoradas
-    df_cur = (df_eval
-        .groupby('curador', as_index=False)
-        .agg(
-            grupos_evaluados=('codigo_grupo', 'nunique'),
-            total_evaluaciones=('resultado', 'count'),
-            promedio_otorgado=('resultado', 'mean'),
-            mediana_otorgada=('resultado', 'median'),
-            desviacion=('resultado', 'std'),
-            fortaleza=('resultado', lambda x: (x == 2).sum()),
-            oportunidad=('resultado', lambda x: (x == 1).sum()),
-            riesgo=('resultado', lambda x: (x == 0).sum()),
-            fichas_evaluadas=('ficha', 'nunique')
-        )
+    # Estadísticas por curador mejoradas (agregados compartidos)
+    df_cur = (obtener_agregados().por_curador
+        .rename(columns={
+            'grupos': 'grupos_evaluados',
+            'evaluaciones': 'total_evaluaciones',
+            'promedio': 'promedio_otorgado',
+            'mediana': 'mediana_otorgada',
+            'fortalezas': 'fortaleza',
+            'oportunidades': 'oportunidad',
+            'riesgos': 'riesgo',
+            'fichas': 'fichas_evaluadas'
+        })
+        [['curador', 'grupos_evaluados', 'total_evaluaciones', 'promedio_otorgado',
+          'mediana_otorgada', 'desviacion', 'fortaleza', 'oportunidad', 'riesgo',
+          'fichas_evaluadas']]
         .sort_values('grupos_evaluados', ascending=False)
     )
     
@@ -1395,7 +1321,9 @@ def mostrar_panel_admin():
     
     st.warning("⚠️ Esta sección permite modificar la base de datos. Úsala con precaución.")
     
-    tab1, tab2, tab3 = st.tabs(["📥 Sincronizar Grupos", "💾 Backups", "📊 Estadísticas"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "📥 Sincronizar Grupos", "💾 Backups", "📊 Estadísticas", "🎭 Programación", "🗓️ Asignaciones"
+    ])
     
     with tab1:
         st.subheader("Sincronizar Grupos desde Excel")
@@ -1564,8 +1492,7 @@ def mostrar_panel_admin():
                             ):
                                 try:
                                     # Eliminar evaluaciones
-                                    cursor.execute("DELETE FROM evaluaciones")
-                                    evaluaciones_eliminadas = cursor.rowcount
+                                    evaluaciones_eliminadas = EvaluacionModel.eliminar_con_cursor(cursor)
                                     
                                     # Verificar
                                     cursor.execute("SELECT COUNT(*) FROM evaluaciones")
@@ -1578,15 +1505,15 @@ def mostrar_panel_admin():
                                         grupos_restantes = cursor.fetchone()[0]
                                         st.info(f"ℹ️ Los {grupos_restantes} grupos permanecen intactos")
                                         
-                                        # Log
-                                        from src.database.models import LogModel
-                                        LogModel.registrar_log(
+                                        # Log (en la misma transacción)
+                                        LogModel.registrar_log_con_cursor(
+                                            cursor,
                                             usuario=st.session_state.usuario,
                                             accion="ELIMINACION_EVALUACIONES",
                                             detalle=f"Eliminadas: {evaluaciones_eliminadas} evaluaciones"
                                         )
                                         
-                                        st.cache_data.clear()
+                                        invalidar_cache_evaluaciones()
                                         st.balloons()
                                     else:
                                         st.error(f"❌ Error: Quedan {verificacion} evaluaciones")
@@ -1598,7 +1525,7 @@ def mostrar_panel_admin():
                             # Eliminar todo
                             st.error("Esta opción eliminará TODAS las evaluaciones")
                             if st.checkbox("Confirmo que quiero eliminar todo"):
-                                cursor.execute("DELETE FROM evaluaciones")
+                                EvaluacionModel.eliminar_con_cursor(cursor)
                                 cursor.execute("DELETE FROM grupos")
                                 
                                 insertados = 0
@@ -1623,8 +1550,11 @@ def mostrar_panel_admin():
                                 
                                 st.success(f"✅ Base de datos recreada con {insertados} grupos")
                     
-                    # Limpiar caché
-                    st.cache_data.clear()
+                    # Si se borraron evaluaciones, descartar el DataFrame compartido.
+                    # El catálogo de grupos del curador y las actualizaciones de
+                    # grupos en el DataFrame se detectan solos por versión
+                    if "Eliminar" in sync_option:
+                        invalidar_cache_evaluaciones()
                     
             except Exception as e:
                 st.error(f"❌ Error: {e}")
@@ -1686,6 +1616,100 @@ def mostrar_panel_admin():
         
         with col4:
             st.metric("Curadores Activos", curadores_activos)
+        
+        registro = auditoria.estadisticas()
+        st.caption(
+            f"📝 Auditoría: {registro['escritos']} eventos escritos, {registro['pendientes']} pendientes"
+            + (f", ⚠️ {registro['descartados']} descartados" if registro['descartados'] else "")
+        )
+        
+        if st.button(f"📦 Archivar logs de más de {config.log_retencion_dias} días"):
+            archivados = LogModel.archivar_antiguos()
+            if archivados < 0:
+                st.error("❌ Error archivando logs (ver log)")
+            else:
+                st.success(f"✅ {archivados} eventos archivados")
+    
+    with tab4:
+        mostrar_programacion()
+    
+    with tab5:
+        mostrar_asignaciones()
+
+
+def mostrar_programacion():
+    """Orden de presentación de los grupos en cada día del evento"""
+    st.subheader("🎭 Programación de Presentaciones")
+    st.info(
+        "💡 El orden de presentación guía el reparto de asignaciones y la lista de pendientes "
+        "de cada curador, y el aviso del grupo siguiente tras cada evaluación"
+    )
+    
+    fecha = st.date_input("Día del evento", key="programacion_fecha").isoformat()
+    actual = ProgramacionModel.obtener_dia(fecha)
+    
+    codigos = st.text_area(
+        "Códigos de grupo en orden de presentación (uno por línea)",
+        value="\n".join(p['codigo_grupo'] for p in actual),
+        height=250,
+        key=f"programacion_codigos_{fecha}"
+    )
+    
+    if st.button("💾 Guardar programación del día", type="primary"):
+        exito, error = ProgramacionModel.establecer_dia(fecha, codigos.splitlines())
+        if exito:
+            st.success("✅ Programación guardada")
+            actual = ProgramacionModel.obtener_dia(fecha)
+        else:
+            st.error(f"❌ {error}")
+    
+    if actual:
+        st.dataframe(pd.DataFrame(actual), use_container_width=True, hide_index=True)
+    
+    fechas = ProgramacionModel.obtener_fechas()
+    if fechas:
+        st.caption(f"Días programados: {', '.join(fechas)}")
+
+
+def mostrar_asignaciones():
+    """Reparto de grupos entre curadores y carga de cada uno"""
+    st.subheader("🗓️ Asignación de Grupos a Curadores")
+    st.info(
+        f"💡 Cada grupo se reparte entre los curadores activos menos cargados, en orden de "
+        f"presentación, sin repetir curador y con un máximo de {config.max_grupos_por_curador} "
+        f"grupos por curador"
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        curadores_por_grupo = st.number_input(
+            "Curadores por grupo", min_value=1, max_value=20,
+            value=config.curadores_por_grupo, step=1
+        )
+    with col2:
+        reemplazar = st.checkbox(
+            "Repartir de nuevo los grupos aún no iniciados",
+            help="Descarta las asignaciones sin evaluación iniciada antes de repartir"
+        )
+    
+    if st.button("🗓️ Planificar asignaciones", type="primary"):
+        resultado = AsignacionModel.planificar(int(curadores_por_grupo), reemplazar_pendientes=reemplazar)
+        if resultado['exito']:
+            st.success(f"✅ {resultado['asignadas']} asignaciones nuevas")
+            if resultado['sin_cubrir']:
+                st.warning(
+                    f"⚠️ {resultado['sin_cubrir']} grupos no alcanzan {int(curadores_por_grupo)} curadores "
+                    f"(faltan curadores activos o se alcanzó el máximo por curador)"
+                )
+        else:
+            st.error(f"❌ Error planificando asignaciones: {resultado['error']}")
+    
+    df_cargas = AsignacionModel.obtener_cargas()
+    if df_cargas.empty:
+        st.info("No hay curadores activos")
+        return
+    
+    st.dataframe(df_cargas, use_container_width=True, hide_index=True)
 
 
 def mostrar_gestion_usuarios(df_eval: pd.DataFrame):
@@ -3,30 +3,31 @@ Vista de la interfaz para Curadores
 ACTUALIZADO: Validación completa de aspectos antes de guardar
 """
 import streamlit as st
-import pandas as pd
 import logging
+import uuid
 from datetime import datetime
 from src.config import config
-from src.database.models import GrupoModel, EvaluacionModel, LogModel, AspectoModel
+from src.database.models import EvaluacionModel, AspectoModel, AsignacionModel, BorradorModel, ProgramacionModel
+from src.database.catalogo_grupos import catalogo_grupos
 from src.utils.validators import validar_codigo_grupo, validar_observacion
 
 logger = logging.getLogger(__name__)
 
+# Texto mostrado junto a cada sugerencia de grupo (ver COINCIDENCIAS)
+ETIQUETAS_COINCIDENCIA = {
+    'codigo_exacto': 'código exacto',
+    'codigo_prefijo': 'código que empieza así',
+    'codigo_contiene': 'código que lo contiene',
+    'codigo_errata': 'código parecido',
+    'nombre_prefijo': 'nombre',
+    'nombre_contiene': 'nombre',
+}
 
-@st.cache_data
-def cargar_grupos_excel():
-    """Carga el catálogo de grupos desde Excel con cache"""
-    try:
-        df = pd.read_excel(config.excel_path)
-        logger.info(f"Grupos cargados desde Excel: {len(df)}")
-        return df
-    except FileNotFoundError:
-        st.error(f"⚠️ Archivo no encontrado: {config.excel_path}")
-        return pd.DataFrame()
-    except Exception as e:
-        logger.error(f"Error cargando Excel: {e}")
-        st.error(f"❌ Error cargando datos: {str(e)}")
-        return pd.DataFrame()
+# Claves de st.session_state: grupo elegido en el buscador y datos de su formulario
+_CLAVE_GRUPO = "curador_grupo_seleccionado"
+_CLAVE_FORMULARIO = "curador_datos_formulario"
+# Clave del campo de observación; la de cada aspecto es f"res_asp_{aspecto_id}"
+_CLAVE_OBSERVACION = "observacion_evaluacion"
 
 
 def bloque_aspecto(dimension_nombre: str, aspecto_nombre: str, aspecto_id: int, key_prefix: str):
@@ -97,6 +98,10 @@ def mostrar_vista_curador():
                 </p>
             </div>
             """, unsafe_allow_html=True)
+        progreso = EvaluacionModel.obtener_progreso(st.session_state.usuario_id)
+        if not progreso.empty:
+            completas = int((progreso['estado'] == 'completa').sum())
+            st.caption(f"✅ {completas} grupo(s) evaluados")
 
     st.markdown('<div class="gradient-bar"></div>', unsafe_allow_html=True) 
     st.markdown("<div style='margin:0;'>" \
@@ -106,424 +111,567 @@ def mostrar_vista_curador():
     
     col1_global, col2_global, col3_global = st.columns([1, 6, 1])
     with col2_global:
-        # Cargar catálogo de grupos
-        df_grupos = cargar_grupos_excel()
-        
-        if df_grupos.empty:
-            st.warning("⚠️ No se pudo cargar el catálogo de grupos. Contacte al administrador.")
+        # Catálogo de grupos (índice en memoria sobre la tabla grupos)
+        if len(catalogo_grupos) == 0:
+            st.warning("⚠️ No hay grupos sincronizados. Contacte al administrador.")
             st.stop()
         
-        # Sección: Búsqueda de grupo
-        st.subheader("🔍 Búsqueda de Grupo")
-        
-        col_busq1, col_busq2 = st.columns([2, 1])
-        
-        with col_busq1:
-            id_busqueda = st.text_input(
-                "Ingrese el código del grupo:",
-                placeholder="",
-                help="Ingrese el código tal como aparece en su listado"
-            )
-        
-        with col_busq2:
-            st.markdown("<br>", unsafe_allow_html=True)
-            if st.button("🔍 Buscar", type="primary", use_container_width=True):
-                if id_busqueda:
-                    st.rerun()
+        # Búsqueda y formulario van en fragmentos: interactuar con uno sólo
+        # vuelve a ejecutar ese fragmento, no la vista completa
+        _buscador_grupo()
         
-        # Buscar grupo
+        codigo = st.session_state.get(_CLAVE_GRUPO)
+        if codigo:
+            _formulario_evaluacion(codigo)
+            _autoguardado_borrador(codigo)
+
+
+@st.fragment
+def _buscador_grupo():
+    """
+    Búsqueda de grupo como fragmento: escribir, buscar o elegir una sugerencia
+    sólo vuelve a ejecutar esta función. Cuando cambia el grupo elegido lo
+    guarda en st.session_state y relanza la página para mostrar su formulario.
+    """
+    st.subheader("🔍 Búsqueda de Grupo")
+    
+    col_busq1, col_busq2 = st.columns([2, 1])
+    
+    with col_busq1:
+        id_busqueda = st.text_input(
+            "Ingrese el código del grupo:",
+            placeholder="",
+            help="Ingrese el código tal como aparece en su listado. "
+                 "Si escribe parte del código o del nombre se mostrarán sugerencias"
+        )
+    
+    with col_busq2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        # El clic ya vuelve a ejecutar el fragmento con el texto actual
+        st.button("🔍 Buscar", type="primary", use_container_width=True)
+    
+    # Lista de trabajo: grupos asignados sin evaluación completa
+    pendientes = AsignacionModel.obtener_pendientes(st.session_state.usuario_id)
+    if pendientes:
+        por_codigo = {p['codigo_grupo']: p for p in pendientes}
+        codigo_pendiente = st.selectbox(
+            f"📋 Mis grupos pendientes ({len(pendientes)})",
+            list(por_codigo),
+            index=None,
+            placeholder="O seleccione uno de sus grupos asignados",
+            format_func=lambda codigo: (
+                f"{por_codigo[codigo]['orden']}. {codigo} · {por_codigo[codigo]['nombre_propuesta']}"
+                + (" (en progreso)" if por_codigo[codigo]['estado'] else "")
+            ),
+            key="grupo_pendiente"
+        )
+        if not id_busqueda and codigo_pendiente:
+            id_busqueda = codigo_pendiente
+    
+    if id_busqueda:
+        grupo = _resolver_grupo(id_busqueda)
+    else:
         grupo = None
-        if id_busqueda:
-            # Validar código
-            valido, codigo_limpio, error = validar_codigo_grupo(id_busqueda)
-            
-            if not valido:
-                st.error(f"❌ {error}")
-                st.stop()
-            
-            # Buscar en el dataframe
-            resultado = df_grupos[df_grupos['Codigo'].astype(str).str.upper() == codigo_limpio]
-            
-            # Si no encuentra, intentar búsqueda parcial
-            if resultado.empty:
-                resultado = df_grupos[df_grupos['Codigo'].astype(str).str.contains(codigo_limpio, case=False, na=False)]
-            
-            if resultado.empty:
-                st.error(f"❌ Grupo no encontrado: {codigo_limpio}")
-                st.info("💡 Verifique que el código sea correcto")
-                
-                # Mostrar sugerencias
-                with st.expander("Ver todos los códigos disponibles"):
-                    st.dataframe(
-                        df_grupos[['Codigo', 'Nombre_Propuesta']],
-                        use_container_width=True
-                    )
-                st.stop()
-            else:
-                grupo = resultado.iloc[0]
-                st.success(f"✅ Grupo encontrado: {grupo['Nombre_Propuesta']}")
-        else:
-            st.info("👆 Ingrese un código de grupo para comenzar la evaluación")
-            st.stop()
-        
-        # ============================================================
-        # Obtener información completa del grupo incluyendo ficha
-        # ============================================================
-        grupo_db = GrupoModel.obtener_por_codigo(str(grupo['Codigo']))
-        
-        if not grupo_db:
-            st.error("❌ Grupo no encontrado en la base de datos")
-            st.info("💡 El grupo debe estar sincronizado desde Administración")
-            st.stop()
-        
-        # Verificar que el grupo tenga ficha asignada
-        if not grupo_db.get('ficha_id'):
-            st.error("❌ Este grupo no tiene una ficha de evaluación asignada")
-            st.info("💡 Contacte al administrador para asignar una ficha a este grupo")
-            
-            with st.expander("ℹ️ Más información"):
-                st.markdown("""
-                **¿Qué significa esto?**
-                
-                Cada grupo debe tener asignada una ficha de evaluación que determina 
-                qué dimensiones y aspectos se deben evaluar.
-                
-                **¿Cómo se soluciona?**
-                
-                1. El administrador debe ir a: **Administración → Sincronizar Grupos**
-                2. Asegurarse de que el archivo Excel tenga la columna "Ficha" con el código correcto
-                3. Ejecutar sincronización
-                
-                **Fichas disponibles:**
-                - CONGO, GARABATO, CUMBIA, MAPALE, SON_NEGRO
-                - COMPARSA_TRAD, COMPARSA_FANT, DANZAS_ESP
-                """)
-            st.stop()
-        
-        ficha_id = grupo_db['ficha_id']
-        ficha_nombre = grupo_db.get('ficha_nombre', 'Desconocida')
+        st.info("👆 Ingrese un código de grupo para comenzar la evaluación")
+    
+    codigo = grupo['codigo'] if grupo else None
+    if codigo != st.session_state.get(_CLAVE_GRUPO):
+        st.session_state[_CLAVE_GRUPO] = codigo
+        st.rerun()
+
+
+def _resolver_grupo(id_busqueda: str):
+    """
+    Valida el texto buscado y lo resuelve a un grupo, mostrando los errores o
+    las sugerencias que correspondan.
+
+    Args:
+        id_busqueda: Código (o parte del código o del nombre) escrito
+
+    Returns:
+        dict o None: grupo encontrado o elegido entre las sugerencias
+    """
+    # Validar código
+    valido, codigo_limpio, error = validar_codigo_grupo(id_busqueda)
+    
+    if not valido:
+        st.error(f"❌ {error}")
+        return None
+    
+    # Buscar por código exacto en el índice
+    grupo = catalogo_grupos.obtener(codigo_limpio)
+    
+    # Si no encuentra, sugerir grupos por código parcial, errata o nombre
+    if grupo is None:
+        sugerencias = catalogo_grupos.sugerir(id_busqueda, limite=10)
         
-        # Mostrar información de la ficha
-        st.info(f"📋 **Ficha asignada:** {ficha_nombre}")
+        if not sugerencias:
+            st.error(f"❌ Grupo no encontrado: {codigo_limpio}")
+            st.info("💡 Verifique que el código sea correcto")
+            return None
         
-        # ============================================================
-        # Verificar si ya evaluó este grupo con esta ficha
-        # ============================================================
-        if EvaluacionModel.evaluacion_existe(st.session_state.usuario_id, str(grupo['Codigo']), ficha_id):
-            st.error(f"⚠️ Ya evaluó este grupo anteriormente")
-            st.info("No puede evaluar el mismo grupo más de una vez")
-            
-            with st.expander("Ver evaluación registrada"):
-                evaluaciones_previas = EvaluacionModel.obtener_evaluacion_grupo_usuario(
-                    st.session_state.usuario_id,
-                    str(grupo['Codigo'])
+        grupos_sugeridos = {g['codigo']: (g, tipo) for g, tipo in sugerencias}
+        codigo_elegido = st.selectbox(
+            f"🔎 No hay un grupo con el código {codigo_limpio}. ¿Quiso decir…?",
+            list(grupos_sugeridos),
+            index=None,
+            placeholder="Seleccione el grupo",
+            format_func=lambda codigo: (
+                f"{codigo} · {grupos_sugeridos[codigo][0]['nombre_propuesta']}"
+                f" ({ETIQUETAS_COINCIDENCIA[grupos_sugeridos[codigo][1]]})"
+            ),
+            key=f"sugerencia_grupo_{codigo_limpio}"
+        )
+        if codigo_elegido is None:
+            return None
+        grupo = grupos_sugeridos[codigo_elegido][0]
+    
+    st.success(f"✅ Grupo encontrado: {grupo['nombre_propuesta']}")
+    return grupo
+
+
+def _datos_formulario(codigo: str) -> dict:
+    """
+    Grupo, estado de la evaluación y aspectos de la ficha del grupo elegido.
+    Se leen una sola vez por grupo elegido y se guardan en st.session_state,
+    de modo que las re-ejecuciones del formulario no vuelven a consultarlos.
+
+    Al elegir el grupo se restaura en los widgets del formulario el borrador
+    guardado (o se vacían si no lo hay).
+
+    Args:
+        codigo: Código del grupo elegido
+
+    Returns:
+        dict con 'codigo', 'grupo', 'completa', 'aspectos', 'borrador'
+        (último contenido guardado como borrador), 'borrador_en', 'recuperado'
+        y 'clave_envio' (clave de idempotencia del envío del formulario)
+    """
+    datos = st.session_state.get(_CLAVE_FORMULARIO)
+    if datos is None or datos['codigo'] != codigo:
+        grupo = catalogo_grupos.obtener(codigo)
+        ficha_id = grupo.get('ficha_id') if grupo else None
+        datos = {
+            'codigo': codigo,
+            'grupo': grupo,
+            'completa': bool(ficha_id) and EvaluacionModel.evaluacion_existe(
+                st.session_state.usuario_id, grupo['codigo'], ficha_id
+            ),
+            'aspectos': AspectoModel.obtener_por_ficha(ficha_id) if ficha_id else {},
+            'borrador': ({}, ''),
+            'borrador_en': None,
+            'recuperado': None,
+            'clave_envio': uuid.uuid4().hex,
+        }
+        if datos['aspectos'] and not datos['completa']:
+            borrador = BorradorModel.obtener(st.session_state.usuario_id, grupo['codigo'], ficha_id)
+            if borrador:
+                datos['borrador'] = (borrador['resultados'], borrador['observacion'])
+                datos['recuperado'] = borrador['actualizado_en']
+            resultados, observacion = datos['borrador']
+            for aspecto_id in _ids_aspectos(datos):
+                st.session_state[f"res_asp_{aspecto_id}"] = resultados.get(aspecto_id)
+            st.session_state[_CLAVE_OBSERVACION] = observacion
+        st.session_state[_CLAVE_FORMULARIO] = datos
+    return datos
+
+
+def _ids_aspectos(datos: dict) -> list:
+    """IDs de los aspectos del formulario, en el orden de la ficha."""
+    return [a['id'] for d in datos['aspectos'].values() for a in d['aspectos']]
+
+
+def _valores_formulario(datos: dict) -> tuple:
+    """
+    Contenido actual del formulario leído de st.session_state.
+
+    Returns:
+        (aspecto_id -> resultado de los aspectos calificados, observación)
+    """
+    resultados = {}
+    for aspecto_id in _ids_aspectos(datos):
+        resultado = st.session_state.get(f"res_asp_{aspecto_id}")
+        if resultado is not None:
+            resultados[aspecto_id] = resultado
+    return resultados, st.session_state.get(_CLAVE_OBSERVACION) or ''
+
+
+@st.fragment(run_every=config.intervalo_borrador)
+def _autoguardado_borrador(codigo: str):
+    """
+    Guarda el borrador del formulario cada config.intervalo_borrador segundos,
+    sólo si cambió desde el último guardado: un UPSERT por tanda de cambios,
+    no uno por widget. Si se pierde la sesión, el formulario se restaura al
+    volver a elegir el grupo.
+
+    Args:
+        codigo: Código del grupo elegido en el buscador
+    """
+    datos = st.session_state.get(_CLAVE_FORMULARIO)
+    if datos is None or datos['codigo'] != codigo or datos['completa'] or not datos['aspectos']:
+        return
+
+    actual = _valores_formulario(datos)
+    if actual != datos['borrador']:
+        resultados, observacion = actual
+        if BorradorModel.guardar(st.session_state.usuario_id, codigo, datos['grupo']['ficha_id'],
+                                 resultados, observacion):
+            datos['borrador'] = actual
+            datos['borrador_en'] = datetime.now().strftime("%H:%M:%S")
+
+    if datos['borrador_en']:
+        st.caption(f"💾 Borrador guardado a las {datos['borrador_en']}")
+
+
+@st.fragment
+def _formulario_evaluacion(codigo: str):
+    """
+    Formulario de evaluación del grupo elegido, como fragmento: sus widgets
+    sólo vuelven a ejecutar esta función.
+
+    Args:
+        codigo: Código del grupo elegido en el buscador
+    """
+    formulario = _datos_formulario(codigo)
+    grupo = formulario['grupo']
+    if grupo is None:
+        st.error(f"❌ Grupo no encontrado: {codigo}")
+        return
+
+    # Verificar que el grupo tenga ficha asignada
+    if not grupo.get('ficha_id'):
+        st.error("❌ Este grupo no tiene una ficha de evaluación asignada")
+        st.info("💡 Contacte al administrador para asignar una ficha a este grupo")
+
+        with st.expander("ℹ️ Más información"):
+            st.markdown("""
+            **¿Qué significa esto?**
+
+            Cada grupo debe tener asignada una ficha de evaluación que determina 
+            qué dimensiones y aspectos se deben evaluar.
+
+            **¿Cómo se soluciona?**
+
+            1. El administrador debe ir a: **Administración → Sincronizar Grupos**
+            2. Asegurarse de que el archivo Excel tenga la columna "Ficha" con el código correcto
+            3. Ejecutar sincronización
+
+            **Fichas disponibles:**
+            - CONGO, GARABATO, CUMBIA, MAPALE, SON_NEGRO
+            - COMPARSA_TRAD, COMPARSA_FANT, DANZAS_ESP
+            """)
+        return
+
+    ficha_id = grupo['ficha_id']
+    ficha_nombre = grupo.get('ficha_nombre') or 'Desconocida'
+
+    # Mostrar información de la ficha
+    st.info(f"📋 **Ficha asignada:** {ficha_nombre}")
+
+    # ============================================================
+    # Verificar si ya evaluó este grupo con esta ficha
+    # ============================================================
+    if formulario['completa']:
+        st.error(f"⚠️ Ya evaluó este grupo anteriormente")
+        st.info("No puede evaluar el mismo grupo más de una vez")
+
+        with st.expander("Ver evaluación registrada"):
+            evaluaciones_previas = EvaluacionModel.obtener_evaluacion_grupo_usuario(
+                st.session_state.usuario_id,
+                grupo['codigo']
+            )
+
+            if evaluaciones_previas:
+                st.markdown(f"**Fecha:** {evaluaciones_previas[0]['fecha_registro']}")
+                st.markdown(f"**Total aspectos evaluados:** {len(evaluaciones_previas)}")
+
+                for eval in evaluaciones_previas:
+                    resultado_emoji = {0: '🔴', 1: '🟡', 2: '🟢'}[eval['resultado']]
+                    st.markdown(f"- {resultado_emoji} **{eval['aspecto_nombre']}**: {eval['observacion'][:50]}...")
+
+        return
+
+    st.markdown("---")
+
+    # Datos del grupo
+    st.subheader("📋 Datos del Grupo")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.text_input("Código", value=grupo['codigo'], disabled=True)
+        st.text_input("Modalidad", value=grupo['modalidad'], disabled=True)
+
+    with col2:
+        st.text_input("Tipo", value=grupo['tipo'], disabled=True)
+        st.text_input("Tamaño", value=grupo.get('tamano') or 'N/A', disabled=True)
+
+    with col3:
+        st.text_input("Naturaleza", value=grupo['naturaleza'], disabled=True)
+        st.text_input("Nombre de la Propuesta", value=grupo['nombre_propuesta'], disabled=True)
+
+    st.info(f"🎭 **Ahora se presenta:** '{grupo['nombre_propuesta']}'")
+
+    st.markdown("---")
+
+    # Formulario de evaluación
+    st.subheader("📝 Evaluación de la Ficha")
+
+    aspectos_por_dimension = formulario['aspectos']
+
+    if not aspectos_por_dimension:
+        st.error("❌ No se pudieron cargar los aspectos de evaluación para esta ficha")
+        st.info("💡 Contacte al administrador para configurar las dimensiones de esta ficha")
+
+        with st.expander("ℹ️ Información técnica"):
+            st.markdown(f"""
+            **Ficha ID:** {ficha_id}  
+            **Ficha Nombre:** {ficha_nombre}
+
+            El administrador debe ir a:
+            **Gestión de Fichas → Configurar Fichas** y asignar dimensiones a esta ficha.
+            """)
+        return
+
+    # Contar total de aspectos a evaluar
+    total_aspectos = sum(len(d['aspectos']) for d in aspectos_por_dimension.values())
+    st.caption(f"📊 Esta ficha requiere evaluar **{total_aspectos} aspectos** distribuidos en **{len(aspectos_por_dimension)} dimensiones**")
+    if formulario['recuperado']:
+        st.info(f"💾 Se recuperó el borrador guardado el {formulario['recuperado']}")
+
+    # Sin st.form: los valores llegan al servidor en cada cambio para que
+    # _autoguardado_borrador pueda guardarlos (sólo se re-ejecuta este fragmento)
+    with st.container():
+        # Diccionario para almacenar las evaluaciones
+        # Clave: aspecto_id, Valor: (aspecto_nombre, dimension_nombre, resultado)
+        evaluaciones_dict = {}
+
+        # Iterar sobre cada dimensión de la ficha
+        for dim_id, dim_data in sorted(aspectos_por_dimension.items(), key=lambda x: x[1]['dimension']['orden']):
+            dimension = dim_data['dimension']
+            aspectos = dim_data['aspectos']
+
+            if not aspectos:
+                continue  # Saltar dimensiones sin aspectos
+
+            # Mostrar título de dimensión
+            st.markdown(f"""
+            <div class="dimension-box" style="background: linear-gradient(100deg, #C30A36 0%, #EEC216 50%, #278F45 100%); 
+                 color: white; padding: 15px; border-radius: 10px; margin: 20px 0 15px 0;">
+                <h3 style="margin: 0; font-size: 18px;">{dimension['nombre']}</h3>
+                <p style="margin: 5px 0 0 0; font-size: 13px; opacity: 0.9;">{len(aspectos)} aspectos a evaluar</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            # Evaluar cada aspecto de esta dimensión
+            for aspecto in aspectos:
+                resultado = bloque_aspecto(
+                    dimension_nombre=dimension['nombre'],
+                    aspecto_nombre=aspecto['nombre'],
+                    aspecto_id=aspecto['id'],
+                    key_prefix=f"asp_{aspecto['id']}"
                 )
-                
-                if evaluaciones_previas:
-                    st.markdown(f"**Fecha:** {evaluaciones_previas[0]['fecha_registro']}")
-                    st.markdown(f"**Total aspectos evaluados:** {len(evaluaciones_previas)}")
-                    
-                    for eval in evaluaciones_previas:
-                        resultado_emoji = {0: '🔴', 1: '🟡', 2: '🟢'}[eval['resultado']]
-                        st.markdown(f"- {resultado_emoji} **{eval['aspecto_nombre']}**: {eval['observacion'][:50]}...")
-            
-            st.stop()
-        
-        st.markdown("---")
-        
-        # Datos del grupo
-        st.subheader("📋 Datos del Grupo")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.text_input("Código", value=grupo['Codigo'], disabled=True)
-            st.text_input("Modalidad", value=grupo['Modalidad'], disabled=True)
-        
-        with col2:
-            st.text_input("Tipo", value=grupo['Tipo'], disabled=True)
-            st.text_input("Tamaño", value=grupo.get('Tamaño', 'N/A'), disabled=True)
-        
-        with col3:
-            st.text_input("Naturaleza", value=grupo['Naturaleza'], disabled=True)
-            st.text_input("Nombre de la Propuesta", value=grupo['Nombre_Propuesta'], disabled=True)
-        
-        st.info(f"🎭 **Ahora se presenta:** '{grupo['Nombre_Propuesta']}'")
-        
+
+                # Guardar en diccionario
+                evaluaciones_dict[aspecto['id']] = {
+                    'aspecto_nombre': aspecto['nombre'],
+                    'dimension_nombre': dimension['nombre'],
+                    'resultado': resultado
+                }
+
+        # Campo de observación global
+        st.markdown("**Observación Cualitativa:**")
+        observacion_global = st.text_area(
+            "",
+            height=80,
+            placeholder="Describa la observación cualitativa general para toda la evaluación de esta ficha...",
+            label_visibility="collapsed",
+            help="Esta observación aplicará a todos los aspectos evaluados en esta ficha",
+            key=_CLAVE_OBSERVACION
+        )
+
         st.markdown("---")
-        
-        # Formulario de evaluación
-        st.subheader("📝 Evaluación de la Ficha")
-        
-        # ============================================================
-        # Obtener aspectos según la ficha del grupo
-        # ============================================================
-        aspectos_por_dimension = AspectoModel.obtener_por_ficha(ficha_id)
-        
-        if not aspectos_por_dimension:
-            st.error("❌ No se pudieron cargar los aspectos de evaluación para esta ficha")
-            st.info("💡 Contacte al administrador para configurar las dimensiones de esta ficha")
-            
-            with st.expander("ℹ️ Información técnica"):
-                st.markdown(f"""
-                **Ficha ID:** {ficha_id}  
-                **Ficha Nombre:** {ficha_nombre}
-                
-                El administrador debe ir a:
-                **Gestión de Fichas → Configurar Fichas** y asignar dimensiones a esta ficha.
-                """)
-            st.stop()
-        
-        # Contar total de aspectos a evaluar
-        total_aspectos = sum(len(d['aspectos']) for d in aspectos_por_dimension.values())
-        st.caption(f"📊 Esta ficha requiere evaluar **{total_aspectos} aspectos** distribuidos en **{len(aspectos_por_dimension)} dimensiones**")
-
-        with st.form("formulario_evaluacion", clear_on_submit=False):
-            # Diccionario para almacenar las evaluaciones
-            # Clave: aspecto_id, Valor: (aspecto_nombre, dimension_nombre, resultado)
-            evaluaciones_dict = {}
-            
-            # Iterar sobre cada dimensión de la ficha
-            for dim_id, dim_data in sorted(aspectos_por_dimension.items(), key=lambda x: x[1]['dimension']['orden']):
-                dimension = dim_data['dimension']
-                aspectos = dim_data['aspectos']
-                
-                if not aspectos:
-                    continue  # Saltar dimensiones sin aspectos
-                
-                # Mostrar título de dimensión
-                st.markdown(f"""
-                <div class="dimension-box" style="background: linear-gradient(100deg, #C30A36 0%, #EEC216 50%, #278F45 100%); 
-                     color: white; padding: 15px; border-radius: 10px; margin: 20px 0 15px 0;">
-                    <h3 style="margin: 0; font-size: 18px;">{dimension['nombre']}</h3>
-                    <p style="margin: 5px 0 0 0; font-size: 13px; opacity: 0.9;">{len(aspectos)} aspectos a evaluar</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Evaluar cada aspecto de esta dimensión
-                for aspecto in aspectos:
-                    resultado = bloque_aspecto(
-                        dimension_nombre=dimension['nombre'],
-                        aspecto_nombre=aspecto['nombre'],
-                        aspecto_id=aspecto['id'],
-                        key_prefix=f"asp_{aspecto['id']}"
-                    )
-                    
-                    # Guardar en diccionario
-                    evaluaciones_dict[aspecto['id']] = {
-                        'aspecto_nombre': aspecto['nombre'],
-                        'dimension_nombre': dimension['nombre'],
-                        'resultado': resultado
-                    }
-            
-            # Campo de observación global
-            st.markdown("**Observación Cualitativa:**")
-            observacion_global = st.text_area(
-                "",
-                height=80,
-                placeholder="Describa la observación cualitativa general para toda la evaluación de esta ficha...",
-                label_visibility="collapsed",
-                help="Esta observación aplicará a todos los aspectos evaluados en esta ficha"
+
+        # Información de resumen antes de guardar
+        st.info(f"📝 Está a punto de registrar **{len(evaluaciones_dict)} evaluaciones** para el grupo **{grupo['nombre_propuesta']}**")
+
+        # Botones
+        col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
+
+        with col_btn2:
+            submitted = st.button(
+                "✅ REGISTRAR EVALUACIÓN",
+                type="primary",
+                use_container_width=True
             )
 
-            st.markdown("---")
-            
-            # Información de resumen antes de guardar
-            st.info(f"📝 Está a punto de registrar **{len(evaluaciones_dict)} evaluaciones** para el grupo **{grupo['Nombre_Propuesta']}**")
-            
-            # Botones
-            col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
-            
-            with col_btn2:
-                submitted = st.form_submit_button(
-                    "✅ REGISTRAR EVALUACIÓN",
-                    type="primary",
-                    use_container_width=True
-                )
-            
-            if submitted:
+        if submitted:
+            # ============================================================
+            # VALIDACIÓN COMPLETA
+            # ============================================================
+            errores = []
+            aspectos_sin_calificar = []
+
+            # 1. Validar que TODOS los aspectos tengan calificación
+            for aspecto_id, datos in evaluaciones_dict.items():
+                if datos['resultado'] is None:
+                    aspectos_sin_calificar.append(datos)
+
+            if aspectos_sin_calificar:
+                errores.append(f"**{len(aspectos_sin_calificar)} aspectos sin calificar:**")
+
+                # Agrupar por dimensión para mostrar de forma organizada
+                por_dimension = {}
+                for item in aspectos_sin_calificar:
+                    dim = item['dimension_nombre']
+                    if dim not in por_dimension:
+                        por_dimension[dim] = []
+                    por_dimension[dim].append(item['aspecto_nombre'])
+
+                for dim, aspectos in por_dimension.items():
+                    errores.append(f"\n**{dim}:**")
+                    for asp in aspectos:
+                        errores.append(f"  • {asp}")
+
+            # 2. Validar la observación global (usa validador centralizado)
+            valido, error = validar_observacion(observacion_global)
+            if not valido:
+                errores.append(f"\n**Observación Cualitativa:** {error}")
+
+            # Si hay errores, mostrarlos
+            if errores:
+                st.error("❌ Complete correctamente todos los campos antes de guardar:")
+                for error in errores:
+                    st.markdown(error)
+
+                # Consejo adicional
+                st.warning("⚠️ Revise el formulario y asegúrese de:")
+                st.markdown("""
+                - ✓ Calificar **TODOS** los aspectos (ninguno debe quedar en "-- Seleccione --")
+                - ✓ Escribir una observación cualitativa válida (mínimo 5 caracteres)
+                """)
+            else:
                 # ============================================================
-                # VALIDACIÓN COMPLETA
+                # GUARDAR EVALUACIONES
                 # ============================================================
-                errores = []
-                aspectos_sin_calificar = []
-                
-                # 1. Validar que TODOS los aspectos tengan calificación
-                for aspecto_id, datos in evaluaciones_dict.items():
-                    if datos['resultado'] is None:
-                        aspectos_sin_calificar.append(datos)
-                
-                if aspectos_sin_calificar:
-                    errores.append(f"**{len(aspectos_sin_calificar)} aspectos sin calificar:**")
-                    
-                    # Agrupar por dimensión para mostrar de forma organizada
-                    por_dimension = {}
-                    for item in aspectos_sin_calificar:
-                        dim = item['dimension_nombre']
-                        if dim not in por_dimension:
-                            por_dimension[dim] = []
-                        por_dimension[dim].append(item['aspecto_nombre'])
-                    
-                    for dim, aspectos in por_dimension.items():
-                        errores.append(f"\n**{dim}:**")
-                        for asp in aspectos:
-                            errores.append(f"  • {asp}")
-                
-                # 2. Validar la observación global (usa validador centralizado)
-                valido, error = validar_observacion(observacion_global)
-                if not valido:
-                    errores.append(f"\n**Observación Cualitativa:** {error}")
-                
-                # Si hay errores, mostrarlos
-                if errores:
-                    st.error("❌ Complete correctamente todos los campos antes de guardar:")
-                    for error in errores:
-                        st.markdown(error)
-                    
-                    # Consejo adicional
-                    st.warning("⚠️ Revise el formulario y asegúrese de:")
-                    st.markdown("""
-                    - ✓ Calificar **TODOS** los aspectos (ninguno debe quedar en "-- Seleccione --")
-                    - ✓ Escribir una observación cualitativa válida (mínimo 5 caracteres)
-                    """)
-                else:
-                    # ============================================================
-                    # GUARDAR EVALUACIONES
-                    # ============================================================
-                    try:
-                        exito = True
-                        evaluaciones_guardadas = 0
-                        
-                        # Preparar lista de evaluaciones válidas
-                        evaluaciones_validas = [
-                            (aspecto_id, datos['resultado'], observacion_global)
-                            for aspecto_id, datos in evaluaciones_dict.items()
-                            if datos['resultado'] is not None
-                        ]
-                        
-                        # Mostrar progreso
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        for idx, (aspecto_id, resultado, observacion) in enumerate(evaluaciones_validas):
-                            # Actualizar progreso
-                            progress = (idx + 1) / len(evaluaciones_validas)
-                            progress_bar.progress(progress)
-                            status_text.text(f"Guardando evaluación {idx + 1} de {len(evaluaciones_validas)}...")
-                            
-                            # Crear evaluación
-                            eval_id = EvaluacionModel.crear_evaluacion(
-                                usuario_id=st.session_state.usuario_id,
-                                codigo_grupo=str(grupo['Codigo']),
-                                ficha_id=ficha_id,
-                                aspecto_id=aspecto_id,
-                                resultado=resultado,
-                                observacion=observacion
-                            )
-                            
-                            if eval_id:
-                                evaluaciones_guardadas += 1
-                            else:
-                                exito = False
-                                logger.error(f"Error guardando evaluación para aspecto {aspecto_id}")
-                                break
-                        
-                        # Limpiar barra de progreso
-                        progress_bar.empty()
-                        status_text.empty()
-                        
-                        if exito and evaluaciones_guardadas == len(evaluaciones_validas):
-                            # Registrar log
-                            LogModel.registrar_log(
-                                usuario=st.session_state.usuario,
-                                accion="EVALUACION_CREADA",
-                                detalle=f"Grupo: {grupo['Codigo']} - {grupo['Nombre_Propuesta']} | Ficha: {ficha_nombre} | {evaluaciones_guardadas} aspectos"
-                            )
-                            
-                            st.success(f"✅ Evaluación guardada exitosamente")
-                            st.info(f"📊 Se registraron **{evaluaciones_guardadas} aspectos** evaluados para el grupo **{grupo['Nombre_Propuesta']}**")
+                try:
+                    # Preparar lista de evaluaciones válidas
+                    evaluaciones_validas = [
+                        (aspecto_id, datos['resultado'])
+                        for aspecto_id, datos in evaluaciones_dict.items()
+                        if datos['resultado'] is not None
+                    ]
+
+                    # Una sola transacción: se guardan todos los aspectos o ninguno
+                    with st.spinner("Guardando evaluación..."):
+                        resultado_lote = EvaluacionModel.crear_evaluaciones_lote(
+                            usuario_id=st.session_state.usuario_id,
+                            codigo_grupo=grupo['codigo'],
+                            ficha_id=ficha_id,
+                            resultados=evaluaciones_validas,
+                            observacion=observacion_global,
+                            clave_envio=formulario['clave_envio']
+                        )
+
+                    if resultado_lote['exito']:
+                        evaluaciones_guardadas = resultado_lote['guardadas']
+                        st.success(f"✅ Evaluación guardada exitosamente")
+                        st.info(f"📊 Se registraron **{evaluaciones_guardadas} aspectos** evaluados para el grupo **{grupo['nombre_propuesta']}**")
+                        if not resultado_lote['duplicado']:
                             st.balloons()
-                            st.session_state.evaluacion_guardada = True
-                        else:
-                            st.error(f"❌ Error al guardar la evaluación. Se guardaron {evaluaciones_guardadas} de {len(evaluaciones_validas)} aspectos.")
-                            st.warning("⚠️ Contacte al administrador con este mensaje de error")
-                            
-                    except Exception as e:
-                        logger.exception(f"Error guardando evaluación: {e}")
-                        st.error(f"❌ Error crítico: {str(e)}")
-                        st.info("💡 Intente nuevamente. Si el problema persiste, contacte al administrador.")
-        
-        # Botón para evaluar otro grupo (FUERA del formulario)
-        if 'evaluacion_guardada' in st.session_state and st.session_state.evaluacion_guardada:
-            st.markdown("---")
-            
-            col_nuevo1, col_nuevo2, col_nuevo3 = st.columns([1, 2, 1])
-            
-            with col_nuevo2:
-                if st.button("➡️ Evaluar otro grupo", type="primary", use_container_width=True):
-                    st.session_state.evaluacion_guardada = False
-                    st.rerun()
-        
-        # Información adicional
-        with st.expander("ℹ️ Guía de Evaluación"):
-            st.markdown(f"""
-            ### 🎯 Criterios de Calificación
-            
-            **🟢 Fortaleza Patrimonial**
-            - Cumplimiento sobresaliente del aspecto evaluado
-            - Evidencia clara, consistente y bien ejecutada
-            - Práctica consolidada y culturalmente pertinente
-            - Transmite efectivamente el valor patrimonial
-            
-            **🟡 Oportunidad de Mejora**
-            - Cumplimiento parcial del aspecto
-            - Evidencia de intención pero con elementos por fortalecer
-            - Práctica en proceso de consolidación
-            - Requiere ajustes para alcanzar su potencial patrimonial
-            
-            **🔴 Riesgo Patrimonial**
-            - Incumplimiento del aspecto evaluado
-            - Ausencia de elementos fundamentales
-            - Práctica que requiere intervención urgente
-            - Riesgo de pérdida o distorsión del valor patrimonial
-            
-            ---
-            
-            ### 📝 Guía para Observaciones
-
-            La observación cualitativa debe ser:
-
-            - **General:** Aplica a toda la ficha de evaluación, no a aspectos individuales
-            - **Específica:** Mencione qué observó concretamente en la presentación
-            - **Descriptiva:** Describa la situación sin juicios de valor excesivos
-            - **Constructiva:** Oriente sobre qué mantener o mejorar en general
-            - **Fundamentada:** Base sus observaciones en evidencia concreta de la presentación
-
-            **Requisitos técnicos:**
-            - Mínimo: 5 caracteres por observación
-            - Recomendado: 50-200 caracteres para una evaluación completa
-            - Evite observaciones genéricas como "bien", "mal", "regular"
-            - Esta observación se aplicará a todos los aspectos evaluados
-
-            ---
-
-            ### 💡 Consejos Prácticos
-
-            1. **Tome notas durante la presentación** general del grupo
-            2. **Sea objetivo** y base sus evaluaciones en criterios patrimoniales
-            3. **Sea coherente** en sus calificaciones entre diferentes grupos
-            4. **Documente lo positivo y lo mejorable** en la observación general
-            5. **Revise antes de guardar** que todos los aspectos estén calificados
-            
-            ---
-            
-            ### 🎭 Sobre las Fichas de Evaluación
-            
-            Cada grupo tiene asignada una ficha específica según su modalidad y tipo.
-            Las fichas determinan qué dimensiones y aspectos se evalúan, adaptándose
-            a las características particulares de cada expresión cultural.
-            
-            **Ficha actual:** {ficha_nombre}  
-            **Aspectos a evaluar:** {total_aspectos}  
-            
-            """)
\ No newline at end of file
+                        st.session_state.evaluacion_guardada = True
+                        formulario['completa'] = True
+
+                        siguiente = ProgramacionModel.siguientes(grupo['codigo'], 1)
+                        if siguiente:
+                            grupo_siguiente = catalogo_grupos.obtener(siguiente[0])
+                            if grupo_siguiente:
+                                st.info(
+                                    f"🎭 **Siguiente en presentarse:** {grupo_siguiente['codigo']} · "
+                                    f"'{grupo_siguiente['nombre_propuesta']}'"
+                                )
+                    else:
+                        logger.error(f"Error guardando evaluación del grupo {grupo['codigo']}: {resultado_lote['error']}")
+                        st.error(f"❌ Error al guardar la evaluación: {resultado_lote['error']}. No se guardó ningún aspecto.")
+                        st.warning("⚠️ Contacte al administrador con este mensaje de error")
+
+                except Exception as e:
+                    logger.exception(f"Error guardando evaluación: {e}")
+                    st.error(f"❌ Error crítico: {str(e)}")
+                    st.info("💡 Intente nuevamente. Si el problema persiste, contacte al administrador.")
+
+    # Botón para evaluar otro grupo (FUERA del formulario). Relanza la página
+    # completa para refrescar el progreso y la lista de grupos pendientes
+    if 'evaluacion_guardada' in st.session_state and st.session_state.evaluacion_guardada:
+        st.markdown("---")
+
+        col_nuevo1, col_nuevo2, col_nuevo3 = st.columns([1, 2, 1])
+
+        with col_nuevo2:
+            if st.button("➡️ Evaluar otro grupo", type="primary", use_container_width=True):
+                st.session_state.evaluacion_guardada = False
+                st.rerun()
+
+    # Información adicional
+    with st.expander("ℹ️ Guía de Evaluación"):
+        st.markdown(f"""
+        ### 🎯 Criterios de Calificación
+
+        **🟢 Fortaleza Patrimonial**
+        - Cumplimiento sobresaliente del aspecto evaluado
+        - Evidencia clara, consistente y bien ejecutada
+        - Práctica consolidada y culturalmente pertinente
+        - Transmite efectivamente el valor patrimonial
+
+        **🟡 Oportunidad de Mejora**
+        - Cumplimiento parcial del aspecto
+        - Evidencia de intención pero con elementos por fortalecer
+        - Práctica en proceso de consolidación
+        - Requiere ajustes para alcanzar su potencial patrimonial
+
+        **🔴 Riesgo Patrimonial**
+        - Incumplimiento del aspecto evaluado
+        - Ausencia de elementos fundamentales
+        - Práctica que requiere intervención urgente
+        - Riesgo de pérdida o distorsión del valor patrimonial
+
+        ---
+
+        ### 📝 Guía para Observaciones
+
+        La observación cualitativa debe ser:
+
+        - **General:** Aplica a toda la ficha de evaluación, no a aspectos individuales
+        - **Específica:** Mencione qué observó concretamente en la presentación
+        - **Descriptiva:** Describa la situación sin juicios de valor excesivos
+        - **Constructiva:** Oriente sobre qué mantener o mejorar en general
+        - **Fundamentada:** Base sus observaciones en evidencia concreta de la presentación
+
+        **Requisitos técnicos:**
+        - Mínimo: 5 caracteres por observación
+        - Recomendado: 50-200 caracteres para una evaluación completa
+        - Evite observaciones genéricas como "bien", "mal", "regular"
+        - Esta observación se aplicará a todos los aspectos evaluados
+
+        ---
+
+        ### 💡 Consejos Prácticos
+
+        1. **Tome notas durante la presentación** general del grupo
+        2. **Sea objetivo** y base sus evaluaciones en criterios patrimoniales
+        3. **Sea coherente** en sus calificaciones entre diferentes grupos
+        4. **Documente lo positivo y lo mejorable** en la observación general
+        5. **Revise antes de guardar** que todos los aspectos estén calificados
+
+        ---
+
+        ### 🎭 Sobre las Fichas de Evaluación
+
+        Cada grupo tiene asignada una ficha específica según su modalidad y tipo.
+        Las fichas determinan qué dimensiones y aspectos se evalúan, adaptándose
+        a las características particulares de cada expresión cultural.
+
+        **Ficha actual:** {ficha_nombre}  
+        **Aspectos a evaluar:** {total_aspectos}  
+
+        """)
\ No newline at end of file
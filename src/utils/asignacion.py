@@ -0,0 +1,72 @@
+"""
+Reparto de grupos entre curadores
+Algoritmo puro (sin base de datos) usado por AsignacionModel.planificar.
+"""
+import heapq
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def repartir_grupos(
+    grupos_en_orden: List[str],
+    curadores: Iterable[int],
+    curadores_por_grupo: int,
+    max_por_curador: int,
+    cargas: Dict[int, int] = None,
+    parejas_existentes: Set[Tuple[int, str]] = None,
+    ultimos_ordenes: Dict[int, int] = None,
+) -> List[Tuple[int, str, int]]:
+    """
+    Completa la cobertura de cada grupo con los curadores menos cargados.
+
+    Recorre los grupos en orden de presentación, de modo que si no hay
+    capacidad suficiente quedan sin cubrir los últimos. Para cada plaza libre
+    elige al curador con menos grupos; a igual carga, al que lleva más tiempo
+    sin recibir uno (su último grupo asignado es el más antiguo en el orden).
+
+    Args:
+        grupos_en_orden: Códigos de grupo en orden de presentación
+        curadores: IDs de los curadores disponibles
+        curadores_por_grupo: Curadores que deben evaluar cada grupo
+        max_por_curador: Máximo de grupos por curador (incluidas las cargas previas)
+        cargas: Grupos ya asignados a cada curador
+        parejas_existentes: (usuario_id, codigo_grupo) ya asignados o evaluados;
+            cuentan para la cobertura y no se repiten
+        ultimos_ordenes: Mayor orden ya asignado a cada curador, para que el
+            desempate por antigüedad tenga en cuenta las asignaciones previas
+
+    Returns:
+        Lista de nuevas asignaciones (usuario_id, codigo_grupo, orden), con
+        orden = posición del grupo en grupos_en_orden (desde 1)
+    """
+    cargas = dict(cargas or {})
+    ultimos_ordenes = ultimos_ordenes or {}
+    parejas = set(parejas_existentes or ())
+    cubiertos: Dict[str, int] = {}
+    for _, codigo in parejas:
+        cubiertos[codigo] = cubiertos.get(codigo, 0) + 1
+
+    # Montículo (carga, último orden asignado, usuario_id)
+    monticulo = [
+        (cargas.get(u, 0), ultimos_ordenes.get(u, 0), u)
+        for u in set(curadores) if cargas.get(u, 0) < max_por_curador
+    ]
+    heapq.heapify(monticulo)
+
+    nuevas = []
+    for orden, codigo in enumerate(grupos_en_orden, start=1):
+        faltan = curadores_por_grupo - cubiertos.get(codigo, 0)
+        descartados = []
+        while faltan > 0 and monticulo:
+            carga, ultimo, usuario_id = heapq.heappop(monticulo)
+            if (usuario_id, codigo) in parejas:
+                descartados.append((carga, ultimo, usuario_id))
+                continue
+            nuevas.append((usuario_id, codigo, orden))
+            parejas.add((usuario_id, codigo))
+            faltan -= 1
+            if carga + 1 < max_por_curador:
+                heapq.heappush(monticulo, (carga + 1, orden, usuario_id))
+        for entrada in descartados:
+            heapq.heappush(monticulo, entrada)
+
+    return nuevas
@@ -0,0 +1,25 @@
+"""
+Fixtures compartidas de las pruebas
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import config  # noqa: E402
+
+
+@pytest.fixture
+def bd(tmp_path, monkeypatch):
+    """Base de datos nueva en un directorio temporal, con el esquema completo."""
+    from src.database.init_db import inicializar_base_datos
+    from src.database.escritor import escritor
+    from src.database.auditoria import auditoria
+    
+    monkeypatch.setattr(config, 'db_path', str(tmp_path / 'curaduria.db'))
+    assert inicializar_base_datos()
+    yield config.db_path
+    auditoria.detener()
+    escritor.detener()
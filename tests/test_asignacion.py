@@ -0,0 +1,68 @@
+"""
+Pruebas del reparto de grupos entre curadores
+"""
+from collections import Counter
+
+from src.database.connection import get_db_connection
+from src.database.models import AsignacionModel, ProgramacionModel
+from src.utils.asignacion import repartir_grupos
+
+GRUPOS = [f'G{i}' for i in range(1, 11)]
+
+
+def test_ningun_curador_supera_el_maximo():
+    nuevas = repartir_grupos(GRUPOS, [1, 2, 3], 1, 2)
+    
+    assert Counter(usuario_id for usuario_id, _, _ in nuevas) == {1: 2, 2: 2, 3: 2}
+
+
+def test_el_maximo_incluye_las_cargas_previas():
+    nuevas = repartir_grupos(GRUPOS, [1, 2], 1, 3, cargas={1: 3, 2: 1})
+    
+    assert {usuario_id for usuario_id, _, _ in nuevas} == {2}
+    assert len(nuevas) == 2
+
+
+def test_no_repite_parejas_existentes():
+    nuevas = repartir_grupos(GRUPOS[:1], [1, 2, 3], 2, 5, cargas={1: 1}, parejas_existentes={(1, 'G1')})
+    
+    assert len(nuevas) == 1
+    assert nuevas[0][0] != 1
+    assert nuevas[0][1:] == ('G1', 1)
+
+
+def test_el_faltante_queda_en_los_ultimos_grupos():
+    nuevas = repartir_grupos(GRUPOS[:5], [1, 2], 2, 3)
+    
+    cobertura = Counter(codigo for _, codigo, _ in nuevas)
+    assert [cobertura[codigo] for codigo in GRUPOS[:5]] == [2, 2, 2, 0, 0]
+
+
+def test_desempate_por_el_ultimo_orden_previo():
+    # A igual carga recibe primero el curador cuyo último grupo es más antiguo
+    nuevas = repartir_grupos(['G6'], [1, 2], 1, 5, cargas={1: 1, 2: 1}, ultimos_ordenes={1: 1, 2: 5})
+    assert nuevas == [(1, 'G6', 1)]
+    
+    nuevas = repartir_grupos(['G6'], [1, 2], 1, 5, cargas={1: 1, 2: 1}, ultimos_ordenes={1: 5, 2: 1})
+    assert nuevas == [(2, 'G6', 1)]
+
+
+def test_pendientes_siguen_la_programacion_actual(bd):
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO usuarios (username, password_hash, rol) VALUES ('cur1', 'x', 'curador')")
+        usuario_id = cursor.lastrowid
+        ficha_id = cursor.execute("SELECT id FROM fichas ORDER BY id LIMIT 1").fetchone()[0]
+        cursor.executemany("""
+            INSERT INTO grupos (codigo, nombre_propuesta, modalidad, tipo, tamano, naturaleza, ano_evento, ficha_id)
+            VALUES (?, ?, 'Danza', 'T', 'M', 'N', 2026, ?)
+        """, [(codigo, f'Grupo {codigo}', ficha_id) for codigo in GRUPOS[:4]])
+    assert ProgramacionModel.establecer_dia('2026-02-01', GRUPOS[:4])[0]
+    assert AsignacionModel.planificar(curadores_por_grupo=1)['asignadas'] == 4
+    
+    assert ProgramacionModel.establecer_dia('2026-02-01', ['G3', 'G1'])[0]
+    assert ProgramacionModel.establecer_dia('2026-01-31', ['G4'])[0]
+    
+    pendientes = AsignacionModel.obtener_pendientes(usuario_id)
+    assert [p['codigo_grupo'] for p in pendientes] == ['G4', 'G3', 'G1', 'G2']
+    assert [p['orden'] for p in pendientes] == [1, 2, 3, 4]
@@ -0,0 +1,69 @@
+"""
+Pruebas de la búsqueda de texto completo (evaluaciones_fts y aspectos_fts)
+"""
+from src.database.connection import get_db_connection
+from src.database.init_db import indice_busqueda_consistente
+from src.database.models import AspectoModel, BusquedaModel, EvaluacionModel
+
+
+def _evaluar(observaciones):
+    """Un curador evalúa un grupo por observación con todos los aspectos de una ficha."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO usuarios (username, password_hash, rol) VALUES ('cur1', 'x', 'curador')")
+        usuario_id = cursor.lastrowid
+        ficha_id = cursor.execute("SELECT id FROM fichas ORDER BY id LIMIT 1").fetchone()[0]
+        cursor.executemany("""
+            INSERT INTO grupos (codigo, nombre_propuesta, modalidad, tipo, tamano, naturaleza, ano_evento, ficha_id)
+            VALUES (?, ?, 'Danza', 'T', 'M', 'N', 2026, ?)
+        """, [(f'G{i}', f'Comparsa {i}', ficha_id) for i in range(len(observaciones))])
+    aspectos = [a for d in AspectoModel.obtener_por_ficha(ficha_id).values() for a in d['aspectos']]
+    for i, observacion in enumerate(observaciones):
+        resultados = [(a['id'], 2) for a in aspectos]
+        assert EvaluacionModel.crear_evaluaciones_lote(usuario_id, f'G{i}', ficha_id, resultados, observacion)['exito']
+    return aspectos
+
+
+def test_observacion_indexada_una_vez_por_evaluacion(bd):
+    aspectos = _evaluar(['vestuario muy colorido y alegre', 'coreografía sincronizada con energía'])
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM evaluaciones_fts").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM aspectos_fts").fetchone()[0] == 2 * len(aspectos)
+        assert conn.execute("""
+            SELECT COUNT(*) FROM aspectos_fts WHERE aspectos_fts MATCH 'colorido'
+        """).fetchone()[0] == 0
+    assert indice_busqueda_consistente()
+
+    resultados = BusquedaModel.buscar('colorido')
+    assert list(resultados['codigo_grupo']) == ['G0']
+    assert resultados.iloc[0]['aspectos'] == 0
+    assert '**colorido**' in resultados.iloc[0]['fragmento']
+
+
+def test_palabras_en_evaluacion_y_aspecto(bd):
+    aspectos = _evaluar(['vestuario muy colorido y alegre', 'coreografía sincronizada con energía'])
+    palabra = aspectos[0]['nombre'].split()[0]
+
+    resultados = BusquedaModel.buscar(f'Comparsa {palabra}')
+    assert sorted(resultados['codigo_grupo']) == ['G0', 'G1']
+    assert (resultados['aspectos'] >= 1).all()
+
+    with get_db_connection() as conn:
+        conn.execute("UPDATE aspectos SET nombre = 'zapateo tradicional' WHERE id = ?", (aspectos[0]['id'],))
+    resultados = BusquedaModel.buscar('zapateo')
+    assert sorted(resultados['codigo_grupo']) == ['G0', 'G1']
+    assert list(resultados['aspectos']) == [1, 1]
+    assert indice_busqueda_consistente()
+
+
+def test_filtro_texto_de_evaluaciones(bd):
+    aspectos = _evaluar(['vestuario muy colorido y alegre', 'coreografía sincronizada con energía'])
+    pagina, _ = EvaluacionModel.buscar({'texto': 'sincronizada'}, limite=None)
+    assert set(pagina['codigo_grupo']) == {'G1'}
+    assert len(pagina) == len(aspectos)
+
+    with get_db_connection() as conn:
+        conn.execute("UPDATE evaluacion_detalle SET observacion = 'detalle puntual del aspecto' "
+                     "WHERE id = (SELECT MIN(id) FROM evaluacion_detalle)")
+    pagina, _ = EvaluacionModel.buscar({'texto': 'puntual'}, limite=None)
+    assert len(pagina) == 1
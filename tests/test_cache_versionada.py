@@ -0,0 +1,39 @@
+"""
+Pruebas de las cachés revisadas con PRAGMA data_version
+"""
+import sqlite3
+
+from src.config import config
+from src.database.catalogo_grupos import catalogo_grupos
+from src.database.init_db import inicializar_base_datos
+
+
+def _insertar_grupo(db_path: str, codigo: str) -> None:
+    # Conexión ajena al pool: la sonda debe ver la escritura
+    conn = sqlite3.connect(db_path)
+    with conn:
+        ficha_id = conn.execute("SELECT id FROM fichas ORDER BY id LIMIT 1").fetchone()[0]
+        conn.execute("""
+            INSERT INTO grupos (codigo, nombre_propuesta, modalidad, tipo, tamano, naturaleza, ano_evento, ficha_id)
+            VALUES (?, 'Grupo', 'Danza', 'T', 'M', 'N', 2026, ?)
+        """, (codigo, ficha_id))
+    conn.close()
+
+
+def test_se_actualiza_tras_escrituras_de_otra_conexion(bd):
+    assert catalogo_grupos.obtener('P001') is None
+    
+    _insertar_grupo(bd, 'P001')
+    
+    assert catalogo_grupos.obtener('p001')['codigo'] == 'P001'
+
+
+def test_descarta_los_datos_al_cambiar_de_base(bd, tmp_path, monkeypatch):
+    _insertar_grupo(bd, 'P001')
+    assert catalogo_grupos.obtener('P001') is not None
+    
+    monkeypatch.setattr(config, 'db_path', str(tmp_path / 'otra.db'))
+    assert inicializar_base_datos()
+    
+    assert catalogo_grupos.obtener('P001') is None
+    assert len(catalogo_grupos) == 0
@@ -0,0 +1,49 @@
+"""
+Pruebas del cubo de puntuaciones
+"""
+import numpy as np
+import pandas as pd
+
+from src.analytics.cubo import CuboPuntuaciones
+
+
+def _evaluaciones() -> pd.DataFrame:
+    # cur1 evaluó P001 con dos fichas; cada ficha tiene sus propios aspectos
+    filas = [
+        ('P001', 'Grupo Uno', 'cur1', 'CONGO', 'Técnica', 'Ritmo', 2),
+        ('P001', 'Grupo Uno', 'cur1', 'CONGO', 'Técnica', 'Coreografía', 1),
+        ('P001', 'Grupo Uno', 'cur1', 'CUMBIA', 'Vestuario', 'Pollera', 0),
+        ('P001', 'Grupo Uno', 'cur2', 'CONGO', 'Técnica', 'Ritmo', 1),
+        ('P002', 'Grupo Dos', 'cur1', 'CUMBIA', 'Técnica', 'Ritmo', 2),
+        ('P002', 'Grupo Dos', 'cur2', 'CUMBIA', 'Vestuario', 'Pollera', 2),
+    ]
+    return pd.DataFrame(filas, columns=['codigo_grupo', 'nombre_propuesta', 'curador', 'ficha',
+                                        'dimension', 'aspecto', 'resultado'])
+
+
+def test_cada_evaluacion_conserva_su_ficha():
+    df = _evaluaciones()
+    cubo = CuboPuntuaciones(df)
+    
+    celdas = cubo.celdas().sort_values(['codigo_grupo', 'curador', 'aspecto']).reset_index(drop=True)
+    esperado = df[celdas.columns].sort_values(['codigo_grupo', 'curador', 'aspecto']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(celdas.astype(object), esperado.astype(object))
+
+
+def test_reducciones_por_ficha_coinciden_con_groupby():
+    df = _evaluaciones()
+    cubo = CuboPuntuaciones(df)
+    
+    conteos = cubo.conteos('grupo', 'ficha', 'dimension')
+    medias = cubo.medias('ficha', 'grupo')
+    for (grupo, ficha, dimension), n in df.groupby(['codigo_grupo', 'ficha', 'dimension']).size().items():
+        assert conteos[cubo.grupos.get_loc(grupo), cubo.fichas.get_loc(ficha), cubo.dimensiones.get_loc(dimension)] == n
+    assert conteos.sum() == len(df)
+    for (ficha, grupo), media in df.groupby(['ficha', 'codigo_grupo'])['resultado'].mean().items():
+        assert np.isclose(medias[cubo.fichas.get_loc(ficha), cubo.grupos.get_loc(grupo)], media)
+
+
+def test_cubo_vacio():
+    cubo = CuboPuntuaciones(pd.DataFrame())
+    assert cubo.conteos('ficha', 'grupo').shape == (0, 0)
+    assert cubo.distribucion('ficha').shape == (0, 3)
@@ -0,0 +1,45 @@
+"""
+Pruebas del escritor único y del envío idempotente de evaluaciones
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.database.connection import get_db_connection
+from src.database.models import AspectoModel, EvaluacionModel
+
+
+def _preparar_grupos(cantidad: int):
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO usuarios (username, password_hash, rol) VALUES ('cur1', 'x', 'curador')")
+        usuario_id = cursor.lastrowid
+        ficha_id = cursor.execute("SELECT id FROM fichas ORDER BY id LIMIT 1").fetchone()[0]
+        cursor.executemany("""
+            INSERT INTO grupos (codigo, nombre_propuesta, modalidad, tipo, tamano, naturaleza, ano_evento, ficha_id)
+            VALUES (?, ?, 'Danza', 'T', 'M', 'N', 2026, ?)
+        """, [(f'P{i:03d}', f'Grupo {i}', ficha_id) for i in range(cantidad)])
+    aspectos = [a['id'] for d in AspectoModel.obtener_por_ficha(ficha_id).values() for a in d['aspectos']]
+    return usuario_id, ficha_id, [(aspecto_id, 1) for aspecto_id in aspectos]
+
+
+def test_envios_concurrentes_con_la_misma_clave(bd):
+    """Dos envíos simultáneos con la misma clave: uno guarda y el otro es duplicado, nunca error."""
+    usuario_id, ficha_id, resultados = _preparar_grupos(30)
+    envios = [(f'P{i:03d}', f'clave-{i}') for i in range(30)] * 2
+    barrera = threading.Barrier(len(envios))
+    
+    def enviar(envio):
+        codigo, clave = envio
+        barrera.wait()
+        return EvaluacionModel.crear_evaluaciones_lote(
+            usuario_id, codigo, ficha_id, resultados, 'observación de prueba', clave_envio=clave
+        )
+    
+    with ThreadPoolExecutor(max_workers=len(envios)) as pool:
+        respuestas = list(pool.map(enviar, envios))
+    
+    assert [r['error'] for r in respuestas if not r['exito']] == []
+    assert sum(r['duplicado'] for r in respuestas) == 30
+    assert all(r['guardadas'] == len(resultados) for r in respuestas)
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM evaluacion_cabecera").fetchone()[0] == 30
@@ -0,0 +1,75 @@
+"""
+Pruebas de las tablas resumen mantenidas por triggers
+"""
+from src.database.connection import get_db_connection
+from src.database.init_db import reconstruir_resumenes, resumenes_consistentes
+from src.database.models import AspectoModel, EvaluacionModel
+
+
+def _evaluar_dos_grupos():
+    """Dos curadores evalúan G1 y uno G2 con todos los aspectos de una ficha."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO usuarios (username, password_hash, rol) VALUES ('cur1', 'x', 'curador'), "
+                       "('cur2', 'x', 'curador')")
+        ficha_id = cursor.execute("SELECT id FROM fichas ORDER BY id LIMIT 1").fetchone()[0]
+        cursor.executemany("""
+            INSERT INTO grupos (codigo, nombre_propuesta, modalidad, tipo, tamano, naturaleza, ano_evento, ficha_id)
+            VALUES (?, ?, 'Danza', 'T', 'M', 'N', 2026, ?)
+        """, [('G1', 'Grupo 1', ficha_id), ('G2', 'Grupo 2', ficha_id)])
+        usuarios = [row[0] for row in cursor.execute("SELECT id FROM usuarios ORDER BY id")]
+    aspectos = [a['id'] for d in AspectoModel.obtener_por_ficha(ficha_id).values() for a in d['aspectos']]
+    for usuario_id, codigo in ((usuarios[0], 'G1'), (usuarios[1], 'G1'), (usuarios[0], 'G2')):
+        resultados = [(aspecto_id, i % 3) for i, aspecto_id in enumerate(aspectos)]
+        assert EvaluacionModel.crear_evaluaciones_lote(usuario_id, codigo, ficha_id, resultados, 'observación del grupo')['exito']
+    return aspectos
+
+
+def _negativos() -> int:
+    with get_db_connection() as conn:
+        return conn.execute("""
+            SELECT COUNT(*) FROM resumen_grupo_dimension
+            WHERE suma < 0 OR conteo < 0 OR n0 < 0 OR n1 < 0 OR n2 < 0
+        """).fetchone()[0]
+
+
+def test_mover_aspecto_de_dimension_y_borrar_evaluacion(bd):
+    aspectos = _evaluar_dos_grupos()
+    with get_db_connection() as conn:
+        otra = conn.execute("""
+            SELECT id FROM dimensiones
+            WHERE id != (SELECT dimension_id FROM aspectos WHERE id = ?) ORDER BY id LIMIT 1
+        """, (aspectos[0],)).fetchone()[0]
+        conn.execute("UPDATE aspectos SET dimension_id = ? WHERE id = ?", (otra, aspectos[0]))
+    assert resumenes_consistentes()
+    
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM evaluacion_cabecera WHERE codigo_grupo = 'G1' AND id = "
+                     "(SELECT MIN(id) FROM evaluacion_cabecera WHERE codigo_grupo = 'G1')")
+        conn.execute("DELETE FROM evaluacion_detalle WHERE aspecto_id = ?", (aspectos[1],))
+    assert resumenes_consistentes()
+    assert _negativos() == 0
+
+
+def test_borrar_aspecto_evaluado(bd):
+    aspectos = _evaluar_dos_grupos()
+    assert AspectoModel.eliminar_aspecto(aspectos[0])[0]
+    assert resumenes_consistentes()
+    
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM evaluacion_cabecera WHERE codigo_grupo = 'G2'")
+    assert resumenes_consistentes()
+    assert _negativos() == 0
+
+
+def test_detecta_valores_descuadrados_con_el_mismo_total(bd):
+    _evaluar_dos_grupos()
+    with get_db_connection() as conn:
+        # Mismo conteo total, pero el reparto entre resultados no cuadra
+        conn.execute("""
+            UPDATE resumen_grupo_dimension SET n0 = n0 + 1, n1 = n1 - 1
+            WHERE rowid = (SELECT MIN(rowid) FROM resumen_grupo_dimension WHERE n1 > 0)
+        """)
+    assert not resumenes_consistentes()
+    assert reconstruir_resumenes()
+    assert resumenes_consistentes()